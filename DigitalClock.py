@@ -1,9 +1,11 @@
 # Importing necessary libraries
 import tkinter as tk  # For GUI creation
-from tkinter import ttk, messagebox, simpledialog, font  # For additional tkinter components
-from datetime import datetime  # For working with date and time
-import threading, time  # For handling multiple threads and time delays
-import pytz  # For time zone handling
+from tkinter import ttk, font  # For additional tkinter components (dialogs are imported when first used)
+import time  # For wall-clock readings
+from clock_scheduler import TickScheduler  # Drift-free tick source
+from clock_alarms import AlarmQueue, parse_alarm, LATE_GRACE  # Heap of parsed alarms (pytz is loaded on first use)
+from clock_world import WorldClock  # Many zones from one UTC instant with cached offsets
+from clock_render import LabelCache, TextMetrics  # Skips label updates whose text did not change; cached font metrics
  
 
 # === CONFIGURATION ===
@@ -14,6 +16,10 @@ THEMES = {
     'Solarized': {'bg': '#002B36', 'fg': '#839496'},  # Solarized theme with a dark background and grayish text
 }
 FONTS = ['Courier New', 'Arial', 'Helvetica', 'Times New Roman', 'Digital-7']  # List of fonts available for selection
+FONT_SIZES = {'time': 48, 'date': 14, 'info': 12, 'panel': 24, 'zone': 18}  # Point size of each shared font
+FULLSCREEN_SAMPLE = "88:88:88 PM"  # Widest time text, used to fit the time label to the screen
+FULLSCREEN_FILL = (0.9, 0.5)  # Fraction of the screen width and height the fullscreen time may use
+ALARM_RECHECK = 60  # Re-check alarms at least this often (seconds) to notice suspend/resume and clock changes
 
 
 class DigitalClockApp(tk.Tk):  # Define the main application class
@@ -22,19 +28,36 @@ class DigitalClockApp(tk.Tk):  # Define the main application class
         self.title("Advanced Digital Clock")  # Set the window title
         self.geometry("650x250")  # Set the window size
         self.protocol("WM_DELETE_WINDOW", self.on_close)  # Handle window close event
+        self.bind('<F12>', lambda e: self.show_stats())  # Show render statistics
+        self.bind('<Configure>', self.on_resize)  # Refit the time label when the window size changes
 
         # State variables
-        self.current_tz = pytz.timezone('Asia/Kolkata')  # Default time zone is UTC
+        self.tz_name = 'Asia/Kolkata'  # Default time zone
+        self.face = self.make_face()  # Time and date fields for the displayed zone, keyed by integer second and day
+        self.render = LabelCache()  # Last text shown on each label, plus the redraw counter
         self.theme_name = 'Dark'  # Default theme
         self.font_name = 'Courier New'  # Default font
-        self.alarm_time = None  # Initially, no alarm set
+        # Shared named fonts and styles: every window uses these, so a font or theme change is one mutation
+        self.fonts = {role: font.Font(self, family=self.font_name, size=size) for role, size in FONT_SIZES.items()}
+        self.style = ttk.Style(self)
+        self.metrics = TextMetrics(self.measure_text, self.measure_linespace)  # Cached font measurements
+        self.fit_area = None  # Window size the time font was last fitted to
+        self.alarms = AlarmQueue()  # All alarms, ordered by their next UTC fire time
+        try:
+            self.alarms.load()  # Restore saved alarms; any that came due while closed fire on the first check
+        except ValueError as e:
+            from tkinter import messagebox
+            self.after_idle(messagebox.showwarning, "Alarms", str(e))  # The unreadable file was moved aside; say so once the window is up
+        self.alarm_tick = None  # Scheduler subscription for the nearest alarm
         self.stopwatch_running = False  # Stopwatch not running initially
         self.timer_running = False  # Timer not running initially
-    
+        self.ticks = TickScheduler(self.after, self.after_cancel)  # One tick source for clock, stopwatch and timer
 
         self.create_widgets()  # Create the widgets (buttons, labels, etc.)
         self.apply_theme()  # Apply the default theme
-        self.update_time_loop()  # Start the time updating loop
+        self.watch_visibility(self)  # Pause the clock face while the window cannot be seen
+        self.clock_tick = self.ticks.add(self.update_time_loop, group=self)  # Start the time updating loop
+        self.alarm_tick = self.ticks.add(self.check_alarms)  # Arm the nearest alarm; never paused
          
     def create_widgets(self):
         # Create a top control frame for buttons and settings
@@ -67,11 +90,11 @@ class DigitalClockApp(tk.Tk):  # Define the main application class
         self.full_btn.pack(side='right')  # Pack the button to the right side
 
         # Clock display labels
-        self.time_lbl = ttk.Label(self, text="", font=(self.font_name, 48))  # Label for the time display
+        self.time_lbl = ttk.Label(self, text="", font=self.fonts['time'], style='Clock.TLabel')  # Label for the time display
         self.time_lbl.pack(pady=5)  # Pack with vertical padding
-        self.date_lbl = ttk.Label(self, text="", font=(self.font_name, 14))  # Label for the date display
+        self.date_lbl = ttk.Label(self, text="", font=self.fonts['date'], style='Clock.TLabel')  # Label for the date display
         self.date_lbl.pack()  # Pack the date label
-        self.weather_lbl = ttk.Label(self, text="", font=(self.font_name, 12))  # Label for the weather display
+        self.weather_lbl = ttk.Label(self, text="", font=self.fonts['info'], style='Clock.TLabel')  # Label for the weather display
         self.weather_lbl.pack(pady=5)  # Pack with vertical padding
 
         # Bottom control buttons for alarm, stopwatch, and timer
@@ -80,13 +103,17 @@ class DigitalClockApp(tk.Tk):  # Define the main application class
         ttk.Button(bottom, text="Set Alarm", command=self.set_alarm).pack(side='left', padx=5)  # Button to set alarm
         ttk.Button(bottom, text="Stopwatch", command=self.open_stopwatch).pack(side='left')  # Button to open stopwatch
         ttk.Button(bottom, text="Timer", command=self.open_timer).pack(side='left')  # Button to open timer
+        ttk.Button(bottom, text="World Clock", command=self.open_world_clock).pack(side='left')  # Button to open the world-clock wall
 
     def apply_theme(self):
-        th = THEMES[self.theme_name]  # Get the selected theme
+        th = self.theme = THEMES[self.theme_name]  # Get the selected theme
+        # One style change recolors every clock label and frame in every window
+        self.style.configure('Clock.TLabel', background=th['bg'], foreground=th['fg'])
+        self.style.configure('Clock.TFrame', background=th['bg'])
         self.configure(bg=th['bg'])  # Set the window background color
-        # Set the background and foreground colors for each label
-        for w in [self.time_lbl, self.date_lbl, self.weather_lbl]:
-            w.configure(background=th['bg'], foreground=th['fg'])
+        for w in self.winfo_children():
+            if isinstance(w, tk.Toplevel):
+                w.configure(bg=th['bg'])  # Stopwatch, timer and world-clock windows
 
     def change_theme(self):
         self.theme_name = self.theme_cb.get()  # Get the selected theme from the combobox
@@ -94,103 +121,123 @@ class DigitalClockApp(tk.Tk):  # Define the main application class
 
     def change_font(self):
         self.font_name = self.font_cb.get()  # Get the selected font from the combobox
-        # Apply the selected font to the time, date, and weather labels
-        self.time_lbl.configure(font=(self.font_name, 48))
-        self.date_lbl.configure(font=(self.font_name, 14))
-        self.weather_lbl.configure(font=(self.font_name, 12))
+        # Change the family of the shared fonts; every label in every window follows
+        for f in self.fonts.values():
+            f.configure(family=self.font_name)
+        self.fit_time_font()  # Glyph widths differ between families
 
     def change_timezone(self):
-        self.current_tz = pytz.timezone(self.tz_cb.get())  # Change the time zone based on selection
+        self.tz_name = self.tz_cb.get()  # Change the time zone based on selection
+        self.face = self.make_face()  # New zone: every field is recomputed on the next tick
+        self.ticks.remove(self.clock_tick)
+        self.clock_tick = self.ticks.add(self.update_time_loop, group=self)  # Show the new zone right away
+
+    def make_face(self):
+        return WorldClock([self.tz_name], show_seconds=True, date_format="%A, %d %B %Y")
+
+    def watch_visibility(self, win):
+        # Power mode: a window's display ticks (the scheduler group `win`) stop while it is
+        # minimized, withdrawn or fully covered, and repaint at once when it shows again.
+        # Alarm and timer deadlines are not in any group, so they stay armed.
+        def seen(event, visible):
+            if event.widget is not win:
+                return  # The same binding also sees events from the window's children
+            if visible:
+                self.ticks.resume(win)
+            else:
+                self.ticks.pause(win)
+        win.bind('<Map>', lambda e: seen(e, True), add='+')
+        win.bind('<Unmap>', lambda e: seen(e, False), add='+')
+        win.bind('<Visibility>', lambda e: seen(e, e.state != 'VisibilityFullyObscured'), add='+')
+        if win is not self:
+            win.bind('<Destroy>', lambda e: e.widget is win and self.ticks.drop(win), add='+')  # Closed: forget its ticks
 
     def toggle_fullscreen(self):
         self.attributes('-fullscreen', not self.attributes('-fullscreen'))  # Toggle fullscreen mode
-
-    def update_time_loop(self):
-        now = datetime.now(self.current_tz)  # Get the current time in the selected time zone
-        self.time_lbl.config(text=now.strftime("%I:%M:%S %p"))  # Update the time label
-        self.date_lbl.config(text=now.strftime("%A, %d %B %Y"))  # Update the date label
-        # Check if it's time for the alarm
-        if self.alarm_time and now.strftime("%I:%M %p") == self.alarm_time:
-            messagebox.showinfo("Alarm", f"Alarm! {self.alarm_time}")  # Show an alarm message
-            self.alarm_time = None  # Reset the alarm time
-        self.after(200, self.update_time_loop)  # Update every 200 milliseconds
+        self.fit_time_font()
+
+    def measure_text(self, family, size, text):
+        f = font.Font(self, family=family, size=size)  # Scratch font; results are cached by TextMetrics
+        return f.measure(text)
+
+    def measure_linespace(self, family, size):
+        f = font.Font(self, family=family, size=size)
+        return f.metrics('linespace')
+
+    def on_resize(self, event):
+        if event.widget is self and (event.width, event.height) != self.fit_area:
+            self.fit_time_font(event.width, event.height)
+
+    def fit_time_font(self, width=None, height=None):
+        # Fullscreen: size the time so FULLSCREEN_SAMPLE fills the screen, computed in one
+        # step from cached metrics (width scales linearly with point size); otherwise the default
+        size = FONT_SIZES['time']
+        if self.attributes('-fullscreen'):
+            width = width or self.winfo_width()
+            height = height or self.winfo_height()
+            self.fit_area = (width, height)
+            size = self.metrics.fit_size(self.font_name, FULLSCREEN_SAMPLE,
+                                         width * FULLSCREEN_FILL[0], height * FULLSCREEN_FILL[1])
+        if self.fonts['time'].cget('size') != size:
+            self.fonts['time'].configure(size=size)
+
+    def update_time_loop(self, tick):
+        labels = {'time': self.time_lbl, 'date': self.date_lbl}
+        for _, field, text in self.face.update():  # Only the fields whose second or day changed are reformatted
+            self.render.set(labels[field], text)  # Only changed text reaches Tk
+        return self.ticks.next_second(tick)  # Wake again exactly when the displayed second changes
+
+    def check_alarms(self, tick=None):
+        fired = self.alarms.pop_due()  # Every alarm that came due, including ones missed while stalled or suspended
+        if fired:
+            self.alarms.save()  # Persist the rescheduled fire times
+            wall = time.time()
+            lines = [("Missed: " if wall - due > LATE_GRACE else "") + alarm.describe() for alarm, due in fired]
+            if len(lines) > 10:
+                lines[10:] = [f"...and {len(lines) - 10} more"]
+            from tkinter import messagebox
+            self.after_idle(messagebox.showinfo, "Alarm", "Alarm!\n" + "\n".join(lines))  # One message for all of them
+        deadline = self.alarms.next_deadline()  # UTC time of the nearest alarm
+        if deadline is None:
+            self.alarm_tick = None
+            return None  # No alarms left: nothing to wake for
+        # Wake exactly at the nearest alarm, or sooner to re-check after a suspend or clock change
+        return self.ticks.clock() + min(max(0, deadline - time.time()), ALARM_RECHECK)
+
+    def show_stats(self):
+        from tkinter import messagebox
+        messagebox.showinfo("Statistics", f"Label redraws in the last minute: {self.render.redraws.rate()}\n"
+                                          f"Scheduler wakeups in the last minute: {self.ticks.wake_rate.rate()}"
+                                          f" (total {self.ticks.wakeups})\n"
+                                          f"Hidden windows with paused display ticks: {self.ticks.paused()}")
 
     def set_alarm(self):
-        t = simpledialog.askstring("Set Alarm", "Enter alarm time (HH:MM AM/PM):")  # Ask for alarm time input
-        if t:
-            self.alarm_time = t  # Set the alarm time if valid
+        from tkinter import messagebox, simpledialog  # Dialogs are only needed once the button is pressed
+        t = simpledialog.askstring("Set Alarm", "Enter alarm time (HH:MM AM/PM), optionally followed by\n"
+                                   "once / daily / weekdays / weekends / mon,wed,..., a time zone and a label:")  # Ask for alarm time input
+        if not t:
+            return
+        try:
+            alarm = parse_alarm(t, self.tz_name)  # Parse and validate; defaults to the displayed time zone
+        except ValueError as e:
+            messagebox.showerror("Set Alarm", str(e))  # Explain what was wrong with the input
+            return
+        self.alarms.add(alarm)  # O(log n) insert into the alarm heap
+        self.alarms.save()  # Persist to the local alarm file
+        self.ticks.remove(self.alarm_tick)
+        self.alarm_tick = self.ticks.add(self.check_alarms)  # Re-arm for the (possibly new) nearest alarm
 
     def open_stopwatch(self):
-        if hasattr(self, 'sw_win') and self.sw_win.winfo_exists(): return  # Avoid opening multiple stopwatch windows
-        self.sw_win = tk.Toplevel(self)  # Create a new top-level window for the stopwatch
-        self.sw_win.title("Stopwatch")  # Set the title for the stopwatch window
-        lbl = ttk.Label(self.sw_win, text="00:00:00", font=(self.font_name, 24))  # Label for the stopwatch display
-        lbl.pack(pady=10)  # Pack the label with vertical padding
-        bk = {'running': False, 'start': 0, 'elapsed':0}  # Stopwatch state
-
-        # Function to update stopwatch time
-        def sw_loop():
-            if bk['running']:
-                bk['elapsed'] = time.time() - bk['start']  # Calculate elapsed time
-                lbl.config(text=time.strftime('%H:%M:%S', time.gmtime(bk['elapsed'])))  # Update display
-            self.sw_win.after(100, sw_loop)  # Update every 100 milliseconds
-
-        # Control buttons: Start, Stop, Reset
-        def start():
-            if not bk['running']:
-                bk['running'] = True
-                bk['start'] = time.time() - bk['elapsed']  # Start or resume stopwatch
-        def stop(): bk['running'] = False  # Stop the stopwatch
-        def reset(): bk['running'] = False; bk['elapsed'] = 0; lbl.config(text='00:00:00')  # Reset the stopwatch
-
-        # Button frame and buttons
-        btnf = ttk.Frame(self.sw_win)
-        btnf.pack()
-        ttk.Button(btnf, text="Start", command=start).pack(side='left')  # Start button
-        ttk.Button(btnf, text="Stop", command=stop).pack(side='left')  # Stop button
-        ttk.Button(btnf, text="Reset", command=reset).pack(side='left')  # Reset button
-
-        sw_loop()  # Start the stopwatch loop
+        from clock_windows import open_stopwatch  # Loaded on first use to keep startup fast
+        open_stopwatch(self)
 
     def open_timer(self):
-        if hasattr(self, 'tm_win') and self.tm_win.winfo_exists(): return  # Avoid opening multiple timer windows
-        self.tm_win = tk.Toplevel(self)  # Create a new top-level window for the timer
-        self.tm_win.title("Timer")  # Set the title for the timer window
-        lbl = ttk.Label(self.tm_win, text="00:00", font=(self.font_name, 24))  # Label for the timer display
-        lbl.pack(pady=10)  # Pack the label with vertical padding
-        entry = ttk.Entry(self.tm_win)  # Entry field for setting timer duration
-        entry.insert(0, '00:01:00')  # Default time (1 minute)
-        entry.pack()
-
-        bk = {'running': False, 'remaining': 0}  # Timer state
-
-        # Function to update timer time
-        def tm_loop():
-            if bk['running']:
-                if bk['remaining'] > 0:
-                    bk['remaining'] -= 1  # Decrease remaining time
-                    lbl.config(text=time.strftime('%H:%M:%S', time.gmtime(bk['remaining'])))  # Update display
-                else:
-                    bk['running'] = False  # Stop timer when time runs out
-                    messagebox.showinfo("Timer", "Time's up!")  # Show "time's up" message
-            self.tm_win.after(1000, tm_loop)  # Update every second
-
-        # Control buttons: Start, Stop, Reset
-        def start():
-            h, m, s = map(int, entry.get().split(':'))  # Parse the time input
-            bk['remaining'] = h * 3600 + m * 60 + s  # Convert to seconds
-            bk['running'] = True  # Start the timer
-        def stop(): bk['running'] = False  # Stop the timer
-        def reset(): bk['running'] = False; lbl.config(text='00:00:00')  # Reset the timer
-
-        # Button frame and buttons
-        frm = ttk.Frame(self.tm_win)
-        frm.pack()
-        ttk.Button(frm, text="Start", command=start).pack(side='left')  # Start button
-        ttk.Button(frm, text="Stop", command=stop).pack(side='left')  # Stop button
-        ttk.Button(frm, text="Reset", command=reset).pack(side='left')  # Reset button
-
-        tm_loop()  # Start the timer loop
+        from clock_windows import open_timer  # Loaded on first use to keep startup fast
+        open_timer(self)
+
+    def open_world_clock(self):
+        from clock_windows import open_world_clock  # Loaded on first use to keep startup fast
+        open_world_clock(self, TIME_ZONES)
 
     def on_close(self):
         self.destroy()  # Cleanly close the application
@@ -0,0 +1,278 @@
+# File: clock_alarms.py
+# Description: Parsed, recurring, per-timezone alarms in a heap ordered by UTC fire time (no Tk import)
+#
+# Usage:
+#   python clock_alarms.py    insert/fire benchmark for 1k to 100k alarms
+
+import heapq
+import json
+import math
+import os
+import time
+from datetime import datetime, timedelta
+
+ALARM_FILE = "alarms.json"
+LATE_GRACE = 60  # an alarm firing more than this many seconds late is reported as missed
+
+DAY_NAMES = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+DAY_LOOKUP = {name: d for d, full in enumerate(["monday", "tuesday", "wednesday", "thursday", "friday",
+                                                 "saturday", "sunday"]) for name in (full, full[:3])}
+RECURRENCES = {
+    "once": None,
+    "daily": frozenset(range(7)),
+    "weekdays": frozenset(range(5)),
+    "weekends": frozenset((5, 6)),
+}
+
+
+def local_to_utc(zone, local):
+    # UTC timestamp of the naive wall time `local` in pytz zone `zone`. A time
+    # skipped by a spring-forward gap maps to the end of the gap, the first
+    # instant that exists; a time repeated by a fall-back keeps its
+    # standard-time (second) occurrence.
+    import pytz
+    try:
+        return zone.localize(local, is_dst=None).timestamp()
+    except pytz.AmbiguousTimeError:
+        return zone.localize(local, is_dst=False).timestamp()
+    except pytz.NonExistentTimeError:
+        pass
+    # Read with either offset, the time lands on both sides of the
+    # transition: find the first second with the new offset
+    a = zone.localize(local, is_dst=True).timestamp()
+    b = zone.localize(local, is_dst=False).timestamp()
+    lo, hi = math.floor(min(a, b)), math.ceil(max(a, b))
+    before = datetime.fromtimestamp(lo, zone).utcoffset()
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if datetime.fromtimestamp(mid, zone).utcoffset() == before:
+            lo = mid
+        else:
+            hi = mid
+    return float(hi)
+
+
+class Alarm:
+    __slots__ = ("hour", "minute", "days", "tz", "label", "next", "id")
+
+    def __init__(self, hour, minute, days=None, tz="UTC", label=""):
+        # days: set of weekdays (0 = Monday) to repeat on, or None for a one-shot alarm
+        if not (0 <= hour < 24 and 0 <= minute < 60):
+            raise ValueError(f"Invalid alarm time {hour}:{minute:02d}")
+        self.hour = hour
+        self.minute = minute
+        self.days = frozenset(days) if days is not None else None
+        self.tz = tz
+        self.label = label
+        self.next = None  # UTC timestamp of the next fire time
+        self.id = None
+
+    @property
+    def recurring(self):
+        return self.days is not None
+
+    def next_fire(self, after):
+        # First UTC timestamp strictly after `after` at which this alarm's
+        # wall time occurs in its own zone (DST-aware; a time skipped by a
+        # spring-forward gap fires as the gap ends, see local_to_utc)
+        import pytz  # Loaded on first use so importing this module stays cheap
+        zone = pytz.timezone(self.tz)
+        day = datetime.fromtimestamp(after, zone).date()
+        for _ in range(9):
+            if self.days is None or day.weekday() in self.days:
+                local = datetime(day.year, day.month, day.day, self.hour, self.minute)
+                fire = local_to_utc(zone, local)
+                if fire > after:
+                    return fire
+            day += timedelta(days=1)
+        raise ValueError(f"{self} never fires")
+
+    def describe(self):
+        if self.days is None:
+            repeat = "once"
+        else:
+            repeat = next((name for name, days in RECURRENCES.items() if days == self.days),
+                          ",".join(DAY_NAMES[d] for d in sorted(self.days)))
+        text = f"{self.hour % 12 or 12:02d}:{self.minute:02d} {'AM' if self.hour < 12 else 'PM'} {repeat} {self.tz}"
+        return f"{text} ({self.label})" if self.label else text
+
+    def to_dict(self):
+        return {"hour": self.hour, "minute": self.minute, "tz": self.tz, "label": self.label,
+                "days": sorted(self.days) if self.days is not None else None, "next": self.next}
+
+    @classmethod
+    def from_dict(cls, d):
+        alarm = cls(d["hour"], d["minute"], d["days"], d["tz"], d.get("label", ""))
+        alarm.next = d.get("next")
+        return alarm
+
+    def __repr__(self):
+        return f"Alarm({self.describe()!r})"
+
+
+def parse_alarm(text, default_tz="UTC"):
+    # "HH[:MM] [AM|PM] [once|daily|weekdays|weekends|mon,wed,...] [Area/Zone] [label...]"
+    # e.g. "7:30 AM weekdays Europe/London Standup" or "19:05 sat,sun"
+    import pytz
+    words = text.replace(",", " , ").split()
+    if not words:
+        raise ValueError("Enter an alarm time such as 07:30 AM")
+    clock = words.pop(0).lower()
+    meridiem = None
+    for suffix in ("am", "pm"):
+        if clock.endswith(suffix):
+            clock, meridiem = clock[:-2], suffix
+    if meridiem is None and words and words[0].lower() in ("am", "pm"):
+        meridiem = words.pop(0).lower()
+    try:
+        hour, minute = (int(part) for part in (clock + ":00" if ":" not in clock else clock).split(":"))
+    except ValueError:
+        raise ValueError(f"Cannot read the time {clock!r}; use HH:MM") from None
+    if meridiem is not None:
+        if not 1 <= hour <= 12:
+            raise ValueError(f"Hour {hour} is not valid with AM/PM")
+        hour = hour % 12 + (12 if meridiem == "pm" else 0)
+
+    days = None
+    tz = default_tz
+    label = []
+    for word in words:
+        key = word.lower()
+        if label:
+            label.append(word)
+        elif key == ",":
+            continue
+        elif key in RECURRENCES:
+            days = RECURRENCES[key]
+        elif key in DAY_LOOKUP:
+            days = (days or frozenset()) | {DAY_LOOKUP[key]}
+        elif "/" in word or word.upper() in ("UTC", "GMT"):
+            try:
+                tz = pytz.timezone(word).zone
+            except pytz.UnknownTimeZoneError:
+                raise ValueError(f"Unknown time zone {word!r}") from None
+        else:
+            label.append(word)
+    return Alarm(hour, minute, days, tz, " ".join(label))
+
+
+class AlarmQueue:
+    # Min-heap of (fire time, id, alarm): O(log n) insert and fire, O(1) to
+    # find the nearest deadline. Removed or rescheduled alarms leave stale
+    # heap entries that are skipped when they surface.
+    def __init__(self, clock=time.time):
+        self.clock = clock
+        self._heap = []
+        self._alarms = {}
+        self._next_id = 0
+
+    def __len__(self):
+        return len(self._alarms)
+
+    def __iter__(self):
+        return iter(sorted(self._alarms.values(), key=lambda a: a.next))
+
+    def add(self, alarm, now=None):
+        if alarm.next is None:
+            alarm.next = alarm.next_fire(self.clock() if now is None else now)
+        alarm.id = self._next_id
+        self._next_id += 1
+        self._alarms[alarm.id] = alarm
+        heapq.heappush(self._heap, (alarm.next, alarm.id, alarm))
+        return alarm
+
+    def remove(self, alarm):
+        self._alarms.pop(alarm.id, None)
+
+    def next_deadline(self):
+        # UTC timestamp of the nearest fire time, or None
+        heap = self._heap
+        while heap and not self._valid(heap[0]):
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
+
+    def _valid(self, entry):
+        fire, alarm_id, alarm = entry
+        return self._alarms.get(alarm_id) is alarm and alarm.next == fire
+
+    def pop_due(self, now=None):
+        # Every alarm whose fire time has passed, as (alarm, scheduled time).
+        # Alarms missed while the loop was stalled or the machine suspended
+        # fire once on catch-up; recurring ones then move to their next
+        # occurrence after now, one-shot ones are dropped.
+        if now is None:
+            now = self.clock()
+        heap = self._heap
+        fired = []
+        while heap and heap[0][0] <= now:
+            entry = heapq.heappop(heap)
+            if not self._valid(entry):
+                continue
+            fire, alarm_id, alarm = entry
+            fired.append((alarm, fire))
+            if alarm.recurring:
+                alarm.next = alarm.next_fire(max(now, fire))
+                heapq.heappush(heap, (alarm.next, alarm_id, alarm))
+            else:
+                del self._alarms[alarm_id]
+        return fired
+
+    def save(self, path=ALARM_FILE):
+        # Atomic write: a crash mid-save leaves the previous file intact
+        data = {"version": 1, "alarms": [a.to_dict() for a in self._alarms.values()]}
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+
+    def load(self, path=ALARM_FILE):
+        # Saved fire times are kept, so alarms that came due while the app
+        # was closed fire on the next pop_due(). An unreadable file is moved
+        # to path + ".bad", so the next save() cannot replace the only copy,
+        # and reported as a ValueError.
+        try:
+            with open(path) as f:
+                data = json.load(f)
+            alarms = [Alarm.from_dict(d) for d in data["alarms"]]
+        except FileNotFoundError:
+            return 0
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            backup = path + ".bad"
+            try:
+                os.replace(path, backup)
+            except OSError:
+                raise ValueError(f"Saved alarms in {path} are unreadable ({e!r})") from e
+            raise ValueError(f"Saved alarms in {path} are unreadable ({e!r}); the file was moved to {backup}") from e
+        for alarm in alarms:
+            self.add(alarm)
+        return len(alarms)
+
+
+def run_benchmark():
+    import random
+    rng = random.Random(0)
+    zones = ["UTC", "Asia/Kolkata", "US/Eastern", "Europe/London", "Asia/Tokyo", "Australia/Sydney"]
+    recurrences = list(RECURRENCES.values())
+    start = 1_700_000_000.0
+    for n in (1_000, 10_000, 100_000):
+        alarms = [Alarm(rng.randrange(24), rng.randrange(60), rng.choice(recurrences), rng.choice(zones))
+                  for _ in range(n)]
+        for alarm in alarms:
+            alarm.next = alarm.next_fire(start)  # zone math is the same for any queue; time the heap
+        queue = AlarmQueue(clock=lambda: start)
+        t0 = time.perf_counter()
+        for alarm in alarms:
+            queue.add(alarm)
+        insert = time.perf_counter() - t0
+        # Fire everything due over the next 24 hours, one minute at a time
+        fired = 0
+        t0 = time.perf_counter()
+        for minute in range(1, 24 * 60 + 1):
+            fired += len(queue.pop_due(start + minute * 60))
+        fire = time.perf_counter() - t0
+        print(f"{n:>7} alarms: insert {insert / n * 1e6:6.2f} us, "
+              f"fire+reschedule {fire / max(fired, 1) * 1e6:6.2f} us ({fired} fired in 24 h)")
+
+
+if __name__ == "__main__":
+    run_benchmark()
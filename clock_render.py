@@ -0,0 +1,79 @@
+# File: clock_render.py
+# Description: Render cache for the clock labels, cached font metrics and a per-minute event counter (no Tk import)
+
+import time
+from collections import deque
+
+
+class RateCounter:
+    # Events in the last `window` seconds, kept as a deque of timestamps
+    def __init__(self, window=60, clock=time.monotonic):
+        self.window = window
+        self.clock = clock
+        self.total = 0
+        self._times = deque()
+
+    def hit(self, now=None):
+        self.total += 1
+        self._times.append(self.clock() if now is None else now)
+
+    def rate(self, now=None):
+        # Events in the last window (i.e. per minute for the default window)
+        cutoff = (self.clock() if now is None else now) - self.window
+        times = self._times
+        while times and times[0] <= cutoff:
+            times.popleft()
+        return len(times)
+
+
+class LabelCache:
+    # Last text pushed to each label: set() only reaches Tk (and its relayout
+    # and redraw) when the text is different, and counts the redraws that do
+    def __init__(self, clock=time.monotonic):
+        self.texts = {}
+        self.redraws = RateCounter(clock=clock)
+
+    def set(self, label, text):
+        if self.texts.get(label) != text:
+            self.texts[label] = text
+            label.config(text=text)
+            self.redraws.hit()
+            return True
+        return False
+
+    def forget(self, label):
+        # Call when a label is destroyed or its text is set elsewhere
+        self.texts.pop(label, None)
+
+
+class TextMetrics:
+    # Memoized font measurements. Tk's font.measure() and metrics() are round
+    # trips into the interpreter, and a resize asks the same questions again.
+    def __init__(self, measure, linespace):
+        # measure(family, size, text) -> pixels; linespace(family, size) -> pixels
+        self._measure = measure
+        self._linespace = linespace
+        self._widths = {}
+        self._lines = {}
+
+    def width(self, family, size, text):
+        key = (family, size, text)
+        if key not in self._widths:
+            self._widths[key] = self._measure(family, size, text)
+        return self._widths[key]
+
+    def linespace(self, family, size):
+        key = (family, size)
+        if key not in self._lines:
+            self._lines[key] = self._linespace(family, size)
+        return self._lines[key]
+
+    def fit_size(self, family, text, width, height, ref_size=100, min_size=8):
+        # Largest point size at which text fits in width x height, from one
+        # measurement at ref_size: glyph widths and line height scale linearly
+        # with point size, so there is no measure-and-retry loop
+        w = self.width(family, ref_size, text)
+        h = self.linespace(family, ref_size)
+        if not w or not h:
+            return min_size
+        return max(min_size, int(ref_size * min(width / w, height / h)))
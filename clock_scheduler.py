@@ -0,0 +1,376 @@
+# File: clock_scheduler.py
+# Description: One drift-free tick source for the clock, stopwatch and timer (no Tk import)
+#
+# Every subscriber works out its display from absolute time.monotonic()
+# deadlines and asks to be woken at the exact moment its display next changes,
+# so late Tk callbacks never accumulate into drift.
+#
+# Usage:
+#   python clock_scheduler.py    simulate 24 hours on a fake clock and report drift
+
+import heapq
+import math
+import random
+import time
+from clock_render import RateCounter
+
+
+class TickScheduler:
+    # Keeps a heap of (deadline, token, callback) and a single Tk after() armed
+    # for the earliest one. callback(now) returns its next monotonic deadline,
+    # or None to unsubscribe.
+    #
+    # A subscription may belong to a group, e.g. the window it paints. While a
+    # group is paused its subscriptions are parked off the heap and never wake
+    # the process; resume() runs them straight away so the display catches up.
+    def __init__(self, after, after_cancel, clock=time.monotonic, wall=time.time):
+        self.after = after
+        self.after_cancel = after_cancel
+        self.clock = clock
+        self.wall = wall
+        self.wakeups = 0
+        self.wake_rate = RateCounter(clock=clock)  # wakeups in the last minute
+        self._heap = []
+        self._live = {}  # token -> deadline; removed tokens are skipped lazily
+        self._groups = {}  # token -> group, for grouped subscriptions
+        self._paused = set()
+        self._parked = {}  # token -> callback, for subscriptions of paused groups
+        self._running = set()  # tokens whose callbacks the current wake still has to finish
+        self._next_token = 0
+        self._armed = None  # (after id, deadline)
+
+    def add(self, callback, when=None, group=None):
+        # Run callback at monotonic time `when` (default: as soon as possible)
+        token = self._next_token
+        self._next_token += 1
+        if group is not None:
+            self._groups[token] = group
+        if group is not None and group in self._paused:
+            self._parked[token] = callback
+        else:
+            self._push(token, self.clock() if when is None else when, callback)
+            self._arm()
+        return token
+
+    def remove(self, token):
+        # Also safe from inside a callback, including the subscription's own
+        self._running.discard(token)
+        self._groups.pop(token, None)
+        self._parked.pop(token, None)
+        if self._live.pop(token, None) is not None:
+            self._arm()
+
+    def __contains__(self, token):
+        return token in self._live or token in self._parked or token in self._running
+
+    def pause(self, group):
+        # Stop running the group's subscriptions until resume(group)
+        if group in self._paused:
+            return
+        self._paused.add(group)
+        for deadline, token, callback in self._heap:
+            if self._groups.get(token) == group and self._live.get(token) == deadline:
+                del self._live[token]
+                self._parked[token] = callback
+        self._arm()
+
+    def resume(self, group):
+        # Run the group's parked subscriptions now, then on their own deadlines
+        if group not in self._paused:
+            return
+        self._paused.discard(group)
+        now = self.clock()
+        for token in [t for t in self._parked if self._groups.get(t) == group]:
+            self._push(token, now, self._parked.pop(token))
+        self._arm()
+
+    def drop(self, group):
+        # Unsubscribe everything in the group, e.g. when its window is destroyed
+        self._paused.discard(group)
+        for token in [t for t, g in self._groups.items() if g == group]:
+            self.remove(token)
+
+    def paused(self):
+        return len(self._paused)
+
+    def next_second(self, now=None):
+        # Monotonic deadline of the next wall-clock second boundary
+        if now is None:
+            now = self.clock()
+        return now + 1.0 - self.wall() % 1.0
+
+    def _push(self, token, deadline, callback):
+        self._live[token] = deadline
+        heapq.heappush(self._heap, (deadline, token, callback))
+
+    def _peek(self):
+        heap = self._heap
+        while heap and self._live.get(heap[0][1]) != heap[0][0]:
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
+
+    def _arm(self):
+        deadline = self._peek()
+        if self._armed is not None:
+            if self._armed[1] == deadline:
+                return
+            self.after_cancel(self._armed[0])
+            self._armed = None
+        if deadline is not None:
+            delay = max(0, math.ceil((deadline - self.clock()) * 1000))
+            self._armed = (self.after(delay, self._wake), deadline)
+
+    def _wake(self):
+        self._armed = None
+        self.wakeups += 1
+        now = self.clock()
+        self.wake_rate.hit(now)
+        due = []
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            deadline, token, callback = heapq.heappop(heap)
+            if self._live.get(token) == deadline:
+                del self._live[token]
+                due.append((token, callback))
+        self._running = {token for token, callback in due}
+        for token, callback in due:
+            if token not in self._running:
+                continue  # removed by an earlier callback of this wake
+            deadline = callback(now)
+            if token not in self._running:
+                continue  # removed itself
+            self._running.discard(token)
+            if deadline is None:
+                self._groups.pop(token, None)
+            elif self._groups.get(token) in self._paused:
+                self._parked[token] = callback
+            else:
+                self._push(token, deadline, callback)
+        self._arm()
+
+
+class Stopwatch:
+    # Elapsed time from monotonic start/stop marks, so wall-clock steps (NTP,
+    # manual changes) never show up in the reading
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.started = None
+        self.accumulated = 0.0
+
+    @property
+    def running(self):
+        return self.started is not None
+
+    def start(self):
+        if self.started is None:
+            self.started = self.clock()
+
+    def stop(self):
+        if self.started is not None:
+            self.accumulated += self.clock() - self.started
+            self.started = None
+
+    def reset(self):
+        self.started = None
+        self.accumulated = 0.0
+
+    def elapsed(self, now=None):
+        if self.started is None:
+            return self.accumulated
+        return self.accumulated + (self.clock() if now is None else now) - self.started
+
+    def next_change(self, now):
+        # Monotonic time at which the whole-second reading next ticks over
+        return self.started - self.accumulated + math.floor(self.elapsed(now)) + 1
+
+
+class Countdown:
+    # Remaining time measured against a fixed monotonic end deadline
+    def __init__(self, seconds, clock=time.monotonic):
+        self.clock = clock
+        self.end = clock() + seconds
+
+    def remaining(self, now=None):
+        # Whole seconds left, rounded up so "00:00:00" only shows at the end
+        left = self.end - (self.clock() if now is None else now)
+        return max(0, math.ceil(left))
+
+    def next_change(self, now):
+        return self.end - (self.remaining(now) - 1)
+
+
+def format_hms(seconds):
+    seconds = int(seconds)
+    return f"{seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+
+class _FakeTk:
+    # Stands in for Tk's after()/after_cancel() on a simulated clock; every
+    # callback runs 0..max_latency seconds late, as on a loaded machine
+    def __init__(self, max_latency, rng, start_wall=1_700_000_000.25):
+        self.now = 1000.0
+        self.wall_offset = start_wall - self.now
+        self.max_latency = max_latency
+        self.rng = rng
+        self.queue = []
+        self.cancelled = set()
+        self.next_id = 0
+
+    def clock(self):
+        return self.now
+
+    def wall(self):
+        return self.now + self.wall_offset
+
+    def after(self, ms, callback):
+        self.next_id += 1
+        due = self.now + ms / 1000 + self.rng.uniform(0, self.max_latency)
+        heapq.heappush(self.queue, (due, self.next_id, callback))
+        return self.next_id
+
+    def after_cancel(self, after_id):
+        self.cancelled.add(after_id)
+
+    def run_until(self, t):
+        while self.queue and self.queue[0][0] <= t:
+            due, after_id, callback = heapq.heappop(self.queue)
+            if after_id in self.cancelled:
+                continue
+            self.now = due
+            callback()
+        self.now = t
+
+
+def simulate(hours=24, max_latency=0.15, seed=0):
+    # Drive the clock display, a stopwatch and a countdown of the whole period
+    # from one TickScheduler on a fake clock with random callback latency, and
+    # compare with the old "remaining -= 1 every after(1000)" countdown
+    tk = _FakeTk(max_latency, random.Random(seed))
+    ticks = TickScheduler(tk.after, tk.after_cancel, tk.clock, tk.wall)
+    seconds = int(hours * 3600)
+    shown = []  # wall second displayed at each clock tick
+    clock_late = []
+    stopwatch = Stopwatch(tk.clock)
+    countdown = Countdown(seconds, tk.clock)
+    result = {}
+
+    def clock_tick(now):
+        wall = tk.wall()
+        shown.append(math.floor(wall))
+        clock_late.append(wall % 1.0)
+        return ticks.next_second(now)
+
+    def stopwatch_tick(now):
+        result["stopwatch"] = math.floor(stopwatch.elapsed(now))
+        return stopwatch.next_change(now)
+
+    def countdown_tick(now):
+        if countdown.remaining(now) == 0:
+            result["timer_late"] = now - countdown.end
+            return None
+        return countdown.next_change(now)
+
+    legacy = {"remaining": seconds}
+
+    def legacy_loop():
+        if legacy["remaining"] > 0:
+            legacy["remaining"] -= 1
+            tk.after(1000, legacy_loop)
+        else:
+            legacy["done_at"] = tk.now
+
+    start = tk.now
+    stopwatch.start()
+    ticks.add(clock_tick)
+    ticks.add(stopwatch_tick)
+    ticks.add(countdown_tick)
+    tk.after(1000, legacy_loop)
+    tk.run_until(start + seconds * (1 + max_latency) + 60)
+
+    first = shown[0]
+    return {
+        "seconds": seconds,
+        "clock_ticks": len(shown),
+        "clock_skipped": sum(1 for a, b in zip(shown, shown[1:]) if b - a > 1),
+        "clock_repeats": sum(1 for a, b in zip(shown, shown[1:]) if b == a),
+        "clock_last_second": shown[-1] - first,
+        "clock_max_late": max(clock_late[1:]),  # the first tick is the initial paint
+        "stopwatch_at_end": result.get("stopwatch"),
+        "timer_late": result.get("timer_late"),
+        "legacy_timer_late": legacy["done_at"] - (start + seconds),
+        "wakeups": ticks.wakeups,
+    }
+
+
+def simulate_hidden(minutes=10, recheck=60, seed=0):
+    # The clock face, a running stopwatch and a timer painting once a second,
+    # plus the app's alarm re-check every `recheck` seconds. The window is
+    # visible for `minutes`, hidden for as long (display ticks paused), then
+    # shown again. The timer runs out while hidden.
+    tk = _FakeTk(0.01, random.Random(seed))
+    ticks = TickScheduler(tk.after, tk.after_cancel, tk.clock, tk.wall)
+    window = "main"
+    stopwatch = Stopwatch(tk.clock)
+    period = minutes * 60
+    countdown = Countdown(period * 1.5, tk.clock)
+    painted = []  # monotonic times of clock face paints
+    result = {}
+
+    def clock_tick(now):
+        painted.append(now)
+        return ticks.next_second(now)
+
+    def stopwatch_tick(now):
+        return stopwatch.next_change(now)
+
+    def timer_tick(now):
+        return countdown.next_change(now) if countdown.remaining(now) else None
+
+    def timer_done(now):
+        result["timer_late"] = now - countdown.end
+        return None
+
+    def alarm_check(now):
+        return now + recheck
+
+    start = tk.now
+    stopwatch.start()
+    for callback in (clock_tick, stopwatch_tick, timer_tick):
+        ticks.add(callback, group=window)
+    ticks.add(timer_done, countdown.end)
+    ticks.add(alarm_check)
+    rates = []
+    for phase in range(3):
+        if phase == 1:
+            ticks.pause(window)
+        elif phase == 2:
+            shown = tk.now
+            ticks.resume(window)
+        before = ticks.wakeups
+        tk.run_until(start + (phase + 1) * period)
+        rates.append((ticks.wakeups - before) / minutes)
+    return {
+        "visible_per_minute": rates[0],
+        "hidden_per_minute": rates[1],
+        "shown_per_minute": rates[2],
+        "resync_late": min(t for t in painted if t >= shown) - shown,
+        "timer_late": result.get("timer_late"),
+        "stopwatch_at_end": math.floor(stopwatch.elapsed()),
+    }
+
+
+if __name__ == "__main__":
+    r = simulate()
+    print(f"Simulated {r['seconds']} s with up to 150 ms Tk callback latency, {r['wakeups']} wakeups")
+    print(f"  clock:     {r['clock_ticks']} ticks, {r['clock_skipped']} skipped and "
+          f"{r['clock_repeats']} repeated seconds, worst flip {r['clock_max_late'] * 1000:.1f} ms late")
+    print(f"  stopwatch: reads {r['stopwatch_at_end']} s after {r['clock_last_second']} wall seconds")
+    print(f"  timer:     finished {r['timer_late'] * 1000:.1f} ms late "
+          f"(old after(1000) countdown: {r['legacy_timer_late']:.0f} s late)")
+    assert r["clock_skipped"] == 0 and r["clock_repeats"] == 0
+    assert 0 <= r["timer_late"] <= 0.151, "cumulative drift in the countdown"
+    h = simulate_hidden()
+    print(f"Window visible: {h['visible_per_minute']:.0f} wakeups/min; hidden: {h['hidden_per_minute']:.1f}; "
+          f"shown again: {h['shown_per_minute']:.0f}")
+    print(f"  repainted {h['resync_late'] * 1000:.1f} ms after showing; timer ran out while hidden, "
+          f"{h['timer_late'] * 1000:.1f} ms late; stopwatch reads {h['stopwatch_at_end']} s")
@@ -0,0 +1,80 @@
+# File: clock_startup.py
+# Description: Startup benchmark for DigitalClock.py with budgets: -X importtime breakdown and time to first paint
+#
+# Usage:
+#   python clock_startup.py            report; exit status 1 if a budget is exceeded
+#   python clock_startup.py --runs 10
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+IMPORT_BUDGET_MS = 150        # cumulative "import DigitalClock"
+FIRST_PAINT_BUDGET_MS = 800   # process start to the first painted frame (needs a display)
+# Modules that must stay out of startup; they load when their feature is first used
+DEFERRED = ["pytz", "threading", "tkinter.messagebox", "tkinter.simpledialog", "clock_windows"]
+
+
+def import_profile(module="DigitalClock"):
+    # Rows of (cumulative us, self us, module) from python -X importtime
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          cwd=HERE, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative), int(own), name.strip()))
+    return rows
+
+
+def first_paint():
+    # Seconds from spawning the interpreter to the first frame being drawn,
+    # or None when no display is available
+    code = ("import DigitalClock; app = DigitalClock.DigitalClockApp(); app.update(); "
+            "print('painted', flush=True); app.destroy()")
+    t0 = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, "-c", code], cwd=HERE,
+                            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    line = proc.stdout.readline()
+    elapsed = time.perf_counter() - t0
+    proc.wait()
+    return elapsed if line.strip() == "painted" else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DigitalClock startup benchmark")
+    parser.add_argument("--runs", type=int, default=5, help="runs per measurement (the median is reported)")
+    args = parser.parse_args()
+
+    profiles = [import_profile() for _ in range(args.runs)]
+    totals = [next(c for c, _, name in rows if name == "DigitalClock") for rows in profiles]
+    import_ms = statistics.median(totals) / 1000
+    rows = profiles[totals.index(sorted(totals)[len(totals) // 2])]
+    print(f"import DigitalClock: {import_ms:.1f} ms (budget {IMPORT_BUDGET_MS} ms)")
+    print("  slowest modules by self time:")
+    for cumulative, own, name in sorted(rows, key=lambda r: -r[1])[:10]:
+        print(f"    {own / 1000:7.2f} ms self {cumulative / 1000:7.2f} ms cumulative  {name}")
+    loaded = {name for _, _, name in rows}
+    eager = [name for name in DEFERRED if name in loaded]
+    print(f"  deferred modules imported at startup: {', '.join(eager) or 'none'}")
+
+    paints = [first_paint() for _ in range(args.runs)]
+    failed = not import_ms <= IMPORT_BUDGET_MS or bool(eager)
+    if None in paints:
+        print("first paint: skipped (no display)")
+    else:
+        paint_ms = statistics.median(paints) * 1000
+        print(f"first paint: {paint_ms:.1f} ms (budget {FIRST_PAINT_BUDGET_MS} ms)")
+        failed = failed or paint_ms > FIRST_PAINT_BUDGET_MS
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
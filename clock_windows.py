@@ -0,0 +1,176 @@
+# File: clock_windows.py
+# Description: Stopwatch, timer and world-clock windows for DigitalClock.py, imported on first use
+
+import time  # For wall-clock readings
+import tkinter as tk  # For GUI creation
+from tkinter import ttk, messagebox  # For additional tkinter components
+from clock_scheduler import Stopwatch, Countdown, format_hms  # Monotonic stopwatch and countdown state
+from clock_world import WorldClock  # Many zones from one UTC instant with cached offsets
+
+WORLD_ROWS = 12  # Zones per column on the world-clock wall
+
+
+def open_stopwatch(app):
+    if hasattr(app, 'sw_win') and app.sw_win.winfo_exists(): return  # Avoid opening multiple stopwatch windows
+    app.sw_win = tk.Toplevel(app)  # Create a new top-level window for the stopwatch
+    app.sw_win.title("Stopwatch")  # Set the title for the stopwatch window
+    app.sw_win.configure(bg=app.theme['bg'])  # Match the current theme
+    app.watch_visibility(app.sw_win)  # No display ticks while the window cannot be seen
+    lbl = ttk.Label(app.sw_win, text="00:00:00", font=app.fonts['panel'], style='Clock.TLabel')  # Label for the stopwatch display
+    lbl.pack(pady=10)  # Pack the label with vertical padding
+    sw = Stopwatch()  # Stopwatch state, measured on the monotonic clock
+    bk = {'tick': None}  # Scheduler subscription while running
+
+    # Function to update stopwatch time
+    def sw_loop(now):
+        if not lbl.winfo_exists():
+            return None  # Window closed: stop ticking
+        app.render.set(lbl, format_hms(sw.elapsed(now)))  # Update display
+        return sw.next_change(now)  # Wake when the next whole second is reached
+
+    # Control buttons: Start, Stop, Reset
+    def start():
+        if not sw.running:
+            sw.start()  # Start or resume stopwatch
+            bk['tick'] = app.ticks.add(sw_loop, group=app.sw_win)
+    def stop():
+        sw.stop()  # Stop the stopwatch
+        app.ticks.remove(bk['tick'])
+        app.render.set(lbl, format_hms(sw.elapsed()))
+    def reset(): stop(); sw.reset(); app.render.set(lbl, '00:00:00')  # Reset the stopwatch
+
+    # Button frame and buttons
+    btnf = ttk.Frame(app.sw_win)
+    btnf.pack()
+    ttk.Button(btnf, text="Start", command=start).pack(side='left')  # Start button
+    ttk.Button(btnf, text="Stop", command=stop).pack(side='left')  # Stop button
+    ttk.Button(btnf, text="Reset", command=reset).pack(side='left')  # Reset button
+
+
+def open_timer(app):
+    if hasattr(app, 'tm_win') and app.tm_win.winfo_exists(): return  # Avoid opening multiple timer windows
+    app.tm_win = tk.Toplevel(app)  # Create a new top-level window for the timer
+    app.tm_win.title("Timer")  # Set the title for the timer window
+    app.tm_win.configure(bg=app.theme['bg'])  # Match the current theme
+    app.watch_visibility(app.tm_win)  # No display ticks while the window cannot be seen
+    lbl = ttk.Label(app.tm_win, text="00:00", font=app.fonts['panel'], style='Clock.TLabel')  # Label for the timer display
+    lbl.pack(pady=10)  # Pack the label with vertical padding
+    entry = ttk.Entry(app.tm_win)  # Entry field for setting timer duration
+    entry.insert(0, '00:01:00')  # Default time (1 minute)
+    entry.pack()
+
+    bk = {'countdown': None, 'tick': None, 'done': None}  # Timer state
+
+    # Function to update timer time; paused while the window is hidden
+    def tm_loop(now):
+        if not lbl.winfo_exists():
+            return None  # Window closed: stop ticking
+        remaining = bk['countdown'].remaining(now)  # Whole seconds left until the end deadline
+        app.render.set(lbl, format_hms(remaining))  # Update display
+        if remaining == 0:
+            bk['tick'] = None  # Nothing left to count down
+            return None
+        return bk['countdown'].next_change(now)  # Wake when the next second is reached
+
+    # Runs once at the end deadline, visible or not
+    def tm_done(now):
+        bk['done'] = None
+        if not lbl.winfo_exists():
+            return None  # Window closed: the timer was abandoned
+        app.render.set(lbl, format_hms(0))
+        app.after_idle(messagebox.showinfo, "Timer", "Time's up!")  # Show "time's up" message once the tick is done
+        return None
+
+    # Control buttons: Start, Stop, Reset
+    def start():
+        h, m, s = map(int, entry.get().split(':'))  # Parse the time input
+        stop()
+        bk['countdown'] = Countdown(h * 3600 + m * 60 + s)  # End deadline on the monotonic clock
+        bk['tick'] = app.ticks.add(tm_loop, group=app.tm_win)  # Start the display
+        bk['done'] = app.ticks.add(tm_done, bk['countdown'].end)  # Arm the deadline
+    def stop():
+        for key in ('tick', 'done'):
+            if bk[key] is not None:
+                app.ticks.remove(bk[key])  # Stop the timer
+                bk[key] = None
+    def reset(): stop(); app.render.set(lbl, '00:00:00')  # Reset the timer
+
+    # Button frame and buttons
+    frm = ttk.Frame(app.tm_win)
+    frm.pack()
+    ttk.Button(frm, text="Start", command=start).pack(side='left')  # Start button
+    ttk.Button(frm, text="Stop", command=stop).pack(side='left')  # Stop button
+    ttk.Button(frm, text="Reset", command=reset).pack(side='left')  # Reset button
+
+
+def open_world_clock(app, zones):
+    if hasattr(app, 'wc_win') and app.wc_win.winfo_exists(): return  # Avoid opening multiple world-clock windows
+    app.wc_win = tk.Toplevel(app)  # Create a new top-level window for the world-clock wall
+    app.wc_win.title("World Clock")  # Set the title for the world-clock window
+    app.wc_win.configure(bg=app.theme['bg'])  # Match the current theme
+    app.watch_visibility(app.wc_win)  # No display ticks while the window cannot be seen
+    wall = WorldClock(zones)  # Zone state with cached UTC offsets
+    grid = ttk.Frame(app.wc_win, style='Clock.TFrame')  # Frame holding one row of labels per zone
+    grid.pack(padx=10, pady=10)
+    rows = []  # Name, time and date labels for each zone
+    bk = {'tick': None}  # Scheduler subscription
+
+    def place_rows():
+        for i, row in enumerate(rows):  # Fill columns of WORLD_ROWS zones each
+            col = i // WORLD_ROWS * 3
+            for j, key in enumerate(('name', 'time', 'date')):
+                row[key].grid(row=i % WORLD_ROWS, column=col + j, sticky='w', padx=4)
+
+    def add_row(zone):
+        row = {
+            'name': ttk.Label(grid, text=zone.name, font=app.fonts['info'], style='Clock.TLabel'),  # Zone name
+            'time': ttk.Label(grid, text="", font=app.fonts['zone'], style='Clock.TLabel'),  # Local time
+            'date': ttk.Label(grid, text="", font=app.fonts['info'], style='Clock.TLabel'),  # Local date and abbreviation
+        }
+        row['name'].bind('<Double-Button-1>', lambda e: remove_zone(row))  # Double-click a name to remove it
+        rows.append(row)
+
+    # Function to update the wall: one UTC reading, then only the labels whose text changed
+    def wc_loop(now):
+        if not grid.winfo_exists():
+            return None  # Window closed: stop ticking
+        for i, field, text in wall.update():
+            app.render.set(rows[i][field], text)
+        wall_now = time.time()
+        return now + wall.next_change(wall_now) - wall_now  # Wake at the next minute boundary
+
+    def restart():
+        app.ticks.remove(bk['tick'])
+        bk['tick'] = app.ticks.add(wc_loop, group=app.wc_win)  # Paint the new layout right away
+
+    def add_zone():
+        name = zone_cb.get()  # Zone chosen in the combobox
+        if not name or any(z.name == name for z in wall.zones): return
+        try:
+            index = wall.add(name)
+        except pytz.UnknownTimeZoneError:
+            messagebox.showerror("World Clock", f"Unknown time zone: {name}", parent=app.wc_win)  # The combobox accepts typed names
+            return
+        add_row(wall.zones[index])
+        place_rows()
+        restart()
+
+    def remove_zone(row):
+        i = rows.index(row)
+        wall.remove(i)
+        for w in rows.pop(i).values(): app.render.forget(w); w.destroy()
+        place_rows()
+
+    for zone in wall.zones:
+        add_row(zone)
+    place_rows()
+
+    # Zone picker
+    frm = ttk.Frame(app.wc_win)
+    frm.pack(pady=5)
+    import pytz  # Only the zone list is needed here; WorldClock already loaded the zone data
+    zone_cb = ttk.Combobox(frm, values=pytz.common_timezones, width=30)  # Any tz database zone
+    zone_cb.pack(side='left', padx=2)
+    ttk.Button(frm, text="Add Zone", command=add_zone).pack(side='left')  # Add the chosen zone to the wall
+
+    restart()  # Start the wall loop
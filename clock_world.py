@@ -0,0 +1,152 @@
+# File: clock_world.py
+# Description: World-clock wall core: many zones from one UTC instant with cached offsets (no Tk import)
+#
+# Each zone keeps its current UTC offset together with the UTC interval it is
+# valid for, taken from pytz's transition table, so a tick is one integer add
+# per zone and pytz is only consulted again at the zone's next DST change.
+#
+# Usage:
+#   python clock_world.py    tick cost for 1 to 500 zones against datetime.now(zone)
+
+import bisect
+import time
+from datetime import datetime
+
+_EPOCH = datetime(1970, 1, 1)
+_FOREVER = float("inf")
+
+
+class CachedZone:
+    __slots__ = ("name", "offset", "abbr", "valid_from", "valid_until", "_times", "_infos",
+                 "time_key", "time_text", "day_key", "date_text")
+
+    def __init__(self, name):
+        import pytz  # Loaded on first use so importing this module stays cheap
+        zone = pytz.timezone(name)
+        self.name = zone.zone
+        times = getattr(zone, "_utc_transition_times", None)
+        if times:
+            # Transition i starts at _times[i] (UTC seconds) with _infos[i]
+            self._times = [(t - _EPOCH).total_seconds() for t in times]
+            self._infos = [(int(info[0].total_seconds()), info[2]) for info in zone._transition_info]
+        else:
+            # Fixed-offset zone (UTC, Etc/GMT+5, ...): one interval forever
+            now = zone.localize(datetime(2000, 1, 1))
+            self._times = [-_FOREVER]
+            self._infos = [(int(now.utcoffset().total_seconds()), now.tzname())]
+        self.valid_from = self.valid_until = -_FOREVER
+        self.time_key = self.day_key = None
+        self.time_text = self.date_text = ""
+
+    def offset_at(self, utc):
+        # UTC offset in seconds at UTC timestamp `utc`; the bisect only runs
+        # when `utc` leaves the cached interval, i.e. at a DST transition
+        if not self.valid_from <= utc < self.valid_until:
+            i = max(bisect.bisect_right(self._times, utc) - 1, 0)
+            self.offset, self.abbr = self._infos[i]
+            self.valid_from = self._times[i]
+            self.valid_until = self._times[i + 1] if i + 1 < len(self._times) else _FOREVER
+            self.day_key = None  # the zone abbreviation in the date line may have changed
+        return self.offset
+
+
+def format_clock(local, show_seconds=False):
+    # "07:05 PM" / "07:05:09 PM" from integer local seconds since the epoch
+    hour = local // 3600 % 24
+    text = f"{hour % 12 or 12:02d}:{local // 60 % 60:02d}"
+    if show_seconds:
+        text += f":{local % 60:02d}"
+    return text + (" AM" if hour < 12 else " PM")
+
+
+class WorldClock:
+    # Any number of zones ticked from a single time.time() reading. update()
+    # returns only the (index, field, text) triples whose text changed, so
+    # the view touches just those widgets. date_format is a strftime format
+    # in which %Z is the zone's current abbreviation.
+    def __init__(self, names=(), show_seconds=False, date_format="%a %d %b %Z", clock=time.time):
+        self.clock = clock
+        self.show_seconds = show_seconds
+        self.date_format = date_format
+        self.zones = []
+        for name in names:
+            self.add(name)
+
+    def add(self, name):
+        self.zones.append(CachedZone(name))
+        return len(self.zones) - 1
+
+    def remove(self, index):
+        del self.zones[index]
+
+    def step(self):
+        return 1 if self.show_seconds else 60
+
+    def next_change(self, now=None):
+        # UTC timestamp of the next boundary at which any displayed text can change
+        # (every offset in the tz database is a whole number of minutes)
+        if now is None:
+            now = self.clock()
+        step = self.step()
+        return (int(now) // step + 1) * step
+
+    def update(self, now=None):
+        utc = int(self.clock() if now is None else now)
+        step = self.step()
+        changes = []
+        for i, zone in enumerate(self.zones):
+            local = utc + zone.offset_at(utc)
+            key = local // step
+            if key != zone.time_key:
+                zone.time_key = key
+                text = format_clock(local, self.show_seconds)
+                if text != zone.time_text:
+                    zone.time_text = text
+                    changes.append((i, "time", text))
+            day = local // 86400
+            if day != zone.day_key:
+                zone.day_key = day
+                text = time.strftime(self.date_format.replace("%Z", zone.abbr), time.gmtime(local))
+                if text != zone.date_text:
+                    zone.date_text = text
+                    changes.append((i, "date", text))
+        return changes
+
+
+def _naive_tick(zones, show_seconds):
+    # The pre-cache approach: localize the current time in every zone
+    fmt = "%I:%M:%S %p" if show_seconds else "%I:%M %p"
+    return [(datetime.now(zone).strftime(fmt), datetime.now(zone).strftime("%a %d %b %Z")) for zone in zones]
+
+
+def run_benchmark():
+    import pytz
+    names = sorted(pytz.common_timezones)
+    start = 1_700_000_000
+    print(f"{'zones':>6} {'changing tick us':>17} {'idle tick us':>13} {'naive tick us':>14} {'us/zone':>8}")
+    for n in (1, 10, 50, 100, 250, 500):
+        chosen = [names[i * len(names) // n] for i in range(n)]
+        wall = WorldClock(chosen, show_seconds=True)
+        wall.update(start)
+        rounds = max(20, 20_000 // n)
+        t0 = time.perf_counter()
+        for s in range(1, rounds + 1):
+            wall.update(start + s)  # every zone's seconds change
+        changing = (time.perf_counter() - t0) / rounds
+        minutes = WorldClock(chosen, show_seconds=False)
+        minutes.update(start)
+        t0 = time.perf_counter()
+        for s in range(rounds):
+            minutes.update(start + 1)  # same minute: nothing to redraw
+        idle = (time.perf_counter() - t0) / rounds
+        zones = [pytz.timezone(name) for name in chosen]
+        naive_rounds = max(5, rounds // 10)
+        t0 = time.perf_counter()
+        for _ in range(naive_rounds):
+            _naive_tick(zones, True)
+        naive = (time.perf_counter() - t0) / naive_rounds
+        print(f"{n:>6} {changing * 1e6:>17.1f} {idle * 1e6:>13.1f} {naive * 1e6:>14.1f} {changing / n * 1e6:>8.2f}")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -1,7 +1,66 @@
 import tkinter as tk
 from tkinter import messagebox
-import random
-import copy
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from tictactoe_board import Board
+from tictactoe_ai import DIFFICULTIES, choose_move
+
+# Menu label -> (board size, marks in a row needed to win)
+BOARD_SIZES = {
+    "3x3": (3, 3),
+    "4x4": (4, 4),
+    "5x5 (4 in a row)": (5, 4),
+    "15x15 (5 in a row)": (15, 5),
+}
+AI_MIN_DELAY_MS = 500   # the computer's move never appears sooner than this
+AI_POLL_MS = 20
+
+class AIWorker:
+    # Runs AI searches on a background thread so the Tk event loop stays
+    # responsive. Results come back through a queue polled with after();
+    # each search gets its own cancel Event and a job number so results of
+    # cancelled or superseded searches are dropped.
+    def __init__(self):
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tictactoe-ai")
+        self.results = queue.Queue()
+        self.job = 0
+        self.cancel_event = threading.Event()
+
+    def submit(self, fn, *args):
+        self.cancel()
+        self.job += 1
+        job = self.job
+        cancel = self.cancel_event = threading.Event()
+
+        def run():
+            try:
+                result = fn(*args, cancel=cancel)
+            except Exception as e:
+                result = e
+            if not cancel.is_set():
+                self.results.put((job, result))
+
+        self.executor.submit(run)
+        return job
+
+    def poll(self, job):
+        # (True, result) once job has finished, else (False, None)
+        while True:
+            try:
+                done, result = self.results.get_nowait()
+            except queue.Empty:
+                return False, None
+            if done == job:
+                return True, result
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def shutdown(self):
+        self.cancel()
+        self.executor.shutdown(wait=False)
 
 class TicTacToe:
     def __init__(self, master):
@@ -9,46 +68,63 @@ class TicTacToe:
         self.master.title("Tic Tac Toe Menu")
         self.mode = tk.StringVar(value="Human vs Human")
         self.difficulty = tk.StringVar(value="Easy")
+        self.board_size = tk.StringVar(value="3x3")
 
         tk.Label(master, text="Choose Mode:").pack()
         tk.OptionMenu(master, self.mode, "Human vs Human", "Human vs Computer").pack()
 
         tk.Label(master, text="AI Difficulty:").pack()
-        tk.OptionMenu(master, self.difficulty, "Easy", "Normal", "Hard").pack()
+        tk.OptionMenu(master, self.difficulty, *DIFFICULTIES).pack()
+
+        tk.Label(master, text="Board Size:").pack()
+        tk.OptionMenu(master, self.board_size, *BOARD_SIZES).pack()
 
         tk.Button(master, text="Start Game", command=self.start_game).pack(pady=10)
 
     def start_game(self):
         self.new_window = tk.Toplevel(self.master)
-        GameBoard(self.new_window, self.mode.get(), self.difficulty.get())
+        size, k = BOARD_SIZES[self.board_size.get()]
+        GameBoard(self.new_window, self.mode.get(), self.difficulty.get(), size, k)
 
 class GameBoard:
-    def __init__(self, root, mode, difficulty):
+    def __init__(self, root, mode, difficulty, size=3, k=3):
         self.root = root
         self.root.title("Tic Tac Toe")
         self.mode = mode
         self.difficulty = difficulty
-        self.board = [["" for _ in range(3)] for _ in range(3)]
+        self.size = size
+        self.k = k
+        self.board = Board(size=size, k=k)
         self.current_player = "X"
-        self.buttons = [[None for _ in range(3)] for _ in range(3)]
+        self.buttons = [[None for _ in range(size)] for _ in range(size)]
+        self.worker = AIWorker()
+        self.ai_job = None
+        self.ai_after = None
         self.create_board()
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
 
     def create_board(self):
-        for i in range(3):
-            for j in range(3):
-                btn = tk.Button(self.root, text="", font=('Helvetica', 32), width=5, height=2,
+        # Shrink the buttons as the board grows so it still fits on screen
+        big = self.size <= 3
+        font_size = 32 if big else max(10, 64 // self.size)
+        for i in range(self.size):
+            for j in range(self.size):
+                btn = tk.Button(self.root, text="", font=('Helvetica', font_size),
+                                width=5 if big else 2, height=2 if big else 1,
                                 command=lambda row=i, col=j: self.make_move(row, col))
                 btn.grid(row=i, column=j)
                 self.buttons[i][j] = btn
+        self.status = tk.Label(self.root, text="")
+        self.status.grid(row=self.size, column=0, columnspan=self.size)
 
     def make_move(self, row, col):
-        if self.board[row][col] != "":
-            return
+        if self.ai_job is not None or self.board.get(row, col) != "":
+            return  # the computer is thinking, or the cell is taken
 
         if self.mode == "Human vs Human" or self.current_player == "X":
-            self.board[row][col] = self.current_player
+            self.board = self.board.play(row * self.size + col, self.current_player)
             self.buttons[row][col].config(text=self.current_player)
-            if self.check_winner(self.current_player):
+            if self.check_winner(self.current_player, row, col):
                 messagebox.showinfo("Game Over", f"{self.current_player} wins!")
                 self.reset_game()
                 return
@@ -59,21 +135,45 @@ class GameBoard:
             self.current_player = "O" if self.current_player == "X" else "X"
 
         if self.mode == "Human vs Computer" and self.current_player == "O":
-            self.root.after(500, self.ai_move)
+            self.start_ai_move()
+
+    def start_ai_move(self):
+        # Search on the worker thread with a snapshot of the (immutable) board
+        self.ai_started = time.monotonic()
+        self.ai_job = self.worker.submit(self.compute_move, self.board)
+        self.status.config(text="Computer is thinking...")
+        self.ai_after = self.root.after(AI_POLL_MS, self.poll_ai_move)
+
+    def poll_ai_move(self):
+        done, move = self.worker.poll(self.ai_job)
+        if not done:
+            self.ai_after = self.root.after(AI_POLL_MS, self.poll_ai_move)
+            return
+        if isinstance(move, Exception):
+            # Unlock the board; a click on any empty cell asks the computer again
+            self.cancel_ai_move()
+            self.status.config(text=f"Computer move failed ({type(move).__name__}: {move}); click to retry")
+            return
+        # Search time counts towards the minimum delay instead of adding to it
+        wait = AI_MIN_DELAY_MS - int((time.monotonic() - self.ai_started) * 1000)
+        if wait > 0:
+            self.ai_after = self.root.after(wait, self.ai_move, move)
+        else:
+            self.ai_move(move)
 
-    def ai_move(self):
-        if self.difficulty == "Easy":
-            move = self.get_random_move()
-        elif self.difficulty == "Normal":
-            move = self.get_normal_ai_move()
-        else:  # Hard
-            move = self.get_best_move()
+    def compute_move(self, board, cancel):
+        # Runs on the worker thread: must not touch any widget
+        return choose_move(board, self.difficulty, "O", cancel=cancel)
 
+    def ai_move(self, move):
+        self.ai_job = None
+        self.ai_after = None
+        self.status.config(text="")
         if move:
             row, col = move
-            self.board[row][col] = "O"
+            self.board = self.board.play(row * self.size + col, "O")
             self.buttons[row][col].config(text="O")
-            if self.check_winner("O"):
+            if self.check_winner("O", row, col):
                 messagebox.showinfo("Game Over", "Computer (O) wins!")
                 self.reset_game()
             elif self.is_draw():
@@ -82,95 +182,34 @@ class GameBoard:
             else:
                 self.current_player = "X"
 
-    def get_random_move(self):
-        empty = [(i, j) for i in range(3) for j in range(3) if self.board[i][j] == ""]
-        return random.choice(empty) if empty else None
-
-    def get_normal_ai_move(self):
-        # Win if possible
-        for i in range(3):
-            for j in range(3):
-                if self.board[i][j] == "":
-                    self.board[i][j] = "O"
-                    if self.check_winner("O"):
-                        return (i, j)
-                    self.board[i][j] = ""
-        # Block if X can win
-        for i in range(3):
-            for j in range(3):
-                if self.board[i][j] == "":
-                    self.board[i][j] = "X"
-                    if self.check_winner("X"):
-                        self.board[i][j] = ""
-                        return (i, j)
-                    self.board[i][j] = ""
-        # Else random
-        return self.get_random_move()
-
-    def get_best_move(self):
-        best_score = -float('inf')
-        move = None
-        for i in range(3):
-            for j in range(3):
-                if self.board[i][j] == "":
-                    self.board[i][j] = "O"
-                    score = self.minimax(False)
-                    self.board[i][j] = ""
-                    if score > best_score:
-                        best_score = score
-                        move = (i, j)
-        return move
-
-    def minimax(self, is_max):
-        if self.check_winner("O"):
-            return 1
-        elif self.check_winner("X"):
-            return -1
-        elif self.is_draw():
-            return 0
-
-        if is_max:
-            best = -float('inf')
-            for i in range(3):
-                for j in range(3):
-                    if self.board[i][j] == "":
-                        self.board[i][j] = "O"
-                        best = max(best, self.minimax(False))
-                        self.board[i][j] = ""
-            return best
-        else:
-            best = float('inf')
-            for i in range(3):
-                for j in range(3):
-                    if self.board[i][j] == "":
-                        self.board[i][j] = "X"
-                        best = min(best, self.minimax(True))
-                        self.board[i][j] = ""
-            return best
-
-    def check_winner(self, player):
-        win_lines = (
-            self.board,
-            zip(*self.board),
-            [[self.board[i][i] for i in range(3)]],
-            [[self.board[i][2-i] for i in range(3)]]
-        )
-        for line_group in win_lines:
-            for line in line_group:
-                if all(cell == player for cell in line):
-                    return True
-        return False
+    def cancel_ai_move(self):
+        self.worker.cancel()
+        if self.ai_after is not None:
+            self.root.after_cancel(self.ai_after)
+        self.ai_job = None
+        self.ai_after = None
+        self.status.config(text="")
+
+    def check_winner(self, player, row, col):
+        # Only lines through the last move can have been completed
+        return self.board.wins_at(row * self.size + col, player)
 
     def is_draw(self):
-        return all(self.board[i][j] != "" for i in range(3) for j in range(3))
+        return self.board.is_full()
 
     def reset_game(self):
-        self.board = [["" for _ in range(3)] for _ in range(3)]
+        self.cancel_ai_move()
+        self.board = Board(size=self.size, k=self.k)
         self.current_player = "X"
         for row in self.buttons:
             for btn in row:
                 btn.config(text="")
 
+    def close(self):
+        self.cancel_ai_move()
+        self.worker.shutdown()
+        self.root.destroy()
+
 if __name__ == "__main__":
     root = tk.Tk()
     app = TicTacToe(root)
@@ -0,0 +1,404 @@
+# File: snake_autoplay.py
+# Description: Deterministic snake autoplayer (no pygame): A* over a reused distance field, tail-chasing safety, Hamiltonian-cycle fallback
+#
+# On boards with a Hamiltonian cycle (an even side and no obstacles) the
+# snake only makes moves that keep its body in cycle order with spare cells
+# ahead of the head. Among those it takes the one nearest the food, and when
+# none qualifies it follows the cycle, which is always safe. A decision is a
+# few lookups however large the board is.
+#
+# Elsewhere (Hard mode's obstacles, odd x odd boards) it searches: a
+# DistanceField of BFS distances to the food around the obstacles is built
+# once per food and reused every tick as the A* heuristic, so a search only
+# expands the cells where the body forces a detour. A path is followed only
+# if the tail is still reachable after eating; otherwise the snake chases its
+# tail, or failing that heads for the largest open area.
+#
+# Usage:
+#   python snake_autoplay.py                               ticks/s and decision time from 30x20 to 200x200
+#   python snake_autoplay.py bench --size 60x40 --mode Hard --games 3
+#   python snake_autoplay.py verify                        A* against BFS; cycle boards fill up
+
+import argparse
+import heapq
+import time
+from collections import deque
+from snake_body import EMPTY, OBSTACLE
+from snake_engine import MODES, UP, DOWN, LEFT, RIGHT, CRASH, TIME_UP, BOARD_FULL
+from snake_replay import new_game, advance
+
+INF = 1 << 30
+SHORTCUT_ROOM = 4      # free cycle cells that must stay ahead of the head after a shortcut
+SHORTCUT_LIMIT = 0.5   # above this fraction of the board, follow the cycle strictly
+RETRY_TICKS = 4        # while chasing the tail, search for a safe path to the food this often
+STALL_BOARDS = 2       # after chasing the tail for this many board sizes of ticks, risk an unsafe path
+BENCH_SIZES = ((30, 20), (60, 40), (120, 80), (200, 200))
+BENCH_TICKS = 200_000  # per game; big boards take millions of ticks to fill
+
+
+def board_neighbors(width, height, wrap=False):
+    # Per flat cell, [(neighbour cell, direction), ...] in UP, DOWN, LEFT, RIGHT order
+    neighbors = []
+    for y in range(height):
+        for x in range(width):
+            row = []
+            for d in (UP, DOWN, LEFT, RIGHT):
+                nx, ny = x + d[0], y + d[1]
+                if wrap:
+                    nx, ny = nx % width, ny % height
+                elif not (0 <= nx < width and 0 <= ny < height):
+                    continue
+                row.append((nx + ny * width, d))
+            neighbors.append(row)
+    return neighbors
+
+
+def hamiltonian_cycle(width, height):
+    # Flat cells in cycle order, or None if the board has none (both sides
+    # odd, or a side shorter than 2). Runs along row 0, snakes back through
+    # columns 1.. of the other rows and returns up column 0.
+    if width < 2 or height < 2:
+        return None
+    if height % 2:
+        if width % 2:
+            return None
+        return [c // height + c % height * width for c in hamiltonian_cycle(height, width)]
+    order = [x for x in range(width)]
+    for y in range(1, height):
+        xs = range(width - 1, 0, -1) if y % 2 else range(1, width)
+        order.extend(x + y * width for x in xs)
+    order.extend(y * width for y in range(height - 1, 0, -1))
+    return order
+
+
+class DistanceField:
+    # BFS distance from every cell to one target cell, going around
+    # obstacles but through the snake. Obstacles never move, so the field
+    # stays valid until the target does.
+    def __init__(self, cells, neighbors):
+        self.cells = cells  # the OccupancyGrid's bytearray
+        self.neighbors = neighbors
+        self.dist = [INF] * len(cells)
+        self.target = None
+        self.builds = 0
+
+    def reset(self, target):
+        cells, neighbors = self.cells, self.neighbors
+        dist = [INF] * len(cells)
+        dist[target] = 0
+        queue = [target]
+        for c in queue:
+            d = dist[c] + 1
+            for n, _ in neighbors[c]:
+                if dist[n] == INF and cells[n] != OBSTACLE:
+                    dist[n] = d
+                    queue.append(n)
+        self.dist = dist
+        self.target = target
+        self.builds += 1
+
+
+class Autoplayer:
+    # Plays one SnakeEngine game: call choose() right before every step and
+    # pass its result as the step's action. Decisions depend only on the
+    # engine's state, so a seeded game always plays out the same way.
+    def __init__(self, engine):
+        self.engine = engine
+        grid = engine.grid
+        self.width = grid.width
+        self.height = grid.height
+        self.wrap = engine.mode == "Infinite"
+        self.neighbors = board_neighbors(grid.width, grid.height, self.wrap)
+        self.field = DistanceField(grid.cells, self.neighbors)
+        cycle = None if len(engine.obstacles) else hamiltonian_cycle(grid.width, grid.height)
+        self.rank = None  # cell -> position on the cycle
+        if cycle:
+            self.rank = [0] * len(cycle)
+            for k, c in enumerate(cycle):
+                self.rank[c] = k
+        self.plan = deque()  # cells still to visit on a path checked by _tail_safe
+        self.stalled = 0     # ticks spent chasing the tail since the last safe path
+        self.stall_limit = STALL_BOARDS * len(grid.cells)
+        self.expanded = 0    # A* nodes expanded, for the benchmark
+
+    def cell(self, pos):
+        return pos[0] + pos[1] * self.width
+
+    def moves(self):
+        # (cell, direction) of each move that does not crash this tick
+        engine = self.engine
+        cells = engine.grid.cells
+        back = (-engine.direction[0], -engine.direction[1])
+        return [(c, d) for c, d in self.neighbors[self.cell(engine.snake.head)] if cells[c] == EMPTY and d != back]
+
+    def choose(self):
+        engine = self.engine
+        if engine.done or engine.food is None:
+            return None
+        head = self.cell(engine.snake.head)
+        moves = self.moves()
+        if not moves:
+            return None  # boxed in
+        if self.rank:
+            return self._cycle_move(head, moves)
+        return self._search_move(head, moves)
+
+    def _grid_distance(self, a, b):
+        # Steps between two cells on an empty board: the field's value when
+        # there are no obstacles, without building it
+        dx = abs(a % self.width - b % self.width)
+        dy = abs(a // self.width - b // self.width)
+        if self.wrap:
+            dx, dy = min(dx, self.width - dx), min(dy, self.height - dy)
+        return dx + dy
+
+    def _cycle_move(self, head, moves):
+        # Never pass the tail or the food in cycle order, and only shortcut
+        # while the board is less than SHORTCUT_LIMIT full and SHORTCUT_ROOM
+        # cells stay free ahead
+        rank = self.rank
+        n = len(rank)
+        snake = self.engine.snake
+        ahead = (rank[self.cell(snake.tail)] - rank[head]) % n or n
+        shortcuts = len(snake) <= n * SHORTCUT_LIMIT
+        target = self.cell(self.engine.food)
+        food = rank[target]
+        to_food = (food - rank[head]) % n
+        best = follow = None
+        for c, d in moves:
+            step = (rank[c] - rank[head]) % n
+            if step == 1:
+                follow = d
+            elif step >= ahead or step > to_food or not shortcuts or ahead - step - 1 < SHORTCUT_ROOM:
+                continue
+            key = (self._grid_distance(c, target), (food - rank[c]) % n)
+            if best is None or key < best[0]:
+                best = (key, d)
+        if best:
+            return best[1]
+        return follow or moves[0][1]
+
+    def _search_move(self, head, moves):
+        target = self.cell(self.engine.food)
+        if target != self.field.target:
+            self.field.reset(target)
+            self.plan.clear()
+        if self.plan:
+            nxt = self.plan[0]
+            for c, d in moves:
+                if c == nxt:
+                    self.plan.popleft()
+                    return d
+            self.plan.clear()
+        if self.stalled % RETRY_TICKS == 0:
+            path = self._food_path(moves)
+            # A snake that can only circle its tail would do so forever; in
+            # the end it takes its chances so that every game finishes
+            if path and (self.stalled >= self.stall_limit or self._tail_safe(path)):
+                self.stalled = 0
+                self.plan.extend(path[1:])
+                return next(d for c, d in moves if c == path[0])
+        self.stalled += 1
+        return self._chase_tail(moves)
+
+    def _food_path(self, moves):
+        # A* from the head to the food with the distance field as heuristic,
+        # or None. Body segment j (0 = head) of L can be entered from step
+        # L - j + 1 on, once the tail has moved off it.
+        dist, neighbors, cells = self.field.dist, self.neighbors, self.engine.grid.cells
+        target = self.field.target
+        segments = self.engine.snake.segments
+        length = len(segments)
+        free_at = {self.cell(pos): length - j + 1 for j, pos in enumerate(segments)}
+        best = {}
+        came = {}
+        heap = []
+        for c, _ in moves:
+            if dist[c] < INF:
+                best[c] = 1
+                came[c] = None
+                heap.append((1 + dist[c], -1, c))
+        heapq.heapify(heap)
+        while heap:
+            _, g, c = heapq.heappop(heap)
+            g = -g
+            if g > best[c]:
+                continue
+            self.expanded += 1
+            if c == target:
+                path = []
+                while c is not None:
+                    path.append(c)
+                    c = came[c]
+                return path[::-1]
+            g += 1
+            for n, _ in neighbors[c]:
+                if dist[n] == INF or (cells[n] != EMPTY and free_at.get(n, INF) > g):
+                    continue
+                if g < best.get(n, INF):
+                    best[n] = g
+                    came[n] = c
+                    heapq.heappush(heap, (g + dist[n], -g, n))
+        return None
+
+    def _body(self):
+        return [self.cell(pos) for pos in self.engine.snake.segments]
+
+    def _tail_safe(self, path):
+        # Would the head still reach the tail after following path and eating?
+        body = self._body()
+        grown = path[::-1] + body[:max(0, len(body) + 1 - len(path))]
+        return self._flood(grown[:len(body) + 1])[0] is not None
+
+    def _chase_tail(self, moves):
+        # Of the moves that keep the tail reachable, the one furthest from it;
+        # with none, the one opening onto the most free cells
+        body = self._body()
+        food = self.cell(self.engine.food)
+        best = None
+        for c, d in moves:
+            reach, area = self._flood([c] + (body if c == food else body[:-1]))
+            key = (reach is not None, reach or 0, area)
+            if best is None or key > best[0]:
+                best = (key, d)
+        return best[1]
+
+    def _flood(self, body):
+        # (steps from body's head to its tail or None, free cells reachable)
+        # with the snake laid out over `body`, head first
+        if len(body) == 1:
+            return 0, 0
+        neighbors, cells = self.neighbors, self.engine.grid.cells
+        occupied = set(body)
+        start, tail = body[0], body[-1]
+        seen = {start}
+        frontier = [start]
+        reach = None
+        steps = area = 0
+        while frontier:
+            steps += 1
+            below = []
+            for c in frontier:
+                for n, _ in neighbors[c]:
+                    if n == tail and c != start and reach is None:
+                        reach = steps
+                    if n not in seen and n not in occupied and cells[n] != OBSTACLE:
+                        seen.add(n)
+                        below.append(n)
+            area += len(below)
+            frontier = below
+        return reach, area
+
+
+# === HEADLESS RUNS ===
+
+def _percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def play(mode="Classic", width=30, height=20, seed=0, max_ticks=BENCH_TICKS):
+    # One autoplayed game on a TickClock; returns its statistics
+    engine, clock = new_game(mode, seed, width, height)
+    player = Autoplayer(engine)
+    decisions = []
+    events = ()
+    perf = time.perf_counter
+    t0 = perf()
+    while not engine.done and len(decisions) < max_ticks:
+        t = perf()
+        action = player.choose()
+        decisions.append(perf() - t)
+        events = advance(engine, clock, action)
+    elapsed = perf() - t0
+    end = next((e for e in (BOARD_FULL, CRASH, TIME_UP) if e in events), "tick limit")
+    decisions.sort()
+    ticks = len(decisions)
+    return {
+        "mode": mode, "size": f"{width}x{height}", "seed": seed, "ticks": ticks, "end": end,
+        "score": engine.score, "length": len(engine.snake),
+        "occupancy": len(engine.snake) / (width * height - len(engine.obstacles)),
+        "ticks_per_s": ticks / elapsed,
+        "decision_mean_us": sum(decisions) / max(ticks, 1) * 1e6,
+        "decision_p50_us": _percentile(decisions, 0.5) * 1e6,
+        "decision_p99_us": _percentile(decisions, 0.99) * 1e6,
+        "decision_max_us": (decisions[-1] if decisions else 0.0) * 1e6,
+        "expanded_per_tick": player.expanded / max(ticks, 1),
+        "field_builds": player.field.builds,
+    }
+
+
+def run_benchmark(sizes=BENCH_SIZES, mode="Classic", games=1, seed=0, max_ticks=BENCH_TICKS):
+    print(f"{'size':>8} {'ticks':>8} {'ticks/s':>9} {'mean us':>8} {'p50 us':>7} {'p99 us':>7} {'max us':>8}"
+          f" {'A*/tick':>8} {'full':>6}  end")
+    for width, height in sizes:
+        for g in range(games):
+            s = play(mode, width, height, seed + g, max_ticks)
+            print(f"{s['size']:>8} {s['ticks']:>8} {s['ticks_per_s']:>9,.0f} {s['decision_mean_us']:>8.1f}"
+                  f" {s['decision_p50_us']:>7.1f} {s['decision_p99_us']:>7.1f} {s['decision_max_us']:>8.0f}"
+                  f" {s['expanded_per_tick']:>8.1f} {s['occupancy']:>6.1%}  {s['end']}")
+
+
+def _bfs_length(player, moves):
+    # Earliest arrival at the food by plain breadth-first search, under the
+    # same rules as Autoplayer._food_path
+    dist, cells = player.field.dist, player.engine.grid.cells
+    segments = player.engine.snake.segments
+    free_at = {player.cell(pos): len(segments) - j + 1 for j, pos in enumerate(segments)}
+    frontier = {c for c, _ in moves if dist[c] < INF}
+    seen = set(frontier)
+    steps = 1
+    while frontier:
+        if player.field.target in frontier:
+            return steps
+        steps += 1
+        frontier = {n for c in frontier for n, _ in player.neighbors[c]
+                    if n not in seen and dist[n] < INF and (cells[n] == EMPTY or free_at.get(n, INF) <= steps)}
+        seen |= frontier
+    return None
+
+
+def verify(seed=0):
+    # A* paths are as short as breadth-first search finds, in every mode
+    for mode in MODES:
+        engine, clock = new_game(mode, seed, 16, 12)
+        player = Autoplayer(engine)
+        player.rank = None  # search even where a cycle exists
+        searched = 0
+        while not engine.done and engine.ticks < 3000:
+            moves = player.moves()
+            if moves and not player.plan:
+                player.field.reset(player.cell(engine.food))
+                path = player._food_path(moves)
+                expected = _bfs_length(player, moves)
+                assert (len(path) if path else None) == expected, f"{mode}: A* {path} vs BFS {expected}"
+                searched += 1
+            advance(engine, clock, player.choose())
+        print(f"{mode:<12} {searched} searches match BFS; search-only play reached length {len(engine.snake)}")
+    # Boards with a Hamiltonian cycle are always filled
+    for width, height in ((4, 4), (10, 10), (12, 7), (30, 20)):
+        for game in range(5 if width * height < 500 else 2):
+            s = play("Classic", width, height, seed + game, max_ticks=10_000_000)
+            assert s["end"] == BOARD_FULL, s
+        print(f"{width}x{height} board filled in every game")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Snake autoplayer benchmark")
+    parser.add_argument("command", nargs="?", default="bench", choices=["bench", "verify"])
+    parser.add_argument("--mode", default="Classic", choices=MODES)
+    parser.add_argument("--size", action="append", help="WIDTHxHEIGHT, repeatable (default: 30x20 to 200x200)")
+    parser.add_argument("--games", type=int, default=1, help="games per size")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-ticks", type=int, default=BENCH_TICKS, help="tick limit per game")
+    args = parser.parse_args()
+    if args.command == "verify":
+        verify(args.seed)
+        return
+    sizes = [tuple(int(v) for v in s.lower().split("x")) for s in args.size] if args.size else BENCH_SIZES
+    run_benchmark(sizes, args.mode, args.games, args.seed, args.max_ticks)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+# File: snake_batch.py
+# Description: Vectorized NumPy simulator that steps many snake games in lockstep
+
+import time
+import numpy as np
+from snake_body import EMPTY, SNAKE, OBSTACLE
+from snake_engine import (GRID_WIDTH, GRID_HEIGHT, FPS, MODES, TIME_LIMIT,
+                          DOUBLE_SCORE_SECONDS, HARD_OBSTACLES, POWERUP_CHANCE, POWERUP_KINDS)
+
+CLASSIC = MODES.index("Classic")
+TIME_ATTACK = MODES.index("Time Attack")
+HARD = MODES.index("Hard")
+INFINITE = MODES.index("Infinite")
+
+SLOW = POWERUP_KINDS.index("slow")
+SHRINK = POWERUP_KINDS.index("shrink")
+DOUBLE = POWERUP_KINDS.index("double")
+
+# Action codes; 0 keeps the current direction
+NONE, UP, DOWN, LEFT, RIGHT = range(5)
+ACTIONS = [None, (0, -1), (0, 1), (-1, 0), (1, 0)]
+_DELTAS = np.array([(0, 0)] + ACTIONS[1:], dtype=np.int64)
+
+
+class BatchSnake:
+    # N independent games held as arrays. Cells are flat indices x + y * width;
+    # each body is a ring buffer of cells with the head at head_ptr, and time is
+    # simulated: every game's clock advances by 1 / tick_rate after each step,
+    # as if the front end ran clock.tick(tick_rate) between steps.
+    def __init__(self, n, modes="Classic", seed=None, width=GRID_WIDTH, height=GRID_HEIGHT, trace=False):
+        if isinstance(modes, str):
+            modes = [modes] * n
+        self.n = n
+        self.width = width
+        self.height = height
+        self.mode = np.array([MODES.index(m) for m in modes], dtype=np.int8)
+        self.rng = np.random.default_rng(seed)
+        cells = width * height
+        self.occ = np.zeros((n, cells), dtype=np.uint8)
+        self.body = np.zeros((n, cells), dtype=np.int32)
+        self.head_ptr = np.zeros(n, dtype=np.int64)
+        self.length = np.zeros(n, dtype=np.int64)
+        self.direction = np.zeros((n, 2), dtype=np.int64)
+        self.food = np.full(n, -1, dtype=np.int64)
+        self.powerup = np.full(n, -1, dtype=np.int64)
+        self.powerup_kind = np.zeros(n, dtype=np.int8)
+        self.powerup_timer = np.zeros(n)
+        self.double_score = np.zeros(n, dtype=bool)
+        self.score = np.zeros(n, dtype=np.int64)
+        self.speed = np.zeros(n)
+        self.start_time = np.zeros(n)
+        self.now = np.zeros(n)
+        self.ticks = np.zeros(n, dtype=np.int64)
+        self.done = np.zeros(n, dtype=bool)
+        # Per-game log of random outcomes, used to check against SnakeEngine
+        self.trace = [[] for _ in range(n)] if trace else None
+        self.reset()
+
+    def reset(self, mask=None):
+        # Start new games in the slots selected by mask (all slots if None)
+        idx = np.arange(self.n) if mask is None else np.flatnonzero(mask)
+        if not len(idx):
+            return
+        start = self.width // 2 + (self.height // 2) * self.width
+        self.occ[idx] = EMPTY
+        self.occ[idx, start] = SNAKE
+        self.body[idx, 0] = start
+        self.head_ptr[idx] = 0
+        self.length[idx] = 1
+        self.direction[idx] = (1, 0)
+        self.food[idx] = self._spawn(idx)
+        self.score[idx] = 0
+        self.speed[idx] = FPS
+        self.start_time[idx] = self.now[idx]
+        self.ticks[idx] = 0
+
+        hard = idx[self.mode[idx] == HARD]
+        for _ in range(HARD_OBSTACLES):
+            cells = self._spawn(hard)
+            placed = cells >= 0
+            hard = hard[placed]  # like SnakeEngine, stop at the first failure
+            self.occ[hard, cells[placed]] = OBSTACLE
+
+        self.powerup[idx] = -1
+        self.powerup_kind[idx] = 0
+        self.powerup_timer[idx] = 0
+        self.double_score[idx] = False
+        self.done[idx] = False
+
+    def tick_rate(self):
+        return np.where(self.mode == HARD, FPS + 5, self.speed)
+
+    def _spawn(self, idx):
+        # Uniform random free cell per game in idx, -1 where the board is full
+        if not len(idx):
+            return np.empty(0, dtype=np.int64)
+        free = self.occ[idx] == EMPTY
+        counts = free.sum(axis=1)
+        r = np.minimum(np.floor(self.rng.random(len(idx)) * counts).astype(np.int64), counts - 1)
+        cells = np.argmax(free.cumsum(axis=1) > r[:, None], axis=1)
+        cells[counts == 0] = -1
+        if self.trace is not None:
+            for g, c in zip(idx.tolist(), cells.tolist()):
+                self.trace[g].append(("cell", c))
+        return cells
+
+    def _pop_tail(self, idx):
+        cells = self.width * self.height
+        tail = self.body[idx, (self.head_ptr[idx] + self.length[idx] - 1) % cells]
+        self.occ[idx, tail] = EMPTY
+        self.length[idx] -= 1
+
+    def step(self, actions=None):
+        # Advance every unfinished game by one tick; actions is an array of
+        # action codes (or None to keep all directions). Returns the done mask.
+        n = self.n
+        self.ate = np.zeros(n, dtype=bool)
+        self.powered = np.zeros(n, dtype=bool)
+        self.crashed = np.zeros(n, dtype=bool)
+        self.time_up = np.zeros(n, dtype=bool)
+        self.board_full = np.zeros(n, dtype=bool)
+        active = ~self.done
+
+        ta = active & (self.mode == TIME_ATTACK)
+        if ta.any():
+            out = ta & (np.trunc(TIME_LIMIT - (self.now - self.start_time)) <= 0)
+            self.time_up = out
+            self.done |= out
+            active &= ~out
+
+        idx = np.flatnonzero(active)
+        if len(idx):
+            self._advance(idx, actions)
+        self.now += 1.0 / self.tick_rate()
+        return self.done
+
+    def _advance(self, idx, actions):
+        w, h = self.width, self.height
+        cells = w * h
+        if actions is not None:
+            a = np.asarray(actions)[idx]
+            new = _DELTAS[a]
+            turn = (a != NONE) & np.any(new != -self.direction[idx], axis=1)
+            self.direction[idx[turn]] = new[turn]
+        self.ticks[idx] += 1
+
+        head = self.body[idx, self.head_ptr[idx]]
+        x = head % w + self.direction[idx, 0]
+        y = head // w + self.direction[idx, 1]
+        wrap = self.mode[idx] == INFINITE
+        x = np.where(wrap, x % w, x)
+        y = np.where(wrap, y % h, y)
+        inside = (x >= 0) & (x < w) & (y >= 0) & (y < h)
+        cell = np.where(inside, x + y * w, 0)
+        crash = ~inside | (self.occ[idx, cell] != EMPTY)
+        self.crashed[idx[crash]] = True
+        self.done[idx[crash]] = True
+        idx, cell = idx[~crash], cell[~crash]
+        if not len(idx):
+            return
+
+        hp = (self.head_ptr[idx] - 1) % cells
+        self.head_ptr[idx] = hp
+        self.body[idx, hp] = cell
+        self.occ[idx, cell] = SNAKE
+        self.length[idx] += 1
+
+        # Check food
+        eat = cell == self.food[idx]
+        eaters = idx[eat]
+        if len(eaters):
+            self.ate[eaters] = True
+            self.score[eaters] += np.where(self.double_score[eaters], 2, 1)
+            food = self._spawn(eaters)
+            self.food[eaters] = food
+            full = eaters[food < 0]
+            self.board_full[full] = True
+            self.done[full] = True
+            fed = eaters[food >= 0]
+            faster = fed[(self.mode[fed] == CLASSIC) & (self.score[fed] % 5 == 0)]
+            self.speed[faster] += 0.5
+            rollers = fed[self.powerup[fed] < 0]
+            if len(rollers):
+                u = self.rng.random(len(rollers))
+                lucky = rollers[u < POWERUP_CHANCE]
+                if self.trace is not None:
+                    for g, v in zip(rollers.tolist(), u.tolist()):
+                        self.trace[g].append(("random", v))
+                if len(lucky):
+                    self.powerup[lucky] = self._spawn(lucky)
+                    kinds = self.rng.integers(0, len(POWERUP_KINDS), len(lucky))
+                    self.powerup_kind[lucky] = kinds
+                    if self.trace is not None:
+                        for g, k in zip(lucky.tolist(), kinds.tolist()):
+                            self.trace[g].append(("choice", k))
+        self._pop_tail(idx[~eat])
+
+        alive = ~self.done[idx]
+        idx, cell = idx[alive], cell[alive]
+
+        # Check powerup
+        pickers = idx[(self.powerup[idx] >= 0) & (cell == self.powerup[idx])]
+        if len(pickers):
+            kind = self.powerup_kind[pickers]
+            slow = pickers[kind == SLOW]
+            self.speed[slow] = max(FPS - 2, 3)
+            shrink = pickers[(kind == SHRINK) & (self.length[pickers] > 4)]
+            for _ in range(3):
+                self._pop_tail(shrink)
+            double = pickers[kind == DOUBLE]
+            self.double_score[double] = True
+            self.powered[slow] = True
+            self.powered[shrink] = True
+            self.powered[double] = True
+            self.powerup[pickers] = -1
+            self.powerup_timer[pickers] = self.now[pickers]
+
+        expired = idx[self.double_score[idx] & (self.now[idx] - self.powerup_timer[idx] > DOUBLE_SCORE_SECONDS)]
+        self.double_score[expired] = False
+
+    def body_cells(self, g):
+        # Body of game g as (x, y) tuples, head first
+        cells = self.width * self.height
+        ring = self.body[g, (self.head_ptr[g] + np.arange(self.length[g])) % cells]
+        return [(c % self.width, c // self.width) for c in ring.tolist()]
+
+
+def safe_random_actions(sim, rng, straight=0.8):
+    # Random policy that avoids walls and occupied cells when it can: keeps
+    # going straight with probability straight, otherwise turns to a random
+    # safe direction. Used to drive long games in checks and benchmarks.
+    w, h = sim.width, sim.height
+    rows = np.arange(sim.n)
+    head = sim.body[rows, sim.head_ptr]
+    wrap = sim.mode == INFINITE
+    safe = np.zeros((sim.n, 5), dtype=bool)
+    for a in range(1, 5):
+        dx, dy = _DELTAS[a]
+        x = head % w + dx
+        y = head // w + dy
+        x = np.where(wrap, x % w, x)
+        y = np.where(wrap, y % h, y)
+        inside = (x >= 0) & (x < w) & (y >= 0) & (y < h)
+        cell = np.where(inside, x + y * w, 0)
+        reverse = (sim.direction[:, 0] == -dx) & (sim.direction[:, 1] == -dy)
+        safe[:, a] = inside & (sim.occ[rows, cell] == EMPTY) & ~reverse
+    ahead = np.argmax((_DELTAS[None, 1:] == sim.direction[:, None]).all(axis=2), axis=1) + 1
+    keep = safe[rows, ahead] & (rng.random(sim.n) < straight)
+    # Random safe turn: random scores, unsafe directions pushed to the bottom
+    scores = rng.random((sim.n, 5)) + safe
+    scores[:, NONE] = -1
+    turn = np.argmax(scores, axis=1)
+    turn = np.where(safe[rows, turn], turn, NONE)
+    return np.where(keep, NONE, turn)
+
+
+# === BENCHMARK ===
+
+def run_benchmark(n=4096, steps=1000, seed=0):
+    modes = [MODES[i % len(MODES)] for i in range(n)]
+    sim = BatchSnake(n, modes, seed=seed)
+    policy = np.random.default_rng(seed + 1)
+    t0 = time.perf_counter()
+    for _ in range(steps):
+        sim.step(safe_random_actions(sim, policy))
+        sim.reset(sim.done)
+    elapsed = time.perf_counter() - t0
+    print(f"{n} games x {steps} steps in {elapsed:.2f}s: {n * steps / elapsed * 60 / 1e6:.1f}M game-steps/min")
+
+
+if __name__ == "__main__":
+    run_benchmark()
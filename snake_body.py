@@ -0,0 +1,187 @@
+# File: snake_body.py
+# Description: Constant-time snake body and occupancy grid used by the snake game loop
+
+import random
+from collections import deque
+
+# Cell contents stored in the occupancy grid (one byte per cell)
+EMPTY = 0
+SNAKE = 1
+OBSTACLE = 2
+
+
+class OccupancyGrid:
+    # Flat bytearray over width x height cells; cell (x, y) lives at x + y * width.
+    # Free cells are also kept in a swap-remove array (free) with a position map
+    # (slot: cell index -> offset in free, -1 when occupied) so a random free cell
+    # can be drawn in O(1) however full the board is.
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.cells = bytearray(width * height)
+        self.free = list(range(width * height))
+        self.slot = list(range(width * height))
+
+    def index(self, pos):
+        return pos[0] + pos[1] * self.width
+
+    def in_bounds(self, pos):
+        return 0 <= pos[0] < self.width and 0 <= pos[1] < self.height
+
+    def get(self, pos):
+        return self.cells[pos[0] + pos[1] * self.width]
+
+    def set(self, pos, kind):
+        i = pos[0] + pos[1] * self.width
+        if self.cells[i] == EMPTY:
+            # Swap the last free cell into this cell's slot
+            at = self.slot[i]
+            last = self.free.pop()
+            if last != i:
+                self.free[at] = last
+                self.slot[last] = at
+            self.slot[i] = -1
+        self.cells[i] = kind
+
+    def clear(self, pos):
+        i = pos[0] + pos[1] * self.width
+        if self.cells[i] != EMPTY:
+            self.slot[i] = len(self.free)
+            self.free.append(i)
+        self.cells[i] = EMPTY
+
+    def is_blocked(self, pos):
+        # True if the cell holds a snake segment or an obstacle
+        return self.cells[pos[0] + pos[1] * self.width] != EMPTY
+
+    def free_count(self):
+        return len(self.free)
+
+    def random_free_cell(self, rng=random):
+        # Uniform over free cells; None when the board is full
+        if not self.free:
+            return None
+        i = self.free[rng.randrange(len(self.free))]
+        return (i % self.width, i // self.width)
+
+
+class Obstacles:
+    # Obstacle cells, registered in a shared OccupancyGrid
+    def __init__(self, grid):
+        self.grid = grid
+        self.cells = []
+
+    def add(self, pos):
+        self.cells.append(pos)
+        self.grid.set(pos, OBSTACLE)
+
+    def __contains__(self, pos):
+        return self.grid.get(pos) == OBSTACLE
+
+    def __iter__(self):
+        return iter(self.cells)
+
+    def __len__(self):
+        return len(self.cells)
+
+
+class SnakeBody:
+    # Head is at the left end of the deque, tail at the right end
+    def __init__(self, grid, cells=()):
+        self.grid = grid
+        self.segments = deque()
+        for pos in cells:
+            self.segments.append(pos)
+            grid.set(pos, SNAKE)
+
+    @property
+    def head(self):
+        return self.segments[0]
+
+    @property
+    def tail(self):
+        return self.segments[-1]
+
+    def push_head(self, pos):
+        self.segments.appendleft(pos)
+        self.grid.set(pos, SNAKE)
+
+    def pop_tail(self):
+        pos = self.segments.pop()
+        self.grid.clear(pos)
+        return pos
+
+    def shrink(self, k):
+        # Drop k tail segments and return them; cost depends on k, not on body length
+        removed = []
+        for _ in range(min(k, len(self.segments))):
+            pos = self.segments.pop()
+            self.grid.clear(pos)
+            removed.append(pos)
+        return removed
+
+    def __contains__(self, pos):
+        return self.grid.get(pos) == SNAKE
+
+    def __iter__(self):
+        return iter(self.segments)
+
+    def __len__(self):
+        return len(self.segments)
+
+
+# === MICROBENCHMARK ===
+# Compares the deque + occupancy grid against the plain list body used before,
+# one tick = membership test, push head, pop tail.
+
+def _serpentine(width, height):
+    # Boustrophedon walk over the grid, used to lay out long bodies
+    for y in range(height):
+        xs = range(width) if y % 2 == 0 else range(width - 1, -1, -1)
+        for x in xs:
+            yield (x, y)
+
+
+def _bench_list(cells, path, ticks):
+    snake = list(cells)
+    for i in range(ticks):
+        new_head = path[i]
+        if new_head in snake:
+            pass
+        snake.insert(0, new_head)
+        snake.pop()
+    snake = snake[:-3]
+
+
+def _bench_body(cells, path, ticks, width, height):
+    grid = OccupancyGrid(width, height)
+    snake = SnakeBody(grid, cells)
+    for i in range(ticks):
+        new_head = path[i]
+        if grid.is_blocked(new_head):
+            pass
+        snake.push_head(new_head)
+        snake.pop_tail()
+    snake.shrink(3)
+
+
+def run_benchmark(lengths=(10, 100, 1000, 10000), ticks=2000):
+    import timeit
+    width = 200
+    height = 200
+    walk = list(_serpentine(width, height))
+    print(f"{'length':>8} {'list us/tick':>14} {'grid us/tick':>14} {'speedup':>9}")
+    for length in lengths:
+        # Head sits at walk[ticks] with the body trailing along the walk;
+        # each tick the head steps back towards walk[0]
+        cells = walk[ticks:ticks + length]
+        path = walk[ticks - 1::-1][:ticks]
+        t_list = min(timeit.repeat(lambda: _bench_list(cells, path, ticks), number=1, repeat=3))
+        t_body = min(timeit.repeat(lambda: _bench_body(cells, path, ticks, width, height), number=1, repeat=3))
+        us_list = t_list / ticks * 1e6
+        us_body = t_body / ticks * 1e6
+        print(f"{length:>8} {us_list:>14.2f} {us_body:>14.2f} {us_list / us_body:>8.1f}x")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,194 @@
+# File: snake_engine.py
+# Description: Headless snake rules engine (no pygame) with an injectable clock and RNG
+
+import random
+import time
+from snake_body import OccupancyGrid, SnakeBody, Obstacles
+
+# Game Constants
+GRID_WIDTH = 30
+GRID_HEIGHT = 20
+FPS = 7  # Slower snake
+
+# Game Modes
+MODES = ["Classic", "Time Attack", "Hard", "Infinite"]
+
+TIME_LIMIT = 60           # Time Attack length in seconds
+DOUBLE_SCORE_SECONDS = 10  # How long the "double" power-up lasts
+HARD_OBSTACLES = 10
+POWERUP_CHANCE = 0.3
+POWERUP_KINDS = ["slow", "shrink", "double"]
+
+# Actions
+UP, DOWN, LEFT, RIGHT = (0, -1), (0, 1), (-1, 0), (1, 0)
+
+# Step events
+EAT = "eat"
+POWERUP = "powerup"          # power-up picked up and applied
+CRASH = "crash"              # hit a wall, obstacle or itself
+TIME_UP = "time_up"          # Time Attack clock ran out
+BOARD_FULL = "board_full"    # no free cell left for food
+
+
+class TickClock:
+    # Game time that advances by one tick period per step instead of following
+    # the wall clock, so a game depends only on its seed, mode and inputs.
+    # Pass it as SnakeEngine's clock and call advance(engine) after each step.
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, engine):
+        self.now += 1.0 / engine.tick_rate()
+
+
+class SnakeEngine:
+    # One game of snake. step(action) advances a single tick; action is a
+    # direction tuple or None to keep going straight. Reversals are ignored.
+    # clock is any zero-argument callable returning seconds, rng any object
+    # with random(), randrange() and choice() (random.Random by default).
+    def __init__(self, mode, seed=None, clock=time.monotonic, rng=None, width=GRID_WIDTH, height=GRID_HEIGHT):
+        if mode not in MODES:
+            raise ValueError(f"Unknown mode: {mode}")
+        self.mode = mode
+        self.clock = clock
+        self.rng = rng if rng is not None else random.Random(seed)
+        self.width = width
+        self.height = height
+        self.reset()
+
+    def reset(self):
+        self.grid = OccupancyGrid(self.width, self.height)
+        self.snake = SnakeBody(self.grid, [(self.width // 2, self.height // 2)])
+        self.obstacles = Obstacles(self.grid)
+        self.direction = RIGHT
+        self.food = self.spawn_cell()
+        self.score = 0
+        self.speed = float(FPS)
+        self.start_time = self.clock()
+        self.ticks = 0
+
+        if self.mode == "Hard":
+            for _ in range(HARD_OBSTACLES):
+                pos = self.spawn_cell()
+                if pos is None:
+                    break
+                self.obstacles.add(pos)
+
+        self.powerup = None
+        self.powerup_kind = None
+        self.powerup_timer = 0
+        self.double_score = False
+        self.done = False
+        self.changed = []  # cells whose contents changed in the last step
+
+    def spawn_cell(self):
+        # Uniform random free cell for food, power-ups and obstacles; None if full
+        return self.grid.random_free_cell(self.rng)
+
+    def tick_rate(self):
+        # Steps per second the front end should run at
+        return self.speed if self.mode != "Hard" else FPS + 5
+
+    def time_left(self):
+        if self.mode != "Time Attack":
+            return None
+        return max(0, int(TIME_LIMIT - (self.clock() - self.start_time)))
+
+    def step(self, action=None):
+        # Returns a tuple of the events that happened this tick
+        if self.done:
+            return ()
+        self.changed = []
+
+        if self.mode == "Time Attack" and self.time_left() <= 0:
+            self.done = True
+            return (TIME_UP,)
+
+        if action is not None and (-action[0], -action[1]) != self.direction:
+            self.direction = action
+        self.ticks += 1
+
+        head_x, head_y = self.snake.head
+        dx, dy = self.direction
+        new_head = (head_x + dx, head_y + dy)
+
+        if self.mode == "Infinite":
+            new_head = (new_head[0] % self.width, new_head[1] % self.height)
+        elif not (0 <= new_head[0] < self.width and 0 <= new_head[1] < self.height):
+            self.done = True
+            return (CRASH,)
+
+        if self.grid.is_blocked(new_head):
+            self.done = True
+            return (CRASH,)
+
+        events = []
+        changed = self.changed
+        changed.append(new_head)
+        self.snake.push_head(new_head)
+
+        # Check food
+        if new_head == self.food:
+            events.append(EAT)
+            self.score += 2 if self.double_score else 1
+            self.food = self.spawn_cell()
+            if self.food is None:
+                self.done = True
+                events.append(BOARD_FULL)
+                return tuple(events)
+            changed.append(self.food)
+            if self.mode == "Classic" and self.score % 5 == 0:
+                self.speed += 0.5
+            if not self.powerup and self.rng.random() < POWERUP_CHANCE:
+                self.powerup = self.spawn_cell()
+                self.powerup_kind = self.rng.choice(POWERUP_KINDS)
+                changed.append(self.powerup)
+        else:
+            changed.append(self.snake.pop_tail())
+
+        # Check powerup
+        if self.powerup and new_head == self.powerup:
+            if self.powerup_kind == "slow":
+                self.speed = max(FPS - 2, 3)
+                events.append(POWERUP)
+            elif self.powerup_kind == "shrink" and len(self.snake) > 4:
+                changed.extend(self.snake.shrink(3))
+                events.append(POWERUP)
+            elif self.powerup_kind == "double":
+                self.double_score = True
+                events.append(POWERUP)
+            self.powerup = None
+            self.powerup_timer = self.clock()
+
+        if self.double_score and self.clock() - self.powerup_timer > DOUBLE_SCORE_SECONDS:
+            self.double_score = False
+
+        return tuple(events)
+
+
+# === HEADLESS BENCHMARK ===
+# Random-policy games on a fake clock advancing one tick per step.
+
+def run_benchmark(steps=1_000_000, seed=0):
+    rng = random.Random(seed)
+    actions = [None, None, None, UP, DOWN, LEFT, RIGHT]
+    now = [0.0]
+    fake_clock = lambda: now[0]
+    engine = SnakeEngine(MODES[0], seed=seed, clock=fake_clock)
+    games = 1
+    t0 = time.perf_counter()
+    for _ in range(steps):
+        if engine.done:
+            engine = SnakeEngine(MODES[games % len(MODES)], seed=seed + games, clock=fake_clock)
+            games += 1
+        engine.step(rng.choice(actions))
+        now[0] += 1.0 / engine.tick_rate()
+    elapsed = time.perf_counter() - t0
+    print(f"{steps} steps, {games} games in {elapsed:.2f}s: {steps / elapsed * 60 / 1e6:.1f}M steps/min")
+
+
+if __name__ == "__main__":
+    run_benchmark()
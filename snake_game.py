@@ -1,23 +1,23 @@
 # File: snake_game_with_super_food_sound.py
 # Description: Snake game with background music, high score saving, power-ups, and special food sound
 
+import argparse
+import time
 import pygame
 import sys
-import random
-import time
-import os
-
-# Initialize pygame
-pygame.init()
-pygame.mixer.init()
+from snake_body import SNAKE, OBSTACLE
+from snake_engine import GRID_WIDTH, GRID_HEIGHT, MODES, EAT, POWERUP, CRASH
+from snake_scores import Leaderboard
+from snake_profiler import FrameProfiler, NullProfiler, game_log_path
+from snake_sound import create_sound_manager
+from snake_replay import Replay, Recorder, new_game, new_seed, advance, recording_path
+from snake_loop import FixedStep, TurnQueue, LatencyStats, RENDER_FPS
+from snake_autoplay import Autoplayer
 
 # Game Constants
 CELL_SIZE = 20
-GRID_WIDTH = 30
-GRID_HEIGHT = 20
 WIDTH = CELL_SIZE * GRID_WIDTH
 HEIGHT = CELL_SIZE * GRID_HEIGHT
-FPS = 7  # Slower snake
 
 # Colors
 WHITE = (255, 255, 255)
@@ -31,27 +31,36 @@ CYAN = (0, 255, 255)
 ORANGE = (255, 165, 0)
 PURPLE = (160, 32, 240)
 
-# Fonts
-font = pygame.font.SysFont("consolas", 24)
-big_font = pygame.font.SysFont("consolas", 48)
+HUD_KEY = pygame.K_F3     # toggles the profiler overlay when profiling is on
+HUD_REFRESH = 0.5         # seconds between overlay updates
+REPLAY_FPS = 60           # frame rate of replay playback
+REPLAY_SEEK_SECONDS = 10  # PageUp/PageDown jump
+AUTOPLAY_KEY = pygame.K_F2  # toggles autoplay on the mode menu (no movement key)
+AUTOPLAY_MAX_SPEED = 64    # Up doubles the autoplayer's step rate up to this multiple
+
+def init():
+    # Open the window and load fonts and sounds; kept out of import so the
+    # module (and the rules in snake_engine) can be used without a display
+    global font, big_font, small_font, screen, clock, sounds, leaderboard
+    pygame.init()
 
-# Initialize screen
-screen = pygame.display.set_mode((WIDTH, HEIGHT), pygame.RESIZABLE)
-pygame.display.set_caption("🐍 Nokia Snake Game")
+    # Fonts
+    font = pygame.font.SysFont("consolas", 24)
+    big_font = pygame.font.SysFont("consolas", 48)
+    small_font = pygame.font.SysFont("consolas", 14)
 
-clock = pygame.time.Clock()
+    # Initialize screen
+    screen = pygame.display.set_mode((WIDTH, HEIGHT), pygame.RESIZABLE)
+    pygame.display.set_caption("🐍 Nokia Snake Game")
 
-# Load music
-try:
-    pygame.mixer.music.load("background_music.mp3")
-    pygame.mixer.music.play(-1)
-except:
-    print("Background music not found.")
+    clock = pygame.time.Clock()
 
-# Sound effects
-eat_sound = pygame.mixer.Sound("food_G1U6tlb.mp3")
-game_over_sound = pygame.mixer.Sound("sound_ErK79lZ.mp3")
-super_eat_sound = pygame.mixer.Sound("super_food.mp3")  # special food sound
+    # High scores are read once here; the game only touches the in-memory copy
+    leaderboard = Leaderboard().load()
+
+    # Sound effects decode in the background; silent if files or the audio device are missing
+    sounds = create_sound_manager()
+    sounds.play_music()
 
 # Directions
 DIRECTIONS = {
@@ -61,50 +70,196 @@ DIRECTIONS = {
     pygame.K_RIGHT: (1, 0), pygame.K_d: (1, 0),
 }
 
-# Game Modes
-MODES = ["Classic", "Time Attack", "Hard", "Infinite"]
-
-# High score file
-HIGH_SCORE_FILE = "highscore.txt"
-
-def load_high_score():
-    if not os.path.exists(HIGH_SCORE_FILE):
-        return 0
-    with open(HIGH_SCORE_FILE, "r") as f:
-        return int(f.read().strip())
-
-def save_high_score(score):
-    high = load_high_score()
-    if score > high:
-        with open(HIGH_SCORE_FILE, "w") as f:
-            f.write(str(score))
-
-def draw_grid():
-    for x in range(0, WIDTH, CELL_SIZE):
-        pygame.draw.line(screen, GRAY, (x, 0), (x, HEIGHT))
-    for y in range(0, HEIGHT, CELL_SIZE):
-        pygame.draw.line(screen, GRAY, (0, y), (WIDTH, y))
-
-def draw_snake(snake):
-    for segment in snake:
-        pygame.draw.rect(screen, GREEN, pygame.Rect(segment[0]*CELL_SIZE, segment[1]*CELL_SIZE, CELL_SIZE, CELL_SIZE))
-
-def draw_food(food):
-    pygame.draw.rect(screen, RED, pygame.Rect(food[0]*CELL_SIZE, food[1]*CELL_SIZE, CELL_SIZE, CELL_SIZE))
-
-def draw_obstacles(obstacles):
-    for obs in obstacles:
-        pygame.draw.rect(screen, BLUE, pygame.Rect(obs[0]*CELL_SIZE, obs[1]*CELL_SIZE, CELL_SIZE, CELL_SIZE))
-
-def draw_powerup(powerup, kind):
-    color = CYAN if kind == "slow" else ORANGE if kind == "shrink" else PURPLE
-    pygame.draw.rect(screen, color, pygame.Rect(powerup[0]*CELL_SIZE, powerup[1]*CELL_SIZE, CELL_SIZE, CELL_SIZE))
-
-def get_random_position(snake, obstacles):
-    while True:
-        pos = (random.randint(0, GRID_WIDTH-1), random.randint(0, GRID_HEIGHT-1))
-        if pos not in snake and pos not in obstacles:
-            return pos
+profiler_log = None  # FrameProfiler of the game in progress, finished by quit_game()
+replay_log = None    # Recorder of the game in progress, finished by quit_game()
+
+def quit_game():
+    if replay_log:
+        replay_log.close()  # write the ticks still buffered
+    if profiler_log:
+        print(f"Frame profile written to {profiler_log.close()}")  # finish a log cut short by quitting
+    leaderboard.close()  # let a pending high-score save finish
+    pygame.quit()
+    sys.exit()
+
+POWERUP_COLORS = {"slow": CYAN, "shrink": ORANGE, "double": PURPLE}
+
+class Renderer:
+    # Dirty-rectangle renderer: grid lines and obstacles are pre-rendered once to a
+    # background surface, then each tick only the cells marked dirty and any text
+    # whose value changed are redrawn and pushed with pygame.display.update(rects).
+    def __init__(self, obstacles):
+        self.obstacles = obstacles
+        self.dirty = set()
+        self.erased = []
+        self.text_cache = {}  # key -> (value, surface, rect)
+        self.motion = None    # the last step's motion as drawn in the previous frame
+        self.layout(pygame.display.get_surface().get_size())
+
+    def layout(self, size):
+        # Scale cells to the window and rebuild the background; forces a full redraw
+        self.screen = pygame.display.get_surface()
+        self.cell = max(1, min(size[0] // GRID_WIDTH, size[1] // GRID_HEIGHT))
+        self.origin = ((size[0] - self.cell * GRID_WIDTH) // 2, (size[1] - self.cell * GRID_HEIGHT) // 2)
+        ox, oy = self.origin
+        board_w, board_h = self.cell * GRID_WIDTH, self.cell * GRID_HEIGHT
+        self.background = pygame.Surface(size).convert()
+        self.background.fill(BLACK)
+        for x in range(GRID_WIDTH):
+            px = ox + x * self.cell
+            pygame.draw.line(self.background, GRAY, (px, oy), (px, oy + board_h))
+        for y in range(GRID_HEIGHT):
+            py = oy + y * self.cell
+            pygame.draw.line(self.background, GRAY, (ox, py), (ox + board_w, py))
+        for obs in self.obstacles:
+            pygame.draw.rect(self.background, BLUE, self.cell_rect(obs))
+        self.text_cache.clear()
+        self.dirty.clear()
+        self.erased = []
+        self.pending = []
+        self.full_redraw = True
+
+    def resize(self, size):
+        pygame.display.set_mode(size, pygame.RESIZABLE)
+        self.layout(size)
+
+    def cell_rect(self, pos):
+        return pygame.Rect(self.origin[0] + pos[0] * self.cell, self.origin[1] + pos[1] * self.cell, self.cell, self.cell)
+
+    def edge_rect(self, pos, side, fraction):
+        # The part of a cell along its `side` edge (a direction), `fraction` of the cell deep
+        r = self.cell_rect(pos)
+        n = max(1, round(self.cell * fraction))
+        if side[0] > 0:
+            return pygame.Rect(r.right - n, r.top, n, r.height)
+        if side[0] < 0:
+            return pygame.Rect(r.left, r.top, n, r.height)
+        if side[1] > 0:
+            return pygame.Rect(r.left, r.bottom - n, r.width, n)
+        return pygame.Rect(r.left, r.top, r.width, n)
+
+    def mark(self, *cells):
+        for pos in cells:
+            if pos is not None:
+                self.dirty.add(pos)
+
+    def erase(self, rect):
+        # Restore the background under rect and repaint the cells it covered
+        self.screen.blit(self.background, rect, rect)
+        self.erased.append(rect)
+        ox, oy = self.origin
+        x0 = max(0, (rect.left - ox) // self.cell)
+        x1 = min(GRID_WIDTH - 1, (rect.right - 1 - ox) // self.cell)
+        y0 = max(0, (rect.top - oy) // self.cell)
+        y1 = min(GRID_HEIGHT - 1, (rect.bottom - 1 - oy) // self.cell)
+        for x in range(x0, x1 + 1):
+            for y in range(y0, y1 + 1):
+                self.dirty.add((x, y))
+
+    def text(self, key, value, color, pos, face=None):
+        # Re-render a text surface only when its value changes
+        cached = self.text_cache.get(key)
+        if cached and cached[0] == value:
+            return
+        surface = (face or font).render(value, True, color)
+        if cached and not self.full_redraw:
+            self.erase(cached[2])
+        self.text_cache[key] = (value, surface, surface.get_rect(topleft=pos))
+
+    def drop(self, key):
+        # Remove a text label from the screen
+        cached = self.text_cache.pop(key, None)
+        if cached and not self.full_redraw:
+            self.erase(cached[2])
+
+    def cell_color(self, pos, grid, food, powerup, powerup_kind):
+        kind = grid.get(pos)
+        if kind == OBSTACLE:
+            return None  # part of the background
+        if pos == powerup:
+            return POWERUP_COLORS[powerup_kind]
+        if pos == food:
+            return RED
+        if kind == SNAKE:
+            return GREEN
+        return None
+
+    def draw_motion(self, engine, alpha):
+        # Between steps the new head cell fills in from the side the snake came
+        # from and the vacated tail cell empties towards the new tail
+        head, direction, tail, tail_direction = self.motion
+        screen = self.screen
+        rects = []
+        if alpha < 1:
+            rect = self.cell_rect(head)
+            screen.blit(self.background, rect, rect)
+            pygame.draw.rect(screen, GREEN, self.edge_rect(head, (-direction[0], -direction[1]), alpha))
+            rects.append(rect)
+            if tail is not None and self.cell_color(tail, engine.grid, engine.food, engine.powerup,
+                                                    engine.powerup_kind) is None:
+                rect = self.edge_rect(tail, tail_direction, 1 - alpha)
+                pygame.draw.rect(screen, GREEN, rect)
+                rects.append(rect)
+        return rects
+
+    def draw(self, engine, motion=None, alpha=1.0):
+        # motion: step_motion() of the last simulation step, drawn alpha of
+        # the way from the previous step to it
+        screen = self.screen
+        grid, snake, food = engine.grid, engine.snake, engine.food
+        powerup, powerup_kind = engine.powerup, engine.powerup_kind
+        for moved in (self.motion, motion):
+            if moved:
+                self.mark(moved[0], moved[2])
+        self.motion = motion
+        if self.full_redraw:
+            screen.blit(self.background, (0, 0))
+            for segment in snake:
+                pygame.draw.rect(screen, GREEN, self.cell_rect(segment))
+            for pos in (food, powerup):
+                if pos is not None:
+                    color = self.cell_color(pos, grid, food, powerup, powerup_kind)
+                    if color:
+                        pygame.draw.rect(screen, color, self.cell_rect(pos))
+            if motion:
+                self.draw_motion(engine, alpha)
+            for _, surface, rect in self.text_cache.values():
+                screen.blit(surface, rect)
+            self.pending = None
+            self.full_redraw = False
+            self.dirty.clear()
+            self.erased = []
+            return
+
+        rects = self.erased
+        for pos in self.dirty:
+            if not grid.in_bounds(pos):
+                continue
+            rect = self.cell_rect(pos)
+            screen.blit(self.background, rect, rect)
+            color = self.cell_color(pos, grid, food, powerup, powerup_kind)
+            if color:
+                pygame.draw.rect(screen, color, rect)
+            rects.append(rect)
+        if motion:
+            rects.extend(self.draw_motion(engine, alpha))
+        self.dirty.clear()
+        self.erased = []
+        if rects:
+            # Text sits on top of the board, so re-blit any label that was painted over
+            for _, surface, rect in self.text_cache.values():
+                if rect.collidelist(rects) != -1:
+                    screen.blit(surface, rect)
+                    rects.append(rect)
+        self.pending = rects
+
+    def present(self):
+        # Push what draw() painted: the whole window after a full redraw, else the dirty rects
+        if self.pending is None:
+            pygame.display.flip()
+        elif self.pending:
+            pygame.display.update(self.pending)
+        self.pending = []
 
 def show_message(text, subtext=""):
     screen.fill(BLACK)
@@ -115,21 +270,24 @@ def show_message(text, subtext=""):
         screen.blit(subtitle, (WIDTH // 2 - subtitle.get_width() // 2, HEIGHT // 2))
     pygame.display.flip()
 
-def game_over_screen(score):
-    save_high_score(score)
-    high = load_high_score()
-    show_message("Game Over", f"Score: {score} | High Score: {high} | Enter=Again | Esc=Quit")
+def game_over_screen(score, mode, autoplay=False):
+    # Autoplayed games stay off the leaderboard
+    rank = None if autoplay else leaderboard.submit(mode, score)
+    high = leaderboard.best(mode)
+    title = "Autoplay Over" if autoplay else "New High Score!" if rank == 1 else "Game Over"
+    show_message(title, f"Score: {score} | {mode} High Score: {high} | Enter=Again | Esc=Quit")
     while True:
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
-                pygame.quit(); sys.exit()
+                quit_game()
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_RETURN:
                     return
                 if event.key == pygame.K_ESCAPE:
-                    pygame.quit(); sys.exit()
+                    quit_game()
 
-def mode_select_screen():
+def mode_select_screen(autoplay=False):
+    # Returns (mode, autoplay)
     selected = 0
     while True:
         screen.fill(BLACK)
@@ -139,121 +297,234 @@ def mode_select_screen():
             color = WHITE if i != selected else GREEN
             text = font.render(mode, True, color)
             screen.blit(text, (WIDTH//2 - text.get_width()//2, 150 + i*40))
+        label = f"Autoplay: {'On' if autoplay else 'Off'} ({pygame.key.name(AUTOPLAY_KEY).upper()} to toggle)"
+        text = small_font.render(label, True, CYAN if autoplay else GRAY)
+        screen.blit(text, (WIDTH//2 - text.get_width()//2, 170 + len(MODES)*40))
         pygame.display.flip()
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
-                pygame.quit(); sys.exit()
+                quit_game()
             elif event.type == pygame.KEYDOWN:
                 if event.key in [pygame.K_UP, pygame.K_w]:
                     selected = (selected - 1) % len(MODES)
                 elif event.key in [pygame.K_DOWN, pygame.K_s]:
                     selected = (selected + 1) % len(MODES)
+                elif event.key == AUTOPLAY_KEY:
+                    autoplay = not autoplay
                 elif event.key == pygame.K_RETURN:
-                    return MODES[selected]
-
-def snake_game(mode):
-    snake = [(GRID_WIDTH//2, GRID_HEIGHT//2)]
-    direction = (1, 0)
-    food = get_random_position(snake, [])
-    score = 0
-    speed = float(FPS)
-    timer_limit = 60
-    start_time = time.time()
-
-    obstacles = []
-    if mode == "Hard":
-        for _ in range(10):
-            obstacles.append(get_random_position(snake, []))
-
-    powerup = None
-    powerup_kind = None
-    powerup_timer = 0
-    double_score = False
+                    return MODES[selected], autoplay
+
+def draw_hud(renderer, profiler, latency, show):
+    # Profiler overlay under the score; one text label per line
+    lines = profiler.hud_lines() + [latency.hud_line()] if show else []
+    for i, line in enumerate(lines):
+        renderer.text(f"hud{i}", line, CYAN, (10, 40 + i * 18), small_font)
+    if not show:
+        for i in range(4):
+            renderer.drop(f"hud{i}")
+
+def step_motion(engine, old_tail):
+    # (head, direction, vacated tail, direction to the new tail) of the step
+    # just taken; the tail entries are None if the tail did not slide one cell
+    tail = tail_direction = None
+    new_tail = engine.snake.tail
+    if old_tail != new_tail and old_tail not in engine.snake:
+        dx, dy = new_tail[0] - old_tail[0], new_tail[1] - old_tail[1]
+        if abs(dx) > 1:
+            dx = -dx // abs(dx)  # wrapped around the board
+        if abs(dy) > 1:
+            dy = -dy // abs(dy)
+        if abs(dx) + abs(dy) == 1:
+            tail, tail_direction = old_tail, (dx, dy)
+    return (engine.snake.head, engine.direction, tail, tail_direction)
+
+def snake_game(mode, profiler=None, record=True, latency=None, autoplay=False):
+    # profiler: a FrameProfiler to time each phase of every frame; the
+    # default NullProfiler makes every hook a no-op. Every game is recorded
+    # to REPLAY_DIR unless record is False. latency collects input-to-photon
+    # times of turns. With autoplay an Autoplayer steers, and Up/Down
+    # double/halve its step rate.
+    #
+    # Each frame reads input, runs the simulation steps that are due at the
+    # engine's tick rate, then draws at RENDER_FPS with the snake's motion
+    # interpolated between steps.
+    global replay_log
+    profiler = profiler or NullProfiler()
+    latency = latency or LatencyStats()
+    seed = new_seed()
+    engine, game_clock = new_game(mode, seed)
+    recorder = replay_log = Recorder(recording_path(mode), mode, seed) if record else None
+    renderer = Renderer(engine.obstacles)
+    player = Autoplayer(engine) if autoplay else None
+    speed = 1
+    stepper = FixedStep()
+    turns = TurnQueue()
+    motion = None
+    show_hud = False
+    hud_at = 0.0
+    period = 0.0
+    clock.tick()  # time the first frame from here, not from the menu
 
     while True:
-        screen.fill(BLACK)
-        draw_grid()
-        draw_snake(snake)
-        draw_food(food)
-        draw_obstacles(obstacles)
-        if powerup:
-            draw_powerup(powerup, powerup_kind)
+        profiler.begin()
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                quit_game()
+            elif event.type == pygame.VIDEORESIZE:
+                renderer.resize((event.w, event.h))
+            elif event.type == pygame.KEYDOWN and event.key == HUD_KEY and profiler.enabled:
+                show_hud = not show_hud
+                hud_at = 0.0
+                draw_hud(renderer, profiler, latency, show_hud)
+            elif event.type == pygame.KEYDOWN and event.key in DIRECTIONS:
+                if not player:
+                    turns.push(DIRECTIONS[event.key], engine.direction, time.perf_counter())
+                elif DIRECTIONS[event.key] == (0, -1):
+                    speed = min(speed * 2, AUTOPLAY_MAX_SPEED)
+                elif DIRECTIONS[event.key] == (0, 1):
+                    speed = max(speed // 2, 1)
+        profiler.mark("input")
+
+        stepper.add(period)
+        step = 1 / (engine.tick_rate() * speed)
+        now = time.perf_counter()
+        while not engine.done and stepper.due(step):
+            action, stamp = (player.choose(), None) if player else turns.pop(now, step)
+            if recorder:
+                recorder.record(engine.direction, action)
+            tail = engine.snake.tail
+            events = advance(engine, game_clock, action)
+            latency.applied(stamp)
+            renderer.mark(*engine.changed)
+            motion = step_motion(engine, tail)
+            step = 1 / (engine.tick_rate() * speed)
+
+            if EAT in events:
+                sounds.play("eat")
+            if POWERUP in events:
+                sounds.play("powerup")
+            if CRASH in events:
+                sounds.play("crash")
+        sounds.flush()
+        profiler.mark("update")
+        if engine.done:
+            if recorder:
+                recorder.close()
+                replay_log = None
+            return engine.score
 
         # UI
-        score_text = font.render(f"Score: {score}", True, WHITE)
-        screen.blit(score_text, (10, 10))
-
+        renderer.text("score", f"Score: {engine.score}", WHITE, (10, 10))
+        if player:
+            renderer.text("autoplay", f"Autoplay x{speed}", CYAN, (10, renderer.screen.get_height() - 20), small_font)
         if mode == "Time Attack":
-            time_left = max(0, int(timer_limit - (time.time() - start_time)))
-            time_text = font.render(f"Time: {time_left}", True, YELLOW)
-            screen.blit(time_text, (WIDTH - 150, 10))
-            if time_left <= 0:
-                return score
+            renderer.text("time", f"Time: {engine.time_left()}", YELLOW, (renderer.screen.get_width() - 150, 10))
+        if show_hud and time.monotonic() - hud_at >= HUD_REFRESH:
+            hud_at = time.monotonic()
+            draw_hud(renderer, profiler, latency, True)
+
+        renderer.draw(engine, motion, stepper.alpha(step))
+        profiler.mark("render")
+        renderer.present()
+        latency.presented(time.perf_counter())
+        profiler.mark("flip")
+
+        period = clock.tick(RENDER_FPS) / 1000
+        profiler.end(period, 1 / RENDER_FPS)
+
+def replay_game(path):
+    # Rendered playback: Space pauses, Left/Right halve/double the speed,
+    # PageUp/PageDown seek, Home/End jump to the start/end, Esc/Enter leave
+    replay = Replay.load(path)
+    engine, game_clock = replay.start()
+    renderer = Renderer(engine.obstacles)
+    tick = 0
+    speed = 1.0
+    paused = False
+    owed = 0.0  # fractional ticks carried between frames
+
+    def seek(target):
+        nonlocal engine, game_clock, tick, owed
+        target = max(0, min(len(replay), target))
+        if target < tick:
+            engine, game_clock = replay.seek(target)
+        else:
+            replay.run(engine, game_clock, tick, target)
+        tick, owed = target, 0.0
+        renderer.obstacles = engine.obstacles
+        renderer.layout(renderer.screen.get_size())  # full redraw
 
-        pygame.display.flip()
+    while True:
+        renderer.text("score", f"Score: {engine.score}", WHITE, (10, 10))
+        state = "paused" if paused else f"x{speed:g}"
+        renderer.text("replay", f"Replay {replay.mode} {tick}/{len(replay)} {state}", YELLOW,
+                      (10, renderer.screen.get_height() - 20), small_font)
+        renderer.draw(engine)
+        renderer.present()
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
-                pygame.quit(); sys.exit()
+                quit_game()
             elif event.type == pygame.VIDEORESIZE:
-                pygame.display.set_mode((event.w, event.h), pygame.RESIZABLE)
-            elif event.type == pygame.KEYDOWN and event.key in DIRECTIONS:
-                new_dir = DIRECTIONS[event.key]
-                if (new_dir[0]*-1, new_dir[1]*-1) != direction:
-                    direction = new_dir
-
-        head_x, head_y = snake[0]
-        dx, dy = direction
-        new_head = (head_x + dx, head_y + dy)
-
-        if mode == "Infinite":
-            new_head = (new_head[0] % GRID_WIDTH, new_head[1] % GRID_HEIGHT)
-        else:
-            if new_head[0] < 0 or new_head[0] >= GRID_WIDTH or new_head[1] < 0 or new_head[1] >= GRID_HEIGHT:
-                game_over_sound.play()
-                return score
-
-        if new_head in snake or new_head in obstacles:
-            game_over_sound.play()
-            return score
-
-        snake.insert(0, new_head)
-
-        # Check food
-        if new_head == food:
-            eat_sound.play()
-            score += 2 if double_score else 1
-            food = get_random_position(snake, obstacles)
-            if mode == "Classic" and score % 5 == 0:
-                speed += 0.5
-            if not powerup and random.random() < 0.3:
-                powerup = get_random_position(snake, obstacles)
-                powerup_kind = random.choice(["slow", "shrink", "double"])
-        else:
-            snake.pop()
-
-        # Check powerup
-        if powerup and new_head == powerup:
-            if powerup_kind == "slow":
-                speed = max(FPS - 2, 3)
-                super_eat_sound.play()
-            elif powerup_kind == "shrink" and len(snake) > 4:
-                snake = snake[:-3]
-                super_eat_sound.play()
-            elif powerup_kind == "double":
-                double_score = True
-                super_eat_sound.play()  # Play sound for super food
-            powerup = None
-            powerup_timer = time.time()
-
-        if double_score and time.time() - powerup_timer > 10:
-            double_score = False
-
-        clock.tick(speed if mode != "Hard" else FPS + 5)
-
-# Main loop
-while True:
-    mode = mode_select_screen()
-    score = snake_game(mode)
-    game_over_screen(score)
+                renderer.resize((event.w, event.h))
+            elif event.type == pygame.KEYDOWN:
+                if event.key in (pygame.K_ESCAPE, pygame.K_RETURN):
+                    return engine.score
+                elif event.key == pygame.K_SPACE:
+                    paused = not paused
+                elif event.key == pygame.K_RIGHT:
+                    speed = min(speed * 2, 256)
+                elif event.key == pygame.K_LEFT:
+                    speed = max(speed / 2, 0.25)
+                elif event.key in (pygame.K_PAGEUP, pygame.K_PAGEDOWN):
+                    jump = int(REPLAY_SEEK_SECONDS * engine.tick_rate())
+                    seek(tick + (jump if event.key == pygame.K_PAGEDOWN else -jump))
+                elif event.key == pygame.K_HOME:
+                    seek(0)
+                elif event.key == pygame.K_END:
+                    seek(len(replay))
+
+        if not paused and tick < len(replay):
+            # Ticks due this frame at the game's own rate times the playback speed
+            owed += engine.tick_rate() * speed / REPLAY_FPS
+            while owed >= 1 and tick < len(replay):
+                owed -= 1
+                replay.run(engine, game_clock, tick, tick + 1)
+                tick += 1
+                renderer.mark(*engine.changed)
+        clock.tick(REPLAY_FPS)
+
+def main():
+    global profiler_log
+    parser = argparse.ArgumentParser(description="Snake")
+    parser.add_argument("--profile", action="store_true",
+                        help="time every frame; F3 shows the overlay")
+    parser.add_argument("--profile-out", default="snake_profile.json",
+                        help="frame log name, streamed while playing (.csv or .json); each game "
+                             "writes NAME-<session start>-<game number>.EXT")
+    parser.add_argument("--replay", metavar="FILE", help="play back a recorded game")
+    parser.add_argument("--no-record", action="store_true", help="do not save replays")
+    args = parser.parse_args()
+    init()
+    if args.replay:
+        replay_game(args.replay)
+        quit_game()
+    autoplay = False
+    session = time.strftime("%Y%m%d-%H%M%S")
+    games = 0
+    while True:
+        mode, autoplay = mode_select_screen(autoplay)
+        games += 1
+        profiler = profiler_log = (FrameProfiler(path=game_log_path(args.profile_out, games, session))
+                                   if args.profile else None)
+        latency = LatencyStats()
+        score = snake_game(mode, profiler, record=not args.no_record, latency=latency, autoplay=autoplay)
+        if profiler:
+            profiler_log = None
+            print(f"Frame profile written to {profiler.close()}")
+            print(latency.hud_line())
+        game_over_screen(score, mode, autoplay)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+# File: snake_loop.py
+# Description: Fixed-timestep loop parts for snake (no pygame): step accumulator, buffered turn queue, input-to-photon latency
+#
+# The front end draws at RENDER_FPS and polls input every frame, while the
+# engine steps at its own tick_rate() out of a time accumulator. Turns wait
+# in a short queue so that several pressed within one step are applied on
+# consecutive steps instead of the last one overwriting the others.
+#
+# Usage:
+#   python snake_loop.py    simulated key presses: tick-locked loop against fixed step + turn queue
+
+import random
+from collections import deque
+
+RENDER_FPS = 120     # frames per second the front end draws and polls input at
+MAX_STEPS = 5        # simulation steps one frame may catch up before the backlog is dropped
+QUEUE_DEPTH = 3      # turns buffered ahead of the simulation
+TURN_MAX_AGE = 1.75  # steps a queued turn may wait before it is dropped as stale
+LATENCY_WINDOW = 200  # turns in the rolling latency statistics
+
+
+def _percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+class FixedStep:
+    # Call add(frame_seconds) once per frame, then take a simulation step
+    # while due(period) is true; alpha(period) is how far the display is
+    # between the last step and the next, for interpolation.
+    def __init__(self, max_steps=MAX_STEPS):
+        self.max_steps = max_steps
+        self.lag = 0.0      # simulation time owed
+        self.steps = 0      # steps taken this frame
+        self.dropped = 0.0  # seconds skipped after stalls (window drag, debugger)
+
+    def add(self, seconds):
+        self.lag += seconds
+        self.steps = 0
+
+    def due(self, period):
+        if self.lag < period:
+            return False
+        if self.steps >= self.max_steps:
+            # Too far behind to catch up without a visible jump: drop the backlog
+            self.dropped += self.lag - self.lag % period
+            self.lag %= period
+            return False
+        self.lag -= period
+        self.steps += 1
+        return True
+
+    def alpha(self, period):
+        return min(1.0, self.lag / period)
+
+
+class TurnQueue:
+    # Direction changes waiting for the simulation, oldest first, each with
+    # the time it was read. A turn is checked against the last queued
+    # direction rather than the snake's current one, so up-then-left inside
+    # one step is two turns, and a reversal is refused when it is pressed.
+    # At low tick rates a full queue would hold turns for several slow steps,
+    # so pop() drops turns older than max_age steps: the tail latency stays
+    # below the tick-locked loop's instead of growing with the queue.
+    def __init__(self, depth=QUEUE_DEPTH, max_age=TURN_MAX_AGE):
+        self.depth = depth
+        self.max_age = max_age
+        self.turns = deque()
+        self.overflow = 0  # turns refused because the queue was full
+        self.stale = 0     # turns dropped for waiting longer than max_age steps
+
+    def push(self, direction, heading, stamp):
+        # heading: the snake's current direction. Returns True if queued.
+        last = self.turns[-1][0] if self.turns else heading
+        if direction == last or direction == (-last[0], -last[1]):
+            return False
+        if len(self.turns) >= self.depth:
+            self.overflow += 1
+            return False
+        self.turns.append((direction, stamp))
+        return True
+
+    def pop(self, now, period):
+        # (direction, stamp) for the step taken at `now`, or (None, None) to go
+        # straight; period is the step length in seconds
+        turns = self.turns
+        while turns and now - turns[0][1] > self.max_age * period:
+            turns.popleft()
+            self.stale += 1
+        return turns.popleft() if turns else (None, None)
+
+    def __len__(self):
+        return len(self.turns)
+
+
+class LatencyStats:
+    # Input-to-photon time of each turn: from when its key was read to the
+    # end of the first present() showing the step that applied it. Events
+    # are read every frame, so time spent waiting in the event queue (at
+    # most one frame) is not included.
+    def __init__(self, window=LATENCY_WINDOW):
+        self.recent = deque(maxlen=window)
+        self.count = 0
+        self.waiting = []  # stamps of turns applied but not yet on screen
+
+    def applied(self, stamp):
+        if stamp is not None:
+            self.waiting.append(stamp)
+
+    def presented(self, now):
+        for stamp in self.waiting:
+            self.recent.append(now - stamp)
+        self.count += len(self.waiting)
+        self.waiting.clear()
+
+    def summary(self):
+        values = sorted(self.recent)
+        return {
+            "turns": self.count,
+            "window": len(values),
+            "p50_ms": _percentile(values, 0.5) * 1000,
+            "p95_ms": _percentile(values, 0.95) * 1000,
+            "max_ms": (values[-1] if values else 0.0) * 1000,
+        }
+
+    def hud_line(self):
+        s = self.summary()
+        return (f"input-to-photon p50 {s['p50_ms']:.0f}  p95 {s['p95_ms']:.0f}  max {s['max_ms']:.0f} ms"
+                f"  ({s['turns']} turns)")
+
+
+# === SIMULATION ===
+# Scripted key presses fed to a model of each loop; rendering is taken as
+# instantaneous so the figures show the latency the loop structure adds.
+
+def _presses(seconds, rng, rate=3.0, burst=0.3, gap=0.04):
+    # (time, direction) presses, each a turn from the previous one; a `burst`
+    # fraction are quick double turns `gap` seconds apart
+    t = 0.0
+    heading = (1, 0)
+    presses = []
+    while t < seconds:
+        t += rng.expovariate(rate)
+        for _ in range(2 if rng.random() < burst else 1):
+            heading = rng.choice([(heading[1], -heading[0]), (-heading[1], heading[0])])
+            presses.append((t, heading))
+            t += gap
+    return presses
+
+
+def simulate_tick_locked(presses, tick_rate):
+    # The old loop: render, present, read events, step, then sleep one tick.
+    # The last valid key of the batch wins and shows at the next present.
+    period = 1.0 / tick_rate
+    latency = LatencyStats(window=len(presses))
+    heading = (1, 0)
+    i = 0
+    t = 0.0
+    while i < len(presses):
+        action = stamp = None
+        while i < len(presses) and presses[i][0] <= t:
+            direction, when = presses[i][1], presses[i][0]
+            if direction != (-heading[0], -heading[1]):
+                action, stamp = direction, when
+            i += 1
+        if action is not None and action != heading:
+            heading = action
+            latency.applied(stamp)
+        latency.presented(t + period)
+        t += period
+    return latency
+
+
+def simulate_fixed_step(presses, tick_rate, render_fps=RENDER_FPS):
+    # The new loop: every frame read events into the queue, step as due,
+    # then present
+    period = 1.0 / tick_rate
+    frame = 1.0 / render_fps
+    stepper = FixedStep()
+    turns = TurnQueue()
+    latency = LatencyStats(window=len(presses))
+    heading = (1, 0)
+    i = 0
+    t = 0.0
+    while i < len(presses) or len(turns):
+        while i < len(presses) and presses[i][0] <= t:
+            turns.push(presses[i][1], heading, presses[i][0])
+            i += 1
+        stepper.add(frame)
+        while stepper.due(period):
+            action, stamp = turns.pop(t, period)
+            if action is not None:
+                heading = action
+                latency.applied(stamp)
+        latency.presented(t)
+        t += frame
+    return latency
+
+
+def main(seconds=600, seed=0):
+    rng = random.Random(seed)
+    presses = _presses(seconds, rng)
+    print(f"{len(presses)} turns over {seconds}s, 30% of them as double turns 40 ms apart")
+    print(f"{'loop':<28} {'applied':>8} {'lost':>6} {'p50 ms':>7} {'p95 ms':>7} {'max ms':>7}")
+    for tick_rate in (7, 12):
+        for name, run in ((f"tick-locked {tick_rate} Hz", simulate_tick_locked),
+                          (f"fixed step {tick_rate} Hz @ {RENDER_FPS} fps", simulate_fixed_step)):
+            latency = run(presses, tick_rate)
+            s = latency.summary()
+            print(f"{name:<28} {s['turns']:>8} {len(presses) - s['turns']:>6} "
+                  f"{s['p50_ms']:>7.0f} {s['p95_ms']:>7.0f} {s['max_ms']:>7.0f}")
+
+
+if __name__ == "__main__":
+    main()
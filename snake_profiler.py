@@ -0,0 +1,146 @@
+# File: snake_profiler.py
+# Description: Opt-in frame-time profiler for the snake loop: per-phase timers, rolling histogram, missed deadlines
+
+import csv
+import json
+import os
+import time
+from collections import deque
+
+PHASES = ("input", "update", "render", "flip")
+HISTOGRAM_EDGES_MS = (2, 4, 8, 16, 33, 66, 133)  # frame work-time bins; the last bin is open-ended
+MISS_TOLERANCE = 0.002  # a frame period this much over its budget counts as a missed deadline
+WINDOW = 300            # frames in the rolling statistics
+
+
+def _percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+COLUMNS = ["frame", *PHASES, "work", "period", "budget", "missed"]
+
+
+def game_log_path(path, game, stamp):
+    # "snake_profile.json" -> "snake_profile-20240101-120000-2.json", so each
+    # game of each session gets its own log
+    root, ext = os.path.splitext(path)
+    return f"{root}-{stamp}-{game}{ext}"
+
+
+class FrameProfiler:
+    # Call begin() at the top of a frame, mark(phase) after each phase and
+    # end(period, budget) once the frame's clock.tick() has returned. Only
+    # the rolling window stays in memory; with a path, every row is streamed
+    # to that file (.csv, or JSON otherwise) and close() finishes it.
+    enabled = True
+
+    def __init__(self, clock=time.perf_counter, window=WINDOW, path=None):
+        self.clock = clock
+        self.recent = deque(maxlen=window)  # rows of the last `window` frames
+        self.count = 0                      # frames profiled
+        self.missed = 0
+        self.path = path
+        self._times = dict.fromkeys(PHASES, 0.0)
+        self._last = 0.0
+        self._file = self._csv = None
+        if path:
+            self._file = open(path, "w", newline="")
+            if path.endswith(".csv"):
+                self._csv = csv.writer(self._file)
+                self._csv.writerow(COLUMNS)
+            else:
+                self._file.write('{"columns": %s, "frames": [' % json.dumps(COLUMNS))
+
+    def begin(self):
+        self._last = self.clock()
+        for phase in PHASES:
+            self._times[phase] = 0.0
+
+    def mark(self, phase):
+        now = self.clock()
+        self._times[phase] += now - self._last
+        self._last = now
+
+    def end(self, period, budget):
+        # period: seconds since the previous frame (clock.tick() / 1000);
+        # budget: the frame time the tick rate allows
+        times = self._times
+        work = sum(times.values())
+        missed = period > budget + MISS_TOLERANCE
+        self.missed += missed
+        row = (self.count, *(times[p] for p in PHASES), work, period, budget, missed)
+        self.count += 1
+        self.recent.append(row)
+        if self._csv:
+            self._csv.writerow(row)
+        elif self._file:
+            self._file.write(("\n" if row[0] == 0 else ",\n") + json.dumps(row))
+
+    def histogram(self):
+        # Work-time counts per HISTOGRAM_EDGES_MS bin over the rolling window
+        counts = [0] * (len(HISTOGRAM_EDGES_MS) + 1)
+        for row in self.recent:
+            ms = row[5] * 1000
+            i = 0
+            while i < len(HISTOGRAM_EDGES_MS) and ms >= HISTOGRAM_EDGES_MS[i]:
+                i += 1
+            counts[i] += 1
+        return counts
+
+    def summary(self):
+        recent = self.recent
+        work = sorted(row[5] for row in recent)
+        n = len(recent) or 1
+        return {
+            "frames": self.count,
+            "window": len(recent),
+            "phase_mean_ms": {p: sum(row[1 + i] for row in recent) / n * 1000 for i, p in enumerate(PHASES)},
+            "work_p50_ms": _percentile(work, 0.5) * 1000,
+            "work_p95_ms": _percentile(work, 0.95) * 1000,
+            "work_max_ms": (work[-1] if work else 0.0) * 1000,
+            "budget_ms": (recent[-1][7] if recent else 0.0) * 1000,
+            "missed_window": sum(row[8] for row in recent),
+            "missed_total": self.missed,
+            "histogram": dict(zip([f"<{e}ms" for e in HISTOGRAM_EDGES_MS] + [f">={HISTOGRAM_EDGES_MS[-1]}ms"],
+                                  self.histogram())),
+        }
+
+    def hud_lines(self):
+        s = self.summary()
+        phases = "  ".join(f"{p} {ms:.1f}" for p, ms in s["phase_mean_ms"].items())
+        hist = " ".join(f"{k}:{v}" for k, v in s["histogram"].items() if v)
+        return [
+            f"work p50 {s['work_p50_ms']:.1f}  p95 {s['work_p95_ms']:.1f}  max {s['work_max_ms']:.1f}"
+            f"  budget {s['budget_ms']:.0f} ms",
+            f"mean ms: {phases}",
+            f"missed {s['missed_window']}/{s['window']} (total {s['missed_total']})  {hist}",
+        ]
+
+    def close(self):
+        # Finish the streamed log (JSON gets the summary last); returns its path
+        if self._file is None:
+            return None
+        if self._csv is None:
+            self._file.write('], "summary": %s}' % json.dumps(self.summary()))
+        self._file.close()
+        self._file = self._csv = None
+        return self.path
+
+
+class NullProfiler:
+    # Stand-in when profiling is off: no clock reads, no storage
+    enabled = False
+
+    def begin(self):
+        pass
+
+    def mark(self, phase):
+        pass
+
+    def end(self, period, budget):
+        pass
+
+    def close(self):
+        return None
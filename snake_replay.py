@@ -0,0 +1,253 @@
+# File: snake_replay.py
+# Description: Compact deterministic snake replays: seed, mode and 2 bits per tick, re-simulated bit-exactly
+#
+# A replay file is a header followed by one 2-bit code per tick, four ticks
+# to a byte, lowest bits first. Each code is the turn relative to the
+# direction the snake was heading before that tick; the final byte is padded
+# with END codes. Because the engine runs on a TickClock and a seeded RNG,
+# the same codes always produce the same game.
+#
+# Usage:
+#   python snake_replay.py verify         record and re-simulate games in every mode
+#   python snake_replay.py info FILE      re-simulate a replay headlessly and report it
+
+import os
+import random
+import struct
+import sys
+import time
+from snake_engine import SnakeEngine, TickClock, MODES, GRID_WIDTH, GRID_HEIGHT, UP, DOWN, LEFT, RIGHT
+
+MAGIC = b"SNR2"
+HEADER = struct.Struct("<4sBQHH")  # magic, mode index, seed, width, height
+HEADERS = {MAGIC: HEADER, b"SNR1": struct.Struct("<4sBQBB")}  # SNR1 held the board size in bytes
+MAX_SIDE = 0xFFFF
+REPLAY_DIR = "replays"
+FLUSH_BYTES = 512  # packed bytes buffered before each write
+
+STRAIGHT, TURN_LEFT, TURN_RIGHT, END = range(4)
+
+
+def turn_left(direction):
+    return (direction[1], -direction[0])
+
+
+def turn_right(direction):
+    return (-direction[1], direction[0])
+
+
+def encode(direction, action):
+    # 2-bit code for `action` given the current direction; reversals and
+    # repeats are no-ops in the engine, so they record as STRAIGHT
+    if action is None or action == direction:
+        return STRAIGHT
+    if action == turn_left(direction):
+        return TURN_LEFT
+    if action == turn_right(direction):
+        return TURN_RIGHT
+    return STRAIGHT
+
+
+def decode(direction, code):
+    if code == TURN_LEFT:
+        return turn_left(direction)
+    if code == TURN_RIGHT:
+        return turn_right(direction)
+    return None
+
+
+def new_game(mode, seed, width=GRID_WIDTH, height=GRID_HEIGHT):
+    # Engine and clock set up the same way for live play and for replays
+    clock = TickClock()
+    return SnakeEngine(mode, seed=seed, clock=clock, width=width, height=height), clock
+
+
+def advance(engine, clock, action):
+    # One tick, live or replayed
+    events = engine.step(action)
+    clock.advance(engine)
+    return events
+
+
+def new_seed():
+    return random.SystemRandom().getrandbits(63)
+
+
+class Recorder:
+    # Streams a game's codes to `path` as it is played; call record() with
+    # the engine's direction and the action just before each advance()
+    def __init__(self, path, mode, seed, width=GRID_WIDTH, height=GRID_HEIGHT):
+        if not (0 < width <= MAX_SIDE and 0 < height <= MAX_SIDE):
+            raise ValueError(f"Cannot record a {width}x{height} board: sides must be 1 to {MAX_SIDE}")
+        self.path = path
+        self.file = open(path, "wb")
+        self.file.write(HEADER.pack(MAGIC, MODES.index(mode), seed, width, height))
+        self.buffer = bytearray()
+        self.byte = 0
+        self.count = 0  # codes in self.byte
+        self.ticks = 0
+
+    def record(self, direction, action):
+        self.byte |= encode(direction, action) << (2 * self.count)
+        self.count += 1
+        self.ticks += 1
+        if self.count == 4:
+            self.buffer.append(self.byte)
+            self.byte = self.count = 0
+            if len(self.buffer) >= FLUSH_BYTES:
+                self.file.write(self.buffer)
+                self.buffer.clear()
+
+    def close(self):
+        if self.file.closed:
+            return
+        if self.count:
+            for i in range(self.count, 4):
+                self.byte |= END << (2 * i)
+            self.buffer.append(self.byte)
+        self.file.write(self.buffer)
+        self.file.close()
+
+
+def recording_path(mode, directory=REPLAY_DIR):
+    os.makedirs(directory, exist_ok=True)
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    return os.path.join(directory, f"snake-{mode.lower().replace(' ', '-')}-{stamp}.snr")
+
+
+class Replay:
+    def __init__(self, mode, seed, width, height, codes):
+        self.mode = mode
+        self.seed = seed
+        self.width = width
+        self.height = height
+        self.codes = codes  # one code per tick
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        return cls.from_bytes(data)
+
+    @classmethod
+    def from_bytes(cls, data):
+        header = HEADERS.get(bytes(data[:4]))
+        if header is None:
+            raise ValueError("Not a snake replay")
+        if len(data) < header.size:
+            raise ValueError("Not a snake replay: file too short")
+        magic, mode, seed, width, height = header.unpack_from(data)
+        if mode >= len(MODES):
+            raise ValueError("Not a snake replay")
+        codes = bytearray()
+        for byte in data[header.size:]:
+            for shift in (0, 2, 4, 6):
+                code = byte >> shift & 3
+                if code == END:
+                    break
+                codes.append(code)
+        return cls(MODES[mode], seed, width, height, bytes(codes))
+
+    def __len__(self):
+        return len(self.codes)
+
+    def start(self):
+        return new_game(self.mode, self.seed, self.width, self.height)
+
+    def run(self, engine, clock, first, last):
+        # Apply ticks [first, last) to an engine that has played `first` ticks
+        codes = self.codes
+        for i in range(first, min(last, len(codes))):
+            if engine.done:
+                break
+            advance(engine, clock, decode(engine.direction, codes[i]))
+
+    def seek(self, tick):
+        # Fresh engine re-simulated to just after `tick` ticks
+        engine, clock = self.start()
+        self.run(engine, clock, 0, tick)
+        return engine, clock
+
+    def simulate(self):
+        return self.seek(len(self.codes))
+
+
+# === VERIFICATION ===
+# Plays games through Recorder exactly as the live loop does, then reloads
+# each file and checks that re-simulation reproduces every tick.
+
+def _state(engine, clock, events):
+    return (events, engine.score, engine.snake.head, len(engine.snake), engine.direction, engine.food,
+            engine.powerup, engine.powerup_kind, engine.double_score, engine.speed, clock.now, engine.done)
+
+
+def _safe_action(engine, rng, straight=0.85):
+    # Random policy that avoids immediate crashes when it can, so games run
+    # long enough for power-ups, speed-ups and the Time Attack limit
+    options = []
+    for d in (UP, DOWN, LEFT, RIGHT):
+        if d == (-engine.direction[0], -engine.direction[1]):
+            continue
+        x, y = engine.snake.head[0] + d[0], engine.snake.head[1] + d[1]
+        if engine.mode == "Infinite":
+            x, y = x % engine.width, y % engine.height
+        if engine.grid.in_bounds((x, y)) and not engine.grid.is_blocked((x, y)):
+            options.append(d)
+    if engine.direction in options and rng.random() < straight:
+        return None
+    if not options:
+        return rng.choice([None, UP, DOWN, LEFT, RIGHT])
+    return rng.choice(options)
+
+
+def verify(games_per_mode=25, seed=0, max_ticks=5000, directory=None):
+    import tempfile
+    rng = random.Random(seed)
+    results = {}
+    with tempfile.TemporaryDirectory(dir=directory) as tmp:
+        for mode in MODES:
+            ticks = resim_seconds = 0
+            for g in range(games_per_mode):
+                game_seed = rng.getrandbits(63)
+                path = os.path.join(tmp, f"{mode}-{g}.snr")
+                engine, clock = new_game(mode, game_seed)
+                recorder = Recorder(path, mode, game_seed)
+                live = []
+                while not engine.done and len(live) < max_ticks:
+                    action = _safe_action(engine, rng)
+                    recorder.record(engine.direction, action)
+                    live.append(_state(engine, clock, advance(engine, clock, action)))
+                recorder.close()
+
+                replay = Replay.load(path)
+                assert (replay.mode, replay.seed, len(replay)) == (mode, game_seed, len(live)), path
+                t0 = time.perf_counter()
+                engine, clock = replay.start()
+                for i, code in enumerate(replay.codes):
+                    events = advance(engine, clock, decode(engine.direction, code))
+                    if _state(engine, clock, events) != live[i]:
+                        raise AssertionError(f"{mode} game {g} diverges at tick {i}")
+                resim_seconds += time.perf_counter() - t0
+                ticks += len(live)
+            results[mode] = (ticks, ticks / resim_seconds)
+    return results
+
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else "verify"
+    if command == "verify":
+        for mode, (ticks, rate) in verify().items():
+            print(f"{mode:<12} {ticks:>7} ticks bit-exact, re-simulated at {rate:,.0f} ticks/s")
+    elif command == "info" and len(sys.argv) > 2:
+        replay = Replay.load(sys.argv[2])
+        t0 = time.perf_counter()
+        engine, clock = replay.simulate()
+        elapsed = time.perf_counter() - t0
+        print(f"{replay.mode}, seed {replay.seed}, {len(replay)} ticks ({clock.now:.1f}s of play): "
+              f"score {engine.score}; re-simulated at {len(replay) / max(elapsed, 1e-9):,.0f} ticks/s")
+    else:
+        sys.exit("Usage: python snake_replay.py verify | info FILE")
+
+
+if __name__ == "__main__":
+    main()
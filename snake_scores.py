@@ -0,0 +1,157 @@
+# File: snake_scores.py
+# Description: In-memory snake leaderboard (top N per mode) flushed to disk atomically on a background thread
+#
+# Usage:
+#   python snake_scores.py    print the saved leaderboard
+
+import bisect
+import json
+import os
+import threading
+import time
+from snake_engine import MODES
+
+SCORE_FILE = "highscores.json"
+LEGACY_FILE = "highscore.txt"  # single score from older versions, imported into Classic
+TOP_N = 10
+
+
+class Leaderboard:
+    # Loaded once at startup; best(), top() and submit() only touch memory.
+    # Changes wake a writer thread that saves a snapshot to a temp file and
+    # renames it over SCORE_FILE, so a crash mid-write never corrupts it.
+    def __init__(self, path=SCORE_FILE, top_n=TOP_N, modes=MODES):
+        self.path = path
+        self.top_n = top_n
+        self._scores = {mode: [] for mode in modes}  # per mode: sorted (-score, timestamp)
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._version = 0  # bumped on every change
+        self._saved = 0    # version last written to disk
+        self._writer = None
+        self._closing = False
+
+    def load(self):
+        # Read the file once. A missing file starts from the legacy single
+        # score, if there is one; an unreadable file is moved aside rather
+        # than overwritten. Scores that did not come straight from the file
+        # (imported or recovered) are saved right away.
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+            for mode, entries in data["modes"].items():
+                for entry in entries:
+                    self._insert(mode, int(entry["score"]), float(entry["time"]))
+        except FileNotFoundError:
+            self._import_legacy()
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            self._set_aside(e)
+        else:
+            self._saved = self._version
+        if self._saved != self._version:
+            with self._lock:
+                self._start_writer()
+        return self
+
+    def _set_aside(self, error):
+        backup = f"{self.path}.bad-{time.strftime('%Y%m%d-%H%M%S')}"
+        try:
+            os.replace(self.path, backup)
+        except OSError:
+            print(f"Unreadable high score file {self.path} ({error!r}); it will be replaced on the next save")
+        else:
+            print(f"Unreadable high score file {self.path} ({error!r}); moved to {backup}")
+
+    def _import_legacy(self):
+        try:
+            with open(LEGACY_FILE) as f:
+                score = int(f.read().strip())
+            timestamp = os.path.getmtime(LEGACY_FILE)
+        except (OSError, ValueError):
+            return
+        if score > 0:
+            self._insert(MODES[0], score, timestamp)
+
+    def _insert(self, mode, score, timestamp):
+        # Rank (1-based) of the new entry, or None if it did not make the top N
+        entries = self._scores.setdefault(mode, [])
+        key = (-score, timestamp)
+        i = bisect.bisect_right(entries, key)
+        if i >= self.top_n:
+            return None
+        entries.insert(i, key)
+        del entries[self.top_n:]
+        self._version += 1
+        return i + 1
+
+    def best(self, mode):
+        entries = self._scores.get(mode)
+        return -entries[0][0] if entries else 0
+
+    def top(self, mode):
+        # [(score, timestamp), ...], best first
+        return [(-neg, timestamp) for neg, timestamp in self._scores.get(mode, ())]
+
+    def submit(self, mode, score, now=None):
+        # Record a finished game; returns its rank or None. A score of 0 is
+        # never recorded. The save happens on the writer thread.
+        if score <= 0:
+            return None
+        with self._lock:
+            rank = self._insert(mode, score, time.time() if now is None else now)
+            if rank is not None:
+                self._start_writer()
+                self._wake.notify()
+        return rank
+
+    def _start_writer(self):
+        if self._writer is None:
+            self._writer = threading.Thread(target=self._write_loop, name="leaderboard-writer", daemon=True)
+            self._writer.start()
+
+    def _snapshot(self):
+        return {
+            "version": 1,
+            "modes": {mode: [{"score": -neg, "time": timestamp} for neg, timestamp in entries]
+                      for mode, entries in self._scores.items()},
+        }
+
+    def _write_loop(self):
+        while True:
+            with self._lock:
+                while self._saved == self._version and not self._closing:
+                    self._wake.wait()
+                if self._saved == self._version:
+                    return
+                version, data = self._version, self._snapshot()
+            try:
+                self._write(data)
+            except OSError:
+                pass  # keep playing; the next change tries again
+            with self._lock:
+                self._saved = version
+                self._wake.notify_all()
+
+    def _write(self, data):
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(data, f, indent=1)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+
+    def close(self, timeout=2.0):
+        # Wait for pending changes to reach disk and stop the writer
+        with self._lock:
+            self._closing = True
+            self._wake.notify_all()
+        if self._writer is not None:
+            self._writer.join(timeout)
+
+
+if __name__ == "__main__":
+    board = Leaderboard().load()
+    for mode in MODES:
+        print(mode)
+        for rank, (score, timestamp) in enumerate(board.top(mode), 1):
+            print(f"  {rank:>2}. {score:>5}  {time.strftime('%Y-%m-%d %H:%M', time.localtime(timestamp))}")
@@ -0,0 +1,91 @@
+# File: snake_sound.py
+# Description: Sound effects decoded off the main thread, with reserved channels and a silent fallback
+
+import threading
+import time
+import pygame
+
+SOUND_FILES = {
+    "eat": "food_G1U6tlb.mp3",
+    "powerup": "super_food.mp3",  # special food sound
+    "crash": "sound_ErK79lZ.mp3",
+}
+MUSIC_FILE = "background_music.mp3"
+# Mixer channels reserved for each effect class, so a burst of one effect
+# never cuts off another
+SOUND_CHANNELS = {"eat": 2, "powerup": 1, "crash": 1}
+
+
+class NullSoundManager:
+    # Used when there is no audio device: every call is a no-op
+    def play(self, effect):
+        pass
+
+    def flush(self):
+        pass
+
+    def play_music(self, path=MUSIC_FILE):
+        pass
+
+
+class SoundManager:
+    # play(effect) only queues; flush() once per tick starts each queued
+    # effect at most once on its own channels. Effects are decoded to PCM
+    # (pygame.mixer.Sound) on a loader thread and are silently skipped until
+    # they are ready, or forever if their file is missing.
+    def __init__(self, files=SOUND_FILES, channels=SOUND_CHANNELS):
+        self.sounds = {}
+        self.pending = set()
+        pygame.mixer.set_reserved(sum(channels.values()))
+        self.channels = {}
+        first = 0
+        for effect, count in channels.items():
+            self.channels[effect] = [pygame.mixer.Channel(first + i) for i in range(count)]
+            first += count
+        self.started = {}  # channel -> time.monotonic() its current sound started
+        self.loader = threading.Thread(target=self._load, args=(dict(files),), name="sound-loader", daemon=True)
+        self.loader.start()
+
+    def _load(self, files):
+        for effect, path in files.items():
+            try:
+                self.sounds[effect] = pygame.mixer.Sound(path)
+            except (pygame.error, OSError):
+                print(f"Sound effect not found: {path}")
+
+    def play(self, effect):
+        self.pending.add(effect)
+
+    def flush(self):
+        for effect in self.pending:
+            sound = self.sounds.get(effect)
+            channels = self.channels.get(effect)
+            if sound is None or not channels:
+                continue
+            for channel in channels:
+                if not channel.get_busy():
+                    break
+            else:
+                # All busy: restart the one that has been playing longest
+                channel = min(channels, key=lambda c: self.started.get(c, 0.0))
+            channel.play(sound)
+            self.started[channel] = time.monotonic()
+        self.pending.clear()
+
+    def play_music(self, path=MUSIC_FILE):
+        try:
+            pygame.mixer.music.load(path)
+            pygame.mixer.music.play(-1)
+        except pygame.error:
+            print("Background music not found.")
+
+
+def create_sound_manager(files=SOUND_FILES, channels=SOUND_CHANNELS):
+    # A SoundManager, or a NullSoundManager if the mixer cannot be opened
+    try:
+        pygame.mixer.init()
+    except pygame.error:
+        return NullSoundManager()
+    if not pygame.mixer.get_init():
+        return NullSoundManager()
+    return SoundManager(files, channels)
@@ -0,0 +1,115 @@
+# File: test_clock_scheduler.py
+# Description: The tick scheduler keeps the clock, stopwatch and timer drift-free and idles while hidden
+#
+# Usage:
+#   python -m pytest test_clock_scheduler.py
+#   python -m unittest test_clock_scheduler
+
+import random
+import unittest
+from clock_scheduler import TickScheduler, simulate, simulate_hidden, Countdown, Stopwatch, _FakeTk
+
+MAX_LATENCY = 0.15  # worst Tk callback delay simulated, seconds
+HIDDEN_LATENCY = 0.01  # worst callback delay in the hidden-window simulation
+
+
+class DriftTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.r = simulate(hours=24, max_latency=MAX_LATENCY)
+
+    def test_clock_shows_every_second_once(self):
+        r = self.r
+        self.assertEqual(r["clock_skipped"], 0)
+        self.assertEqual(r["clock_repeats"], 0)
+        self.assertLessEqual(r["clock_max_late"], MAX_LATENCY + 0.001)
+
+    def test_stopwatch_tracks_wall_time(self):
+        r = self.r
+        self.assertLessEqual(abs(r["stopwatch_at_end"] - r["clock_last_second"]), 1)
+
+    def test_timer_has_no_cumulative_drift(self):
+        # One callback's latency at most, however long the countdown
+        self.assertGreaterEqual(self.r["timer_late"], 0)
+        self.assertLessEqual(self.r["timer_late"], MAX_LATENCY + 0.001)
+        self.assertGreater(self.r["legacy_timer_late"], 60)  # the old countdown drifted by minutes
+
+
+class HiddenWindowTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.r = simulate_hidden(minutes=10)
+
+    def test_hidden_window_barely_wakes(self):
+        # Only the alarm re-check and the timer's deadline remain
+        self.assertGreaterEqual(self.r["visible_per_minute"], 60)
+        self.assertLessEqual(self.r["hidden_per_minute"], 2)
+
+    def test_resume_repaints_at_once(self):
+        self.assertLessEqual(self.r["resync_late"], HIDDEN_LATENCY + 0.001)
+        self.assertAlmostEqual(self.r["shown_per_minute"], self.r["visible_per_minute"], delta=2)
+
+    def test_deadlines_kept_while_hidden(self):
+        self.assertGreaterEqual(self.r["timer_late"], 0)
+        self.assertLessEqual(self.r["timer_late"], HIDDEN_LATENCY + 0.001)
+        self.assertEqual(self.r["stopwatch_at_end"], 3 * 10 * 60)
+
+
+class RemoveTest(unittest.TestCase):
+    def setUp(self):
+        self.tk = _FakeTk(0.0, random.Random(0))
+        self.ticks = TickScheduler(self.tk.after, self.tk.after_cancel, self.tk.clock, self.tk.wall)
+        self.calls = []
+
+    def test_remove_self_inside_callback(self):
+        def tick(now):
+            self.calls.append(now)
+            self.ticks.remove(token)
+            return now + 1  # ignored: the subscription is gone
+        token = self.ticks.add(tick)
+        self.tk.run_until(self.tk.now + 10)
+        self.assertEqual(len(self.calls), 1)
+        self.assertNotIn(token, self.ticks)
+
+    def test_remove_other_due_in_same_wake(self):
+        def first(now):
+            self.calls.append("first")
+            self.ticks.remove(second_token)
+            return now + 1
+        def second(now):
+            self.calls.append("second")
+            return now + 1
+        when = self.tk.now + 1
+        self.ticks.add(first, when)
+        second_token = self.ticks.add(second, when)
+        self.tk.run_until(self.tk.now + 3.5)
+        self.assertEqual(self.calls, ["first"] * 3)
+
+
+class DeadlineTest(unittest.TestCase):
+    def test_countdown_rounds_up(self):
+        now = [100.0]
+        countdown = Countdown(10, clock=lambda: now[0])
+        self.assertEqual(countdown.remaining(), 10)
+        now[0] = 100.4
+        self.assertEqual(countdown.remaining(), 10)
+        self.assertAlmostEqual(countdown.next_change(now[0]), 101.0)
+        now[0] = 110.0
+        self.assertEqual(countdown.remaining(), 0)
+
+    def test_stopwatch_ignores_stopped_time(self):
+        now = [0.0]
+        stopwatch = Stopwatch(clock=lambda: now[0])
+        stopwatch.start()
+        now[0] = 5.0
+        stopwatch.stop()
+        now[0] = 50.0
+        self.assertEqual(stopwatch.elapsed(), 5.0)
+        stopwatch.start()
+        now[0] = 52.5
+        self.assertEqual(stopwatch.elapsed(), 7.5)
+        self.assertAlmostEqual(stopwatch.next_change(now[0]), 53.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+# File: test_snake_batch.py
+# Description: BatchSnake against the scalar SnakeEngine rules, step for step, in every mode
+#
+# Each batch game is replayed through SnakeEngine, fed the batch's random
+# outcomes, and the full state is compared after every step.
+#
+# Usage:
+#   python -m pytest test_snake_batch.py
+#   python -m unittest test_snake_batch
+
+import unittest
+import numpy as np
+from snake_engine import SnakeEngine, MODES
+from snake_batch import BatchSnake, ACTIONS, safe_random_actions
+
+GAMES = 32
+STEPS = 600
+
+
+class _TraceRNG:
+    def __init__(self, trace):
+        self.trace = trace
+        self.pos = 0
+
+    def next(self, kind):
+        entry = self.trace[self.pos]
+        self.pos += 1
+        if entry[0] != kind:
+            raise AssertionError(f"engine drew {kind!r} where the batch drew {entry[0]!r}")
+        return entry[1]
+
+    def random(self):
+        return self.next("random")
+
+    def choice(self, seq):
+        return seq[self.next("choice")]
+
+
+class _TracedEngine(SnakeEngine):
+    def spawn_cell(self):
+        c = self.rng.next("cell")
+        if c < 0:
+            if self.grid.free_count():
+                raise AssertionError("batch found a full board the engine did not")
+            return None
+        pos = (c % self.width, c // self.width)
+        if self.grid.is_blocked(pos):
+            raise AssertionError(f"batch spawned on occupied cell {pos}")
+        return pos
+
+
+class BatchEquivalenceTest(unittest.TestCase):
+    def check(self, modes, seed, steps=STEPS, width=20, height=15):
+        # Returns the number of game-steps compared
+        n = len(modes)
+        sim = BatchSnake(n, modes, seed=seed, width=width, height=height, trace=True)
+        now = [0.0] * n
+        engines = [_TracedEngine(modes[g], clock=lambda g=g: now[g], rng=_TraceRNG(sim.trace[g]),
+                                 width=width, height=height)
+                   for g in range(n)]
+        policy = np.random.default_rng(seed + 1)
+        checked = 0
+        for t in range(steps):
+            actions = safe_random_actions(sim, policy)
+            sim.step(actions)
+            for g, engine in enumerate(engines):
+                if engine.done:
+                    continue
+                engine.step(ACTIONS[actions[g]])
+                now[g] += 1.0 / engine.tick_rate()
+                state = (engine.done, engine.score, engine.speed, engine.double_score, engine.ticks,
+                         engine.direction, engine.food, engine.powerup, list(engine.snake))
+                food, powerup = int(sim.food[g]), int(sim.powerup[g])
+                batch = (bool(sim.done[g]), int(sim.score[g]), float(sim.speed[g]), bool(sim.double_score[g]),
+                         int(sim.ticks[g]), tuple(sim.direction[g].tolist()),
+                         None if food < 0 else (food % width, food // width),
+                         None if powerup < 0 else (powerup % width, powerup // width),
+                         sim.body_cells(g))
+                if engine.done and state[0] == batch[0]:
+                    state, batch = state[:5], batch[:5]  # food and power-up are irrelevant after the end
+                self.assertEqual(state, batch, f"game {g} ({modes[g]}) diverged at step {t}")
+                checked += 1
+        return checked
+
+    def test_each_mode(self):
+        for seed, mode in enumerate(MODES):
+            with self.subTest(mode=mode):
+                self.assertGreater(self.check([mode] * GAMES, seed), GAMES)
+
+    def test_mixed_modes_full_board(self):
+        # All modes in one batch, on the default board size
+        from snake_engine import GRID_WIDTH, GRID_HEIGHT
+        modes = [MODES[i % len(MODES)] for i in range(GAMES)]
+        self.assertGreater(self.check(modes, 100, width=GRID_WIDTH, height=GRID_HEIGHT), GAMES)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+# File: test_snake_replay.py
+# Description: Replays recorded with Recorder re-simulate bit-exactly in every snake mode
+#
+# Usage:
+#   python -m pytest test_snake_replay.py
+#   python -m unittest test_snake_replay
+
+import os
+import random
+import tempfile
+import unittest
+from snake_engine import MODES, UP
+from snake_replay import Recorder, Replay, HEADERS, MAX_SIDE, new_game, advance, decode, _state, _safe_action
+
+GAMES_PER_MODE = 10
+MAX_TICKS = 3000
+
+
+def record_game(path, mode, seed, rng, max_ticks=MAX_TICKS):
+    # Play one game through Recorder exactly as the live loop does; returns
+    # the state after every tick
+    engine, clock = new_game(mode, seed)
+    recorder = Recorder(path, mode, seed)
+    live = []
+    while not engine.done and len(live) < max_ticks:
+        action = _safe_action(engine, rng)
+        recorder.record(engine.direction, action)
+        live.append(_state(engine, clock, advance(engine, clock, action)))
+    recorder.close()
+    return live
+
+
+class ReplayTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_bit_exact_in_every_mode(self):
+        rng = random.Random(0)
+        for mode in MODES:
+            for g in range(GAMES_PER_MODE):
+                with self.subTest(mode=mode, game=g):
+                    seed = rng.getrandbits(63)
+                    path = os.path.join(self.tmp.name, f"{mode}-{g}.snr")
+                    live = record_game(path, mode, seed, rng)
+                    replay = Replay.load(path)
+                    self.assertEqual((replay.mode, replay.seed, len(replay)), (mode, seed, len(live)))
+                    engine, clock = replay.start()
+                    for i, code in enumerate(replay.codes):
+                        events = advance(engine, clock, decode(engine.direction, code))
+                        self.assertEqual(_state(engine, clock, events), live[i], f"diverged at tick {i}")
+
+    def test_seek_matches_playback(self):
+        rng = random.Random(1)
+        for mode in MODES:
+            with self.subTest(mode=mode):
+                path = os.path.join(self.tmp.name, f"{mode}.snr")
+                live = record_game(path, mode, rng.getrandbits(63), rng)
+                replay = Replay.load(path)
+                for tick in sorted({1, len(live) // 3, len(live) // 2, len(live)}):
+                    engine, clock = replay.seek(tick)
+                    self.assertEqual(_state(engine, clock, live[tick - 1][0]), live[tick - 1])
+
+    def test_large_board_header(self):
+        path = os.path.join(self.tmp.name, "wide.snr")
+        recorder = Recorder(path, MODES[0], 7, width=300, height=256)
+        recorder.record(UP, None)
+        recorder.close()
+        replay = Replay.load(path)
+        self.assertEqual((replay.seed, replay.width, replay.height, len(replay)), (7, 300, 256, 1))
+
+    def test_reads_old_header(self):
+        data = HEADERS[b"SNR1"].pack(b"SNR1", 1, 42, 20, 15) + bytes([0b11111001])
+        replay = Replay.from_bytes(data)
+        self.assertEqual((replay.mode, replay.seed, replay.width, replay.height), (MODES[1], 42, 20, 15))
+        self.assertEqual(replay.codes, bytes([1, 2]))
+
+    def test_rejects_oversize_board(self):
+        path = os.path.join(self.tmp.name, "huge.snr")
+        with self.assertRaises(ValueError):
+            Recorder(path, MODES[0], 7, width=MAX_SIDE + 1)
+        self.assertFalse(os.path.exists(path))
+
+
+if __name__ == "__main__":
+    unittest.main()
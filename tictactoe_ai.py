@@ -0,0 +1,453 @@
+# File: tictactoe_ai.py
+# Description: Tic-tac-toe search (no Tk): alpha-beta with a symmetry-folded transposition table
+
+import random
+import time
+from tictactoe_board import Board, WINNING, SYMMETRY_TABLES, cells_of
+
+# Center, corners, then edges: the strongest replies are searched first
+MOVE_ORDER = (4, 0, 2, 6, 8, 1, 3, 5, 7)
+_ORDERED_BITS = [(i, 1 << i) for i in MOVE_ORDER]
+
+EXACT, LOWER, UPPER = 0, 1, 2
+
+# Shared across searches: values depend only on the position, not on the root
+_table = {}
+
+
+def _negamax(me, opp, empties, alpha, beta, stats):
+    # me/opp are the 9-bit sets of the side to move and its opponent. Value for
+    # the side to move: a win scores 1 + empty cells left when it lands (so
+    # faster wins and slower losses are preferred), a draw 0
+    stats["nodes"] += 1
+    # Piece counts tell which side is to move, so (me, opp) needs no extra bit
+    key = min(t[me] << 9 | t[opp] for t in SYMMETRY_TABLES)
+    entry = _table.get(key)
+    if entry is not None:
+        value, flag = entry
+        if flag == EXACT:
+            return value
+        if flag == LOWER:
+            alpha = max(alpha, value)
+        else:
+            beta = min(beta, value)
+        if alpha >= beta:
+            return value
+
+    alpha0 = alpha
+    occupied = me | opp
+    best = -100
+    for i, bit in _ORDERED_BITS:
+        if occupied & bit:
+            continue
+        mine = me | bit
+        if WINNING[mine]:
+            score = empties  # 1 + cells left after this move
+        elif empties == 1:
+            score = 0
+        else:
+            score = -_negamax(opp, mine, empties - 1, -beta, -alpha, stats)
+        if score > best:
+            best = score
+            if score > alpha:
+                alpha = score
+                if alpha >= beta:
+                    break
+
+    flag = UPPER if best <= alpha0 else LOWER if best >= beta else EXACT
+    _table[key] = (best, flag)
+    return best
+
+
+def best_move(board, player="O", stats=None):
+    # Perfect-play move for player on a Board, as (row, col); None if full
+    stats = stats if stats is not None else {"nodes": 0}
+    me = board.bits(player)
+    opp = board.bits("X" if player == "O" else "O")
+    occupied = me | opp
+    empties = 9 - bin(occupied).count("1")
+    move = None
+    alpha = -100
+    for i, bit in _ORDERED_BITS:
+        if occupied & bit:
+            continue
+        mine = me | bit
+        if WINNING[mine]:
+            score = empties
+        elif empties == 1:
+            score = 0
+        else:
+            score = -_negamax(opp, mine, empties - 1, -100, -alpha, stats)
+        if score > alpha:
+            alpha = score
+            move = divmod(i, 3)
+    return move
+
+
+def random_move(board, rng=random):
+    empty = list(board.moves())
+    return divmod(rng.choice(empty), board.size) if empty else None
+
+
+def normal_move(board, player="O", rng=random):
+    other = "X" if player == "O" else "O"
+    # Win if possible
+    for i in board.moves():
+        if board.would_win(i, player):
+            return divmod(i, board.size)
+    # Block if the opponent can win
+    for i in board.moves():
+        if board.would_win(i, other):
+            return divmod(i, board.size)
+    # Else random
+    return random_move(board, rng)
+
+
+def clear_table():
+    _table.clear()
+
+
+# === N x N SEARCH ===
+# Iterative-deepening alpha-beta for boards where a full solve is out of reach.
+# The evaluation scores every k-cell window still open to one player only,
+# 10 ** (stones - 1) each, and is updated incrementally per move from the
+# windows through the played cell.
+
+WIN_SCORE = 1_000_000
+
+
+class _Timeout(Exception):
+    pass
+
+
+class _Search:
+    def __init__(self, board, deadline, stats, cancel=None):
+        geo = board.geo
+        self.geo = geo
+        self.windows_through = geo.windows_through
+        self.weights = [0] + [10 ** c for c in range(geo.k)]
+        # On larger boards only cells next to a stone are worth trying
+        self.near_only = geo.size > 4
+        self.deadline = deadline
+        self.cancel = cancel
+        self.stats = stats
+        self.table = {}
+
+    def evaluate(self, me, opp):
+        w = self.weights
+        score = 0
+        for m in self.geo.windows:
+            if not opp & m:
+                score += w[(me & m).bit_count()]
+            elif not me & m:
+                score -= w[(opp & m).bit_count()]
+        return score
+
+    def _gain(self, me, opp, i):
+        # Evaluation change for me from playing i, and whether it wins
+        w = self.weights
+        k = self.geo.k
+        gain = 0
+        won = False
+        for m in self.windows_through[i]:
+            if opp & m:
+                if not me & m:
+                    gain += w[(opp & m).bit_count()]  # opponent's window is now dead
+            else:
+                c = (me & m).bit_count() + 1
+                if c == k:
+                    won = True
+                gain += w[c] - w[c - 1]
+        return gain, won
+
+    def ordered_moves(self, me, opp, first=None):
+        # Candidates as (i, gain, won), best attack + defence first
+        occupied = me | opp
+        empty = self.geo.full & ~occupied
+        if self.near_only and occupied:
+            empty &= self.geo.dilate(occupied)
+        moves = []
+        for i in cells_of(empty):
+            gain, won = self._gain(me, opp, i)
+            block = self._gain(opp, me, i)[0]
+            moves.append((WIN_SCORE if won else gain + block, i, gain, won))
+        moves.sort(reverse=True)
+        if first is not None:
+            for n, move in enumerate(moves):
+                if move[1] == first:
+                    moves.insert(0, moves.pop(n))
+                    break
+        return [(i, gain, won) for _, i, gain, won in moves]
+
+    def negamax(self, me, opp, empties, score, depth, alpha, beta):
+        # score is the static evaluation for the side to move (me)
+        stats = self.stats
+        stats["nodes"] += 1
+        if stats["nodes"] & 255 == 0:
+            if time.perf_counter() > self.deadline or (self.cancel is not None and self.cancel.is_set()):
+                raise _Timeout
+        key = (me, opp)
+        entry = self.table.get(key)
+        first = None
+        if entry is not None:
+            e_depth, value, flag, first = entry
+            if e_depth >= depth:
+                if flag == EXACT:
+                    return value
+                if flag == LOWER:
+                    alpha = max(alpha, value)
+                else:
+                    beta = min(beta, value)
+                if alpha >= beta:
+                    return value
+        if depth == 0:
+            return score
+
+        alpha0 = alpha
+        best, best_i = -2 * WIN_SCORE, None
+        for i, gain, won in self.ordered_moves(me, opp, first):
+            if won:
+                value = WIN_SCORE + empties - 1  # sooner wins score higher
+            elif empties == 1:
+                value = 0
+            else:
+                value = -self.negamax(opp, me | 1 << i, empties - 1, -(score + gain), depth - 1, -beta, -alpha)
+            if value > best:
+                best, best_i = value, i
+                if value > alpha:
+                    alpha = value
+                    if alpha >= beta:
+                        break
+        if best_i is None:
+            return 0  # no candidates left: board full
+        flag = UPPER if best <= alpha0 else LOWER if best >= beta else EXACT
+        self.table[key] = (depth, best, flag, best_i)
+        return best
+
+
+def search_move(board, player="O", time_budget=1.0, max_depth=None, stats=None, cancel=None):
+    # Best move found within time_budget seconds, as (row, col); None if full.
+    # stats receives nodes searched, the last completed depth and its value.
+    # cancel is an optional threading.Event that stops the search early.
+    stats = stats if stats is not None else {}
+    stats.update(nodes=0, depth=0, value=0)
+    if board.is_full():
+        return None
+    me = board.bits(player)
+    opp = board.bits("X" if player == "O" else "O")
+    empties = board.empty().bit_count()
+    search = _Search(board, time.perf_counter() + time_budget, stats, cancel)
+    score = search.evaluate(me, opp)
+    best = search.ordered_moves(me, opp)[0][0]
+    for depth in range(1, min(max_depth or empties, empties) + 1):
+        try:
+            value = search.negamax(me, opp, empties, score, depth, -2 * WIN_SCORE, 2 * WIN_SCORE)
+        except _Timeout:
+            break
+        best = search.table[(me, opp)][3]
+        stats.update(depth=depth, value=value)
+        if abs(value) >= WIN_SCORE:
+            break  # forced win or loss found; deeper search cannot change it
+    return divmod(best, board.size)
+
+
+# === DIFFICULTY LEVELS ===
+
+DIFFICULTIES = ["Easy", "Normal", "Hard"]
+HARD_TIME_BUDGET = 1.0  # seconds per Hard move on boards larger than 3x3
+
+
+def choose_move(board, difficulty, player="O", rng=random, time_budget=HARD_TIME_BUDGET, stats=None, cancel=None):
+    # The computer's move at the given difficulty, as (row, col)
+    if difficulty == "Easy":
+        return random_move(board, rng)
+    elif difficulty == "Normal":
+        return normal_move(board, player, rng)
+    elif difficulty != "Hard":
+        raise ValueError(f"Unknown difficulty: {difficulty}")
+    if board.size == 3 and board.k == 3:
+        # 3x3: single lookup in the solved table (imported here because
+        # tictactoe_book itself builds on this module)
+        from tictactoe_book import book_move
+        return book_move(board, player, stats)
+    return search_move(board, player, time_budget=time_budget, stats=stats, cancel=cancel)
+
+
+# === REFERENCE SEARCH ===
+# The original full, unpruned minimax (O maximizes), kept as a baseline.
+
+def check_winner(board, player):
+    win_lines = (
+        board,
+        zip(*board),
+        [[board[i][i] for i in range(3)]],
+        [[board[i][2-i] for i in range(3)]]
+    )
+    for line_group in win_lines:
+        for line in line_group:
+            if all(cell == player for cell in line):
+                return True
+    return False
+
+
+def is_draw(board):
+    return all(board[i][j] != "" for i in range(3) for j in range(3))
+
+
+def minimax(board, is_max, stats=None):
+    if stats is not None:
+        stats["nodes"] += 1
+    if check_winner(board, "O"):
+        return 1
+    elif check_winner(board, "X"):
+        return -1
+    elif is_draw(board):
+        return 0
+
+    if is_max:
+        best = -float('inf')
+        for i in range(3):
+            for j in range(3):
+                if board[i][j] == "":
+                    board[i][j] = "O"
+                    best = max(best, minimax(board, False, stats))
+                    board[i][j] = ""
+        return best
+    else:
+        best = float('inf')
+        for i in range(3):
+            for j in range(3):
+                if board[i][j] == "":
+                    board[i][j] = "X"
+                    best = min(best, minimax(board, True, stats))
+                    board[i][j] = ""
+        return best
+
+
+def minimax_move(board, stats=None):
+    best_score = -float('inf')
+    move = None
+    for i in range(3):
+        for j in range(3):
+            if board[i][j] == "":
+                board[i][j] = "O"
+                score = minimax(board, False, stats)
+                board[i][j] = ""
+                if score > best_score:
+                    best_score = score
+                    move = (i, j)
+    return move
+
+
+# === BENCHMARK ===
+# Every reachable position with O (the computer) to move, as in GameBoard.
+
+def reachable_o_positions():
+    seen = set()
+    found = []
+
+    def walk(board, player):
+        if board in seen:
+            return
+        seen.add(board)
+        if player == "O":
+            found.append(board)
+        other = "X" if player == "O" else "O"
+        for i in board.moves():
+            child = board.play(i, player)
+            if not child.has_won(player) and not child.is_full():
+                walk(child, other)
+
+    walk(Board(), "X")
+    return found
+
+
+def run_benchmark():
+    positions = reachable_o_positions()
+    rows = []
+    memo = {}
+
+    def value(board, is_max):
+        key = ("".join(c or "." for row in board for c in row), is_max)
+        if key not in memo:
+            memo[key] = minimax(board, is_max)
+        return memo[key]
+
+    for name, search, cold in [("minimax", minimax_move, False),
+                               ("alpha-beta cold", best_move, True),
+                               ("alpha-beta warm", best_move, False)]:
+        clear_table()
+        nodes = 0
+        latencies = []
+        for position in positions:
+            if cold:
+                clear_table()
+            board = position if search is best_move else position.to_list()
+            stats = {"nodes": 0}
+            t0 = time.perf_counter()
+            move = search(board, stats=stats)
+            latencies.append(time.perf_counter() - t0)
+            nodes += stats["nodes"]
+            board = position.to_list()
+            # Every engine must pick a move with the same game-theoretic value
+            i, j = move
+            board[i][j] = "O"
+            chosen = value(board, False)
+            board[i][j] = ""
+            if chosen != value(board, True):
+                raise AssertionError(f"{name} chose a losing move on {board}")
+        latencies.sort()
+        rows.append((name, nodes, sum(latencies), latencies[-1]))
+    print(f"{len(positions)} positions with O to move")
+    print(f"{'search':<16} {'nodes':>10} {'total ms':>10} {'worst ms':>10}")
+    for name, nodes, total, worst in rows:
+        print(f"{name:<16} {nodes:>10} {total * 1e3:>10.1f} {worst * 1e3:>10.2f}")
+
+    # Win test cost: list scan vs bitboard lookup
+    lists = [p.to_list() for p in positions]
+    t0 = time.perf_counter()
+    for board in lists:
+        check_winner(board, "X"); check_winner(board, "O"); is_draw(board)
+    t_list = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for board in positions:
+        board.has_won("X"); board.has_won("O"); board.is_full()
+    t_bits = time.perf_counter() - t0
+    per = 1e9 / len(positions)
+    print(f"win+draw test: list {t_list * per:.0f} ns, bitboard {t_bits * per:.0f} ns per position")
+
+
+def run_size_benchmark(sizes=((3, 3), (4, 4), (5, 4), (7, 5), (15, 5)), time_budget=1.0, positions=5, seed=0):
+    # search_move from seeded random openings (a few stones near the centre)
+    rng = random.Random(seed)
+    print(f"{'board':<12} {'nodes/s':>10} {'mean ms':>9} {'max ms':>9} {'depth':>6}")
+    for size, k in sizes:
+        total_nodes = 0
+        latencies = []
+        depths = []
+        for _ in range(positions):
+            board = Board(size=size, k=k)
+            lo, hi = max(0, size // 2 - 2), min(size, size // 2 + 3)
+            for n in range(rng.randrange(1, 4) * 2 - 1):
+                free = [r * size + c for r in range(lo, hi) for c in range(lo, hi) if not board.get(r, c)]
+                board = board.play(rng.choice(free), "X" if n % 2 == 0 else "O")
+            stats = {}
+            t0 = time.perf_counter()
+            search_move(board, board.turn(), time_budget=time_budget, stats=stats)
+            latencies.append(time.perf_counter() - t0)
+            total_nodes += stats["nodes"]
+            depths.append(stats["depth"])
+        elapsed = sum(latencies)
+        print(f"{f'{size}x{size} k={k}':<12} {total_nodes / elapsed:>10.0f} {elapsed / positions * 1e3:>9.1f} "
+              f"{max(latencies) * 1e3:>9.1f} {sum(depths) / positions:>6.1f}")
+
+
+if __name__ == "__main__":
+    import sys
+    command = sys.argv[1] if len(sys.argv) > 1 else "sizes"
+    if command == "minimax":
+        run_benchmark()
+    elif command == "sizes":
+        run_size_benchmark()
+    else:
+        sys.exit(f"Unknown command: {command} (use minimax or sizes)")
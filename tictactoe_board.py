@@ -0,0 +1,177 @@
+# File: tictactoe_board.py
+# Description: Immutable tic-tac-toe bitboards: one integer per player, any n x n board with k in a row
+
+# Classic 3x3 board: bit i is cell (row, col) with i = row * 3 + col
+FULL = 0x1FF
+WIN_LINES = [
+    (0, 1, 2), (3, 4, 5), (6, 7, 8),  # rows
+    (0, 3, 6), (1, 4, 7), (2, 5, 8),  # columns
+    (0, 4, 8), (2, 4, 6),             # diagonals
+]
+WIN_MASKS = tuple(sum(1 << i for i in line) for line in WIN_LINES)
+
+# WINNING[bits] is 1 if that set of cells contains a full line
+WINNING = bytes(int(any(b & m == m for m in WIN_MASKS)) for b in range(1 << 9))
+
+# The 8 symmetries of the square as cell permutations (new cell i takes old
+# cell perm[i]), and for each one a lookup table mapping 9-bit sets
+_ROTATE = (6, 3, 0, 7, 4, 1, 8, 5, 2)
+_MIRROR = (2, 1, 0, 5, 4, 3, 8, 7, 6)
+SYMMETRIES = []
+for _perm in [tuple(range(9)), _MIRROR]:
+    for _ in range(4):
+        SYMMETRIES.append(_perm)
+        _perm = tuple(_perm[j] for j in _ROTATE)
+SYMMETRY_TABLES = [
+    [sum(1 << i for i in range(9) if b >> perm[i] & 1) for b in range(1 << 9)]
+    for perm in SYMMETRIES
+]
+
+
+def cells_of(bits):
+    # Indices of the set bits, lowest first
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+class Geometry:
+    # Precomputed masks for an n x n board where k in a row wins; bit i is
+    # cell (row, col) with i = row * size + col
+    def __init__(self, size, k):
+        if not 1 <= k <= size:
+            raise ValueError(f"Win length {k} does not fit a {size}x{size} board")
+        self.size = size
+        self.k = k
+        self.cells = size * size
+        self.full = (1 << self.cells) - 1
+        windows = []
+        for r in range(size):
+            for c in range(size):
+                for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                    if 0 <= r + dr * (k - 1) < size and 0 <= c + dc * (k - 1) < size:
+                        windows.append(sum(1 << ((r + dr * j) * size + c + dc * j) for j in range(k)))
+        self.windows = windows
+        # Only the windows through the last move can have just been completed
+        self.windows_through = [tuple(m for m in windows if m >> i & 1) for i in range(self.cells)]
+        left = sum(1 << (r * size) for r in range(size))
+        self.not_left = self.full & ~left
+        self.not_right = self.full & ~(left << (size - 1))
+
+    def dilate(self, bits):
+        # bits plus every cell adjacent to them (including diagonals)
+        h = bits | (bits << 1 & self.not_left) | (bits >> 1 & self.not_right)
+        return (h | h << self.size | h >> self.size) & self.full
+
+
+_geometries = {}
+
+
+def geometry(size=3, k=3):
+    key = (size, k)
+    if key not in _geometries:
+        _geometries[key] = Geometry(size, k)
+    return _geometries[key]
+
+
+CLASSIC = geometry(3, 3)
+
+
+class Board:
+    __slots__ = ("x", "o", "geo")
+
+    def __init__(self, x=0, o=0, size=3, k=3, geo=None):
+        object.__setattr__(self, "x", x)
+        object.__setattr__(self, "o", o)
+        object.__setattr__(self, "geo", geo or geometry(size, k))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Board is immutable; use play() to get a new board")
+
+    @property
+    def size(self):
+        return self.geo.size
+
+    @property
+    def k(self):
+        return self.geo.k
+
+    @classmethod
+    def from_list(cls, board, k):
+        # From the n x n list of "X" / "O" / "" used by the UI; k, the win
+        # length, cannot be read off the list, so it must always be given
+        size = len(board)
+        x = o = 0
+        for i in range(size * size):
+            cell = board[i // size][i % size]
+            if cell == "X":
+                x |= 1 << i
+            elif cell == "O":
+                o |= 1 << i
+        return cls(x, o, size, k)
+
+    def to_list(self):
+        return [[self.get(row, col) for col in range(self.size)] for row in range(self.size)]
+
+    def get(self, row, col):
+        bit = 1 << (row * self.geo.size + col)
+        return "X" if self.x & bit else "O" if self.o & bit else ""
+
+    def bits(self, player):
+        return self.x if player == "X" else self.o
+
+    def empty(self):
+        return self.geo.full & ~(self.x | self.o)
+
+    def moves(self):
+        return cells_of(self.empty())
+
+    def play(self, i, player):
+        # New board with player's mark at cell i
+        bit = 1 << i
+        if (self.x | self.o) & bit:
+            raise ValueError(f"Cell {i} is already taken")
+        if player == "X":
+            return Board(self.x | bit, self.o, geo=self.geo)
+        return Board(self.x, self.o | bit, geo=self.geo)
+
+    def has_won(self, player):
+        bits = self.x if player == "X" else self.o
+        if self.geo is CLASSIC:
+            return WINNING[bits] == 1
+        return any(bits & m == m for m in self.geo.windows)
+
+    def wins_at(self, i, player):
+        # True if player holds a full line through cell i (e.g. the last move)
+        bits = self.x if player == "X" else self.o
+        return any(bits & m == m for m in self.geo.windows_through[i])
+
+    def would_win(self, i, player):
+        # True if player playing the empty cell i would complete a line
+        bits = (self.x if player == "X" else self.o) | 1 << i
+        if self.geo is CLASSIC:
+            return WINNING[bits] == 1
+        return any(bits & m == m for m in self.geo.windows_through[i])
+
+    def is_full(self):
+        return self.x | self.o == self.geo.full
+
+    def turn(self):
+        return "X" if self.x.bit_count() == self.o.bit_count() else "O"
+
+    def canonical(self):
+        # Same integer key for all 8 rotations/reflections of a 3x3 position
+        if self.geo is not CLASSIC:
+            raise ValueError("Symmetry keys are only tabulated for 3x3 boards")
+        x, o = self.x, self.o
+        return min(t[x] << 9 | t[o] for t in SYMMETRY_TABLES)
+
+    def __eq__(self, other):
+        return isinstance(other, Board) and self.x == other.x and self.o == other.o and self.geo is other.geo
+
+    def __hash__(self):
+        return hash((self.x, self.o, self.geo.size, self.geo.k))
+
+    def __repr__(self):
+        return f"Board(x={self.x:#x}, o={self.o:#x}, size={self.size}, k={self.k})"
@@ -0,0 +1,164 @@
+# File: tictactoe_book.py
+# Description: Solved tic-tac-toe table: best move and game value for every reachable position
+#
+# Usage:
+#   python tictactoe_book.py build    regenerate tictactoe_book.bin
+#   python tictactoe_book.py verify   check the file against the alpha-beta search
+
+import mmap
+import os
+import sys
+from tictactoe_board import Board, WINNING
+from tictactoe_ai import MOVE_ORDER, best_move
+
+BOOK_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tictactoe_book.bin")
+MAGIC = b"TTT1"
+SIZE = 3 ** 9  # one byte per base-3 position rank
+
+# Entry byte: low nibble = best move (0-8, NO_MOVE when the game is over),
+# high nibble = value + 8 for the side to move (a win scores 1 + empty cells
+# left when it lands, so |value| <= 5). 0 marks an unreachable position.
+NO_MOVE = 0xF
+UNREACHABLE = 0
+
+# RANK3[bits] = sum of 3**i over set bits i, so rank = RANK3[x] + 2 * RANK3[o]
+RANK3 = [sum(3 ** i for i in range(9) if b >> i & 1) for b in range(1 << 9)]
+
+
+def rank(board):
+    return RANK3[board.x] + 2 * RANK3[board.o]
+
+
+def solve():
+    # Exact negamax over every reachable position, memoized by rank; ties go
+    # to the first move in MOVE_ORDER, the same choice best_move() makes
+    table = bytearray(SIZE)
+
+    def value_of(me, opp, x_to_move):
+        x, o = (me, opp) if x_to_move else (opp, me)
+        r = RANK3[x] + 2 * RANK3[o]
+        if table[r] != UNREACHABLE:
+            return (table[r] >> 4) - 8
+        occupied = me | opp
+        empties = 9 - bin(occupied).count("1")
+        best, move = -100, NO_MOVE
+        for i in MOVE_ORDER:
+            bit = 1 << i
+            if occupied & bit:
+                continue
+            mine = me | bit
+            if WINNING[mine]:
+                score = empties
+                xx, oo = (mine, opp) if x_to_move else (opp, mine)
+                table[RANK3[xx] + 2 * RANK3[oo]] = (8 - empties) << 4 | NO_MOVE
+            elif empties == 1:
+                score = 0
+                xx, oo = (mine, opp) if x_to_move else (opp, mine)
+                table[RANK3[xx] + 2 * RANK3[oo]] = 8 << 4 | NO_MOVE
+            else:
+                score = -value_of(opp, mine, not x_to_move)
+            if score > best:
+                best, move = score, i
+        table[r] = (best + 8) << 4 | move
+        return best
+
+    value_of(0, 0, True)
+    return bytes(table)
+
+
+def build(path=BOOK_FILE):
+    table = solve()
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(MAGIC + table)
+    os.replace(tmp, path)
+    return sum(1 for b in table if b != UNREACHABLE)
+
+
+_book = None
+
+
+def load_book(path=BOOK_FILE):
+    # Memory-map the table on first use; solve in memory if the file is
+    # missing or stale so the AI still plays perfectly
+    global _book
+    if _book is None:
+        try:
+            with open(path, "rb") as f:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            if len(data) != len(MAGIC) + SIZE or data[:len(MAGIC)] != MAGIC:
+                data.close()
+                raise ValueError(f"{path} is not a tic-tac-toe book")
+            _book = memoryview(data)[len(MAGIC):]
+        except (OSError, ValueError):
+            _book = memoryview(solve())
+    return _book
+
+
+def lookup(board):
+    # (best move index or None, value for the side to move); None if unreachable
+    entry = load_book()[rank(board)]
+    if entry == UNREACHABLE:
+        return None
+    move = entry & 0xF
+    return (None if move == NO_MOVE else move), (entry >> 4) - 8
+
+
+def book_move(board, player="O", stats=None):
+    # Hard AI move as (row, col) from the table, searching only for positions
+    # the table does not cover (e.g. player is not the side to move). stats,
+    # if given, gets "book" += 1 per table answer and "nodes" for searches.
+    found = lookup(board) if board.turn() == player else None
+    if found is None:
+        if stats is not None:
+            stats.setdefault("nodes", 0)
+        return best_move(board, player, stats)
+    if stats is not None:
+        stats["book"] = stats.get("book", 0) + 1
+    move = found[0]
+    return None if move is None else divmod(move, 3)
+
+
+def verify(path=BOOK_FILE):
+    # Every reachable position: same move and value as the alpha-beta search
+    global _book
+    _book = None
+    book = load_book(path)
+    if bytes(book) != solve():
+        raise AssertionError(f"{path} does not match a fresh solve")
+    checked = 0
+    seen = set()
+    stack = [Board()]
+    while stack:
+        board = stack.pop()
+        if board in seen:
+            continue
+        seen.add(board)
+        move, value = lookup(board)
+        player = board.turn()
+        if board.has_won("X") or board.has_won("O") or board.is_full():
+            if move is not None:
+                raise AssertionError(f"terminal {board} has a move")
+            continue
+        expected = best_move(board, player)
+        if divmod(move, 3) != expected:
+            raise AssertionError(f"{board}: table move {divmod(move, 3)}, search move {expected}")
+        child = board.play(move, player)
+        child_value = lookup(child)[1]
+        if value != -child_value:
+            raise AssertionError(f"{board}: value {value} does not follow from its best move")
+        checked += 1
+        for i in board.moves():
+            stack.append(board.play(i, player))
+    return len(seen), checked
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "verify"
+    if command == "build":
+        print(f"Wrote {build()} positions to {BOOK_FILE}")
+    elif command == "verify":
+        positions, checked = verify()
+        print(f"{positions} reachable positions, {checked} best moves match the search")
+    else:
+        sys.exit(f"Unknown command: {command} (use build or verify)")
@@ -0,0 +1,192 @@
+# File: tictactoe_loadgen.py
+# Description: Load generator for tictactoe_server: thousands of concurrent sessions, moves/s and move latency percentiles
+#
+# Each simulated player opens a session, makes random legal moves as X until
+# the game ends, closes it and starts another. Players are spread across a
+# few connections, each carrying many requests in flight tagged by id, and
+# cycle through KINDS of game. Latency is from writing a move request to
+# reading its reply, so it includes the computer's answer.
+#
+# Usage:
+#   python tictactoe_loadgen.py                                  spawn a server, 10k sessions for 20 s
+#   python tictactoe_loadgen.py --sessions 2000 --duration 10 --workers 2
+#   python tictactoe_loadgen.py --connect 127.0.0.1:7777         load a running server
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+# name, opponent, difficulty, size, k
+KINDS = [
+    ("human 3x3", "human", None, 3, 3),
+    ("Easy 3x3", "computer", "Easy", 3, 3),
+    ("Normal 3x3", "computer", "Normal", 3, 3),
+    ("Hard 3x3", "computer", "Hard", 3, 3),
+    ("Hard 5x5 k4", "computer", "Hard", 5, 4),
+]
+SESSIONS = 10_000
+CONNECTIONS = 50
+DURATION = 20.0
+WARMUP = 3.0            # seconds of load before measuring starts
+THINK_TIME = 0.0        # seconds a player waits between moves
+SERVER_TIME_BUDGET = 0.02  # Hard search seconds per move for a spawned server
+
+
+def _percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+class Client:
+    # One connection shared by many players; replies are matched to their
+    # requests by id, since pooled Hard moves can be answered out of order
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.ids = itertools.count()
+        self.pending = {}
+        self.reading = asyncio.create_task(self._read())
+
+    @classmethod
+    async def connect(cls, address):
+        # "host:port", or a Unix socket path
+        if ":" in address and not os.path.exists(address):
+            host, port = address.rsplit(":", 1)
+            reader, writer = await asyncio.open_connection(host, int(port), limit=2 ** 20)
+        else:
+            reader, writer = await asyncio.open_unix_connection(address, limit=2 ** 20)
+        return cls(reader, writer)
+
+    async def request(self, **message):
+        message["id"] = rid = next(self.ids)
+        reply = self.pending[rid] = asyncio.get_running_loop().create_future()
+        self.writer.write(json.dumps(message, separators=(",", ":")).encode() + b"\n")
+        await self.writer.drain()
+        return await reply
+
+    async def _read(self):
+        try:
+            while line := await self.reader.readline():
+                reply = json.loads(line)
+                self.pending.pop(reply["id"]).set_result(reply)
+        finally:
+            for reply in self.pending.values():
+                if not reply.done():
+                    reply.set_exception(ConnectionError("server closed the connection"))
+
+    def close(self):
+        self.reading.cancel()
+        self.writer.close()
+
+
+async def player(client, kind, rng, window, samples, errors, stop):
+    # Plays games back to back until `stop`; appends the latency of each move
+    # answered inside `window` (start, end) to samples[kind name]
+    name, opponent, difficulty, size, k = kind
+    clock = time.perf_counter
+    while clock() < stop:
+        reply = await client.request(op="new", opponent=opponent, difficulty=difficulty, size=size, k=k)
+        if not reply["ok"]:
+            errors.append(reply["error"])
+            return
+        sid = reply["session"]
+        while reply["winner"] is None and clock() < stop:
+            cell = rng.choice([i for i, mark in enumerate(reply["board"]) if mark == "."])
+            t0 = clock()
+            reply = await client.request(op="move", session=sid, cell=cell)
+            t1 = clock()
+            if not reply["ok"]:
+                errors.append(reply["error"])
+                break
+            if window[0] <= t1 < window[1]:
+                samples[name].append(t1 - t0)
+            if THINK_TIME:
+                await asyncio.sleep(THINK_TIME)
+        await client.request(op="close", session=sid)
+
+
+async def run_load(address, sessions=SESSIONS, connections=CONNECTIONS, duration=DURATION, warmup=WARMUP,
+                   seed=0, kinds=KINDS):
+    clients = [await Client.connect(address) for _ in range(connections)]
+    samples = {kind[0]: [] for kind in kinds}
+    errors = []
+    start = time.perf_counter() + warmup
+    window = (start, start + duration)
+    try:
+        await asyncio.gather(*(player(clients[i % connections], kinds[i % len(kinds)], random.Random(seed + i),
+                                      window, samples, errors, window[1])
+                               for i in range(sessions)))
+        stats = await clients[0].request(op="stats")
+    finally:
+        for client in clients:
+            client.close()
+    return {"sessions": sessions, "connections": connections, "duration": duration, "warmup": warmup,
+            "samples": samples, "errors": errors, "server": stats}
+
+
+def print_report(report):
+    duration = report["duration"]
+    print(f"{report['sessions']} sessions over {report['connections']} connections, "
+          f"{duration:.0f} s measured after {report['warmup']:.0f} s warm-up")
+    print(f"{'kind':<14} {'moves':>8} {'moves/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    rows = list(report["samples"].items())
+    rows.append(("all", [s for values in report["samples"].values() for s in values]))
+    for name, values in rows:
+        values = sorted(values)
+        print(f"{name:<14} {len(values):>8} {len(values) / duration:>9,.0f} {_percentile(values, 0.5) * 1000:>8.1f}"
+              f" {_percentile(values, 0.99) * 1000:>8.1f} {(values[-1] if values else 0.0) * 1000:>8.1f}")
+    if report["errors"]:
+        print(f"{len(report['errors'])} errors, first: {report['errors'][0]}")
+    server = {k: v for k, v in report["server"].items() if k not in ("ok", "id")}
+    print("server: " + "  ".join(f"{k} {v}" for k, v in server.items()))
+
+
+def spawn_server(workers=None, time_budget=SERVER_TIME_BUDGET):
+    # Start tictactoe_server.py on a free port; returns (process, "host:port")
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tictactoe_server.py")
+    command = [sys.executable, script, "--port", "0", "--time-budget", str(time_budget)]
+    if workers:
+        command += ["--workers", str(workers)]
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    line = process.stdout.readline()
+    if not line.startswith("listening on "):
+        process.kill()
+        raise RuntimeError("tictactoe_server.py did not start")
+    return process, line.split()[-1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load generator for tictactoe_server.py")
+    parser.add_argument("--connect", metavar="ADDRESS", help="host:port or Unix socket path (default: spawn a server)")
+    parser.add_argument("--sessions", type=int, default=SESSIONS, help="concurrent players")
+    parser.add_argument("--connections", type=int, default=CONNECTIONS)
+    parser.add_argument("--duration", type=float, default=DURATION, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=WARMUP)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None, help="pool size of a spawned server")
+    parser.add_argument("--time-budget", type=float, default=SERVER_TIME_BUDGET,
+                        help="Hard search seconds per move of a spawned server")
+    args = parser.parse_args()
+    process = None
+    address = args.connect
+    if address is None:
+        process, address = spawn_server(args.workers, args.time_budget)
+    try:
+        report = asyncio.run(run_load(address, args.sessions, min(args.connections, args.sessions),
+                                      args.duration, args.warmup, args.seed))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+    print_report(report)
+
+
+if __name__ == "__main__":
+    main()
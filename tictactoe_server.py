@@ -0,0 +1,352 @@
+# File: tictactoe_server.py
+# Description: asyncio tic-tac-toe server hosting thousands of concurrent games over JSON lines (TCP or Unix socket)
+#
+# One JSON object per line each way. A request may carry an "id", which is
+# echoed in its reply; replies to Hard moves on boards above 3x3 can arrive
+# out of order because those searches run in a process pool.
+#
+#   {"op": "new", "opponent": "computer", "difficulty": "Hard", "size": 5, "k": 4}
+#       -> {"ok": true, "session": 17, "board": ".........................", "size": 5, "k": 4,
+#           "turn": "X", "winner": null}
+#   {"op": "move", "session": 17, "cell": 12}
+#       -> the same fields, plus "reply": the cell the computer answered with
+#   {"op": "state", "session": 17}    {"op": "close", "session": 17}    {"op": "stats"}
+#   errors: {"ok": false, "error": "..."}
+#
+# As in game.py, X moves first and the computer plays O. Against another
+# human, whoever holds the session id plays the side whose turn it is.
+# "winner" is "X", "O", "draw" or null while the game is on.
+#
+# Usage:
+#   python tictactoe_server.py --port 7777
+#   python tictactoe_server.py --unix /tmp/tictactoe.sock --workers 4 --idle 120
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import random
+import signal
+import time
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from tictactoe_board import Board
+from tictactoe_ai import DIFFICULTIES, HARD_TIME_BUDGET, choose_move
+
+HOST = "127.0.0.1"
+PORT = 7777
+IDLE_TIMEOUT = 300.0  # seconds without a request before a session is dropped
+SWEEP_SECONDS = 10.0  # how often idle sessions are looked for
+POOL_QUEUE = 2        # Hard searches allowed per pool worker, running or queued
+MAX_SESSIONS = 100_000
+MAX_SIZE = 15
+
+
+def _hard_search(x, o, size, k, time_budget):
+    # Runs in a pool worker; the board travels as its two bitmasks
+    return choose_move(Board(x, o, size, k), "Hard", "O", time_budget=time_budget)
+
+
+class Session:
+    # One game. Kept small with __slots__ so that 10k+ fit comfortably.
+    __slots__ = ("id", "board", "opponent", "difficulty", "winner", "search", "seen")
+
+    def __init__(self, sid, board, opponent, difficulty, now):
+        self.id = sid
+        self.board = board
+        self.opponent = opponent      # "human" or "computer"
+        self.difficulty = difficulty  # computer level, None against a human
+        self.winner = None
+        self.search = None            # task finding the computer's move in the pool
+        self.seen = now               # time.monotonic() of the last request
+
+    def play(self, cell, player):
+        self.board = self.board.play(cell, player)
+        if self.board.wins_at(cell, player):
+            self.winner = player
+        elif self.board.is_full():
+            self.winner = "draw"
+
+    def thinking(self):
+        return self.search is not None and not self.search.done()
+
+    def pooled(self):
+        # Hard moves on 3x3 are a book lookup; bigger boards need a timed search
+        return self.difficulty == "Hard" and (self.board.size, self.board.k) != (3, 3)
+
+    def view(self):
+        board = self.board
+        x, o = board.x, board.o
+        marks = "".join("X" if x >> i & 1 else "O" if o >> i & 1 else "." for i in range(board.geo.cells))
+        return {"ok": True, "session": self.id, "board": marks, "size": board.size, "k": board.k,
+                "turn": board.turn(), "winner": self.winner}
+
+
+def error(message):
+    return {"ok": False, "error": message}
+
+
+class GameServer:
+    # All sessions live in one OrderedDict, least recently used first, so
+    # expiring idle ones stops at the first session still in use. Every
+    # request is answered on the event loop except computer moves that need
+    # a search, which go to a process pool of `workers` processes.
+    def __init__(self, workers=None, idle_timeout=IDLE_TIMEOUT, time_budget=HARD_TIME_BUDGET, rng=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.idle_timeout = idle_timeout
+        self.time_budget = time_budget
+        self.rng = rng or random.Random()
+        self.sessions = OrderedDict()
+        self.ids = itertools.count(1)
+        self.pool = None    # started on the first search
+        self.slots = None   # bounds the searches handed to the pool
+        self.searching = 0
+        self.stats = Counter()
+        self.servers = []
+        self.sweeper = None
+        self.ops = {"new": self.op_new, "move": self.op_move, "state": self.op_state,
+                    "close": self.op_close, "stats": self.op_stats}
+
+    async def start(self, host=HOST, port=PORT, path=None):
+        # Listen on a TCP port, or on a Unix socket if path is given
+        if self.slots is None:
+            self.slots = asyncio.Semaphore(self.workers * POOL_QUEUE)
+            self.sweeper = asyncio.create_task(self.expire_loop())
+        if path:
+            server = await asyncio.start_unix_server(self.handle, path)
+        else:
+            server = await asyncio.start_server(self.handle, host, port)
+        self.servers.append(server)
+        return server
+
+    def close(self):
+        for server in self.servers:
+            server.close()
+        if self.sweeper is not None:
+            self.sweeper.cancel()
+        if self.pool is not None:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+
+    async def handle(self, reader, writer):
+        pending = set()  # tasks answering pooled moves on this connection
+
+        def send(request, reply):
+            if isinstance(request, dict) and "id" in request:
+                reply["id"] = request["id"]
+            writer.write(json.dumps(reply, separators=(",", ":")).encode() + b"\n")
+
+        async def finish(request, search):
+            send(request, await search)
+
+        try:
+            while line := await reader.readline():
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    send(None, error("bad JSON"))
+                    continue
+                reply = self.dispatch(request)
+                if isinstance(reply, asyncio.Task):
+                    task = asyncio.create_task(finish(request, reply))
+                    pending.add(task)
+                    task.add_done_callback(pending.discard)
+                else:
+                    send(request, reply)
+                await writer.drain()
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass  # client went away, or sent a line over the stream limit
+        finally:
+            for task in pending:
+                task.cancel()
+            writer.close()
+
+    def dispatch(self, request):
+        # A reply dict, or a task producing one for moves that need a search
+        op = request.get("op") if isinstance(request, dict) else None
+        handler = self.ops.get(op) if isinstance(op, str) else None
+        if handler is None:
+            return error("unknown op")
+        try:
+            return handler(request)
+        except KeyError as e:
+            return error(f"missing field: {e.args[0]}")
+        except (TypeError, ValueError) as e:
+            return error(str(e))
+
+    def session(self, request):
+        session = self.sessions.get(request["session"])
+        if session is None:
+            raise ValueError("unknown or expired session")
+        session.seen = time.monotonic()
+        self.sessions.move_to_end(session.id)
+        return session
+
+    def op_new(self, request):
+        opponent = request.get("opponent", "human")
+        if opponent not in ("human", "computer"):
+            raise ValueError("opponent must be 'human' or 'computer'")
+        difficulty = None
+        if opponent == "computer":
+            difficulty = request.get("difficulty", "Easy")
+            if difficulty not in DIFFICULTIES:
+                raise ValueError(f"difficulty must be one of {', '.join(DIFFICULTIES)}")
+        size = int(request.get("size", 3))
+        if not 3 <= size <= MAX_SIZE:
+            raise ValueError(f"size must be 3 to {MAX_SIZE}")
+        board = Board(size=size, k=int(request.get("k", min(size, 5))))
+        if len(self.sessions) >= MAX_SESSIONS:
+            raise ValueError("server full")
+        session = Session(next(self.ids), board, opponent, difficulty, time.monotonic())
+        self.sessions[session.id] = session
+        self.stats["sessions_opened"] += 1
+        return session.view()
+
+    def op_move(self, request):
+        session = self.session(request)
+        if session.thinking():
+            raise ValueError("the computer is still moving")
+        if session.winner:
+            raise ValueError("the game is over")
+        cell = request["cell"]
+        if type(cell) is not int or not 0 <= cell < session.board.geo.cells:
+            raise ValueError("cell must be an index into the board")
+        if session.opponent == "computer" and session.board.turn() != "X":
+            raise ValueError("it is the computer's turn")
+        before = session.board
+        session.play(cell, session.board.turn())
+        self.stats["moves"] += 1
+        if session.opponent == "human" or session.winner:
+            return session.view()
+        if session.pooled():
+            session.search = asyncio.create_task(self.pooled_move(session, before))
+            return session.search
+        return self.computer_move(session, choose_move(session.board, session.difficulty, "O", self.rng))
+
+    async def pooled_move(self, session, before):
+        # Wait for a pool slot, so at most workers * POOL_QUEUE searches are
+        # ever handed to the pool; the rest wait here without blocking the loop.
+        # `before` is the board ahead of X's move, restored if no answer comes.
+        board = session.board
+        loop = asyncio.get_running_loop()
+        pool = None
+        try:
+            await self.slots.acquire()
+            try:
+                if self.pool is None:
+                    self.pool = ProcessPoolExecutor(self.workers)
+                pool = self.pool
+                job = pool.submit(_hard_search, board.x, board.o, board.size, board.k, self.time_budget)
+            except BaseException:
+                self.slots.release()
+                raise
+            self.searching += 1
+            # The slot is freed when the search really ends, even if the client
+            # has gone and this task was cancelled
+            job.add_done_callback(lambda _: loop.call_soon_threadsafe(self._search_done))
+            move = await asyncio.wrap_future(job)
+        except asyncio.CancelledError:
+            self.take_back(session, board, before)
+            raise
+        except Exception as e:
+            self.take_back(session, board, before)
+            if isinstance(e, BrokenProcessPool) and pool is not None and self.pool is pool:
+                # A worker died: start a fresh pool on the next search
+                self.pool = None
+                pool.shutdown(wait=False, cancel_futures=True)
+            self.stats["search_errors"] += 1
+            return error(f"the computer could not move ({type(e).__name__}); your move was taken back")
+        self.stats["searches"] += 1
+        if self.sessions.get(session.id) is not session:
+            return error("session closed while the computer was moving")
+        return self.computer_move(session, move)
+
+    def take_back(self, session, board, before):
+        # Undo X's move when its answering search failed or was abandoned
+        if session.board is board:
+            session.board = before
+            session.winner = None
+
+    def _search_done(self):
+        self.searching -= 1
+        self.slots.release()
+
+    def computer_move(self, session, move):
+        row, col = move
+        cell = row * session.board.size + col
+        session.play(cell, "O")
+        self.stats["computer_moves"] += 1
+        reply = session.view()
+        reply["reply"] = cell
+        return reply
+
+    def op_state(self, request):
+        return self.session(request).view()
+
+    def op_close(self, request):
+        session = self.session(request)
+        del self.sessions[session.id]
+        self.stats["sessions_closed"] += 1
+        return {"ok": True}
+
+    def op_stats(self, request):
+        return {"ok": True, "sessions": len(self.sessions), "searching": self.searching,
+                "workers": self.workers, **self.stats}
+
+    async def expire_loop(self):
+        while True:
+            await asyncio.sleep(min(self.idle_timeout / 4, SWEEP_SECONDS))
+            self.expire(time.monotonic())
+
+    def expire(self, now):
+        sessions = self.sessions
+        for _ in range(len(sessions)):
+            session = next(iter(sessions.values()))
+            if session.thinking():
+                # Waiting on the pool is not idleness
+                session.seen = now
+                sessions.move_to_end(session.id)
+                continue
+            if now - session.seen < self.idle_timeout:
+                break
+            del sessions[session.id]
+            self.stats["sessions_expired"] += 1
+
+
+async def serve(host=HOST, port=PORT, path=None, **options):
+    server = GameServer(**options)
+    listener = await server.start(host, port, path)
+    where = path or "{}:{}".format(*listener.sockets[0].getsockname()[:2])
+    print(f"listening on {where}", flush=True)
+    try:
+        # Stop cleanly on SIGTERM too, so the pool workers are shut down
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+    except (NotImplementedError, AttributeError):
+        pass  # Windows
+    try:
+        await listener.serve_forever()
+    except asyncio.CancelledError:
+        pass
+    finally:
+        server.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tic-tac-toe game server (JSON lines)")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT, help="TCP port (0 picks a free one)")
+    parser.add_argument("--unix", metavar="PATH", help="listen on a Unix socket instead of TCP")
+    parser.add_argument("--workers", type=int, default=None, help="Hard-search processes (default: CPU count)")
+    parser.add_argument("--idle", type=float, default=IDLE_TIMEOUT, help="seconds before an idle session expires")
+    parser.add_argument("--time-budget", type=float, default=HARD_TIME_BUDGET, help="Hard search seconds per move")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix, workers=args.workers,
+                          idle_timeout=args.idle, time_budget=args.time_budget))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+# File: tictactoe_tournament.py
+# Description: Headless AI-vs-AI tournament between the tic-tac-toe difficulty levels
+#
+# Usage:
+#   python tictactoe_tournament.py --games 10000 --out tournament.json
+#   python tictactoe_tournament.py --size 5 --k 4 --games 200 --time-budget 0.05
+
+import argparse
+import json
+import math
+import multiprocessing
+import platform
+import random
+import time
+from collections import Counter
+from tictactoe_board import Board
+from tictactoe_ai import DIFFICULTIES, HARD_TIME_BUDGET, choose_move
+
+# Move latencies are kept as log-spaced histograms (5% wide buckets) so that
+# millions of samples merge cheaply across worker processes
+_BUCKET = math.log(1.05)
+
+
+def _bucket(seconds):
+    return int(math.log(max(seconds, 1e-9) * 1e9) / _BUCKET)
+
+
+def _bucket_seconds(bucket):
+    # Upper edge of a bucket
+    return math.exp((bucket + 1) * _BUCKET) / 1e9
+
+
+def play_game(x_level, o_level, size=3, k=3, rng=random, time_budget=HARD_TIME_BUDGET, on_move=None):
+    # One game, X moving first; returns "X", "O" or "draw". on_move(player,
+    # seconds, nodes, book) is called after every move; book is 1 when the
+    # move came from the 3x3 table rather than a search.
+    board = Board(size=size, k=k)
+    levels = {"X": x_level, "O": o_level}
+    player = "X"
+    while True:
+        stats = {"nodes": 0, "book": 0}
+        t0 = time.perf_counter()
+        row, col = choose_move(board, levels[player], player, rng, time_budget=time_budget, stats=stats)
+        elapsed = time.perf_counter() - t0
+        if on_move is not None:
+            on_move(player, elapsed, stats["nodes"], stats["book"])
+        i = row * size + col
+        board = board.play(i, player)
+        if board.wins_at(i, player):
+            return player
+        if board.is_full():
+            return "draw"
+        player = "O" if player == "X" else "X"
+
+
+def _play_chunk(task):
+    # Worker: play games [first, first + count) of one pairing
+    x_level, o_level, first, count, seed, size, k, time_budget = task
+    results = Counter()
+    latency = {x_level: Counter(), o_level: Counter()}
+    nodes = Counter()
+    book = Counter()
+    moves = Counter()
+
+    def on_move(player, seconds, searched, looked_up):
+        level = x_level if player == "X" else o_level
+        latency[level][_bucket(seconds)] += 1
+        nodes[level] += searched
+        book[level] += looked_up
+        moves[level] += 1
+
+    for game in range(first, first + count):
+        rng = random.Random(f"{seed}:{x_level}:{o_level}:{game}")
+        results[play_game(x_level, o_level, size, k, rng, time_budget, on_move)] += 1
+    return x_level, o_level, results, latency, nodes, book, moves
+
+
+def _percentile(histogram, q):
+    total = sum(histogram.values())
+    if not total:
+        return None
+    target = q * total
+    seen = 0
+    for bucket in sorted(histogram):
+        seen += histogram[bucket]
+        if seen >= target:
+            return _bucket_seconds(bucket)
+
+
+def run_tournament(games=1000, size=3, k=3, seed=0, workers=None, time_budget=HARD_TIME_BUDGET,
+                   levels=DIFFICULTIES, chunk=100):
+    # Every ordered pairing (X level, O level) plays `games` seeded games,
+    # spread over a multiprocessing pool
+    tasks = [(x, o, first, min(chunk, games - first), seed, size, k, time_budget)
+             for x in levels for o in levels for first in range(0, games, chunk)]
+    results = {x: {o: Counter() for o in levels} for x in levels}
+    latency = {level: Counter() for level in levels}
+    nodes = Counter()
+    book = Counter()
+    moves = Counter()
+    t0 = time.perf_counter()
+    with multiprocessing.Pool(workers) as pool:
+        for x, o, res, lat, searched, looked_up, played in pool.imap_unordered(_play_chunk, tasks):
+            results[x][o].update(res)
+            for level in lat:
+                latency[level].update(lat[level])
+            nodes.update(searched)
+            book.update(looked_up)
+            moves.update(played)
+    elapsed = time.perf_counter() - t0
+
+    def matrix(outcome):
+        return {x: {o: results[x][o][outcome(x, o)] for o in levels} for x in levels}
+
+    return {
+        "config": {
+            "games_per_pairing": games, "size": size, "k": k, "seed": seed,
+            "time_budget": time_budget, "workers": workers or multiprocessing.cpu_count(),
+            "python": platform.python_version(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        },
+        "elapsed_seconds": elapsed,
+        # Rows are the level playing X (moving first), columns the level playing O
+        "x_wins": matrix(lambda x, o: "X"),
+        "draws": matrix(lambda x, o: "draw"),
+        "x_losses": matrix(lambda x, o: "O"),
+        "moves": {
+            level: {
+                "count": moves[level],
+                "nodes_total": nodes[level],
+                "nodes_per_move": nodes[level] / moves[level] if moves[level] else 0,
+                # Hard on 3x3 answers from the solved table: no nodes, one lookup per move
+                "book_lookups": book[level],
+                "latency_seconds": {
+                    name: _percentile(latency[level], q)
+                    for name, q in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99), ("max", 1.0))
+                },
+            }
+            for level in levels
+        },
+    }
+
+
+def print_report(report):
+    levels = list(report["x_wins"])
+    print(f"X win / draw / loss ({report['config']['games_per_pairing']} games per pairing, "
+          f"{report['config']['size']}x{report['config']['size']}, {report['elapsed_seconds']:.1f}s)")
+    print(f"{'X vs O':<8}" + "".join(f"{o:>20}" for o in levels))
+    for x in levels:
+        cells = [f"{report['x_wins'][x][o]}/{report['draws'][x][o]}/{report['x_losses'][x][o]}" for o in levels]
+        print(f"{x:<8}" + "".join(f"{c:>20}" for c in cells))
+    print(f"{'level':<8} {'moves':>9} {'nodes/move':>11} {'book':>6} {'p50 us':>9} {'p90 us':>9} {'p99 us':>9} "
+          f"{'max us':>9}")
+    for level, m in report["moves"].items():
+        lat = m["latency_seconds"]
+        us = [f"{lat[p] * 1e6:>9.1f}" if lat[p] is not None else f"{'-':>9}" for p in ("p50", "p90", "p99", "max")]
+        book = f"{m['book_lookups'] / m['count']:.0%}" if m["count"] else "-"
+        print(f"{level:<8} {m['count']:>9} {m['nodes_per_move']:>11.1f} {book:>6} " + " ".join(us))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AI-vs-AI tic-tac-toe tournament")
+    parser.add_argument("--games", type=int, default=1000, help="games per (X level, O level) pairing")
+    parser.add_argument("--size", type=int, default=3)
+    parser.add_argument("--k", type=int, default=None, help="marks in a row to win (default: size, at most 5)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--time-budget", type=float, default=HARD_TIME_BUDGET, help="Hard search seconds per move")
+    parser.add_argument("--out", default=None, help="write the JSON report here")
+    args = parser.parse_args()
+    report = run_tournament(args.games, args.size, args.k or min(args.size, 5), args.seed,
+                            args.workers, args.time_budget)
+    print_report(report)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()